@@ -0,0 +1,196 @@
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+# Add current dir to path so we can import netra_backend provided we are running from Backend/Netra_Backend
+sys.path.append(os.getcwd())
+
+from netra_backend.config import get_openc3_config
+from netra_backend.decoding.columnar import HAVE_NUMPY, to_pylists
+from netra_backend.decoding.registry import DecoderRegistry
+from netra_backend.decoding.synthetic import generator_for
+
+# Benchmark every health decoder module on synthetic frames.
+#
+#   python bench_decoders.py                              # write decoder_bench.json
+#   python bench_decoders.py --compare decoder_bench.json --output new.json
+#
+# For each module and instance count it reports rows/sec, us/instance and
+# the peak memory allocated during one decode (tracemalloc), for the row
+# decoder and, with numpy installed, the columnar decoder. --compare exits
+# with status 1 when a module got slower than the baseline by more than
+# --threshold (us/instance).
+
+BENCH_VERSION = 1
+
+
+def _measure(fn, frame: memoryview, min_time: float):
+    """Mean seconds per call over at least `min_time` seconds, and peak bytes allocated by one call."""
+    fn(frame)  # warm-up (lazy imports, caches)
+
+    calls = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < min_time:
+        fn(frame)
+        calls += 1
+        elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        fn(frame)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return elapsed / calls, peak
+
+
+def _result(seconds: float, peak: int, rows: int) -> dict:
+    return {
+        "rows": rows,
+        "us_per_call": round(seconds * 1e6, 3),
+        "us_per_instance": round(seconds * 1e6 / rows, 4),
+        "rows_per_s": round(rows / seconds, 1),
+        "peak_kib": round(peak / 1024.0, 2),
+    }
+
+
+def bench_module(entry, gen, instance_counts, min_time: float, columnar: bool) -> dict:
+    out = {
+        "generator": "layout" if gen.layout is not None else "probed",
+        "header": gen.header.name,
+        "record_size": gen.record_size,
+        "rows": {},
+    }
+    modes = [("rows", entry.decode_frame)]
+    if columnar and entry.decode_columns is not None:
+        out["columns"] = {}
+        # What the health consumer does in columnar mode
+        modes.append(("columns", lambda frame: to_pylists(entry.decode_columns(frame))))
+
+    for requested in instance_counts:
+        frame = memoryview(gen.frame(requested))
+        try:
+            rows = len(entry.decode_frame(frame))
+        except Exception as e:
+            out.setdefault("errors", {})[str(requested)] = str(e)
+            continue
+        if rows == 0:
+            continue
+        for mode, fn in modes:
+            seconds, peak = _measure(fn, frame, min_time)
+            out[mode][str(requested)] = _result(seconds, peak, rows)
+    return out
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list:
+    """(module, mode, instances, base us/instance, new us/instance) for every regression."""
+    regressions = []
+    for name, result in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if base is None:
+            continue
+        for mode in ("rows", "columns"):
+            for count, new in result.get(mode, {}).items():
+                old = base.get(mode, {}).get(count)
+                if old and new["us_per_instance"] > old["us_per_instance"] * (1.0 + threshold):
+                    regressions.append((name, mode, count, old["us_per_instance"], new["us_per_instance"]))
+    return regressions
+
+
+def print_report(report: dict) -> None:
+    # Largest instance count measured for each module, slowest first
+    rows = []
+    for name, result in report["results"].items():
+        for mode in ("rows", "columns"):
+            sizes = result.get(mode)
+            if sizes:
+                r = sizes[max(sizes, key=int)]
+                rows.append((r["us_per_instance"], name, mode, r))
+    rows.sort(reverse=True)
+
+    print(f"\n{'decoder':<45} {'mode':<8} {'n':>6} {'us/inst':>10} {'rows/s':>12} {'peak KiB':>10}")
+    for _, name, mode, r in rows:
+        print(f"{name:<45} {mode:<8} {r['rows']:>6} {r['us_per_instance']:>10.3f} {r['rows_per_s']:>12.0f} {r['peak_kib']:>10.1f}")
+    if report["skipped"]:
+        print("\nSkipped:", ", ".join(f"{k} ({v})" for k, v in sorted(report["skipped"].items())))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark health decoders on synthetic frames")
+    parser.add_argument("--instances", default="1,32,256",
+                        help="comma-separated instance counts per frame (default: 1,32,256)")
+    parser.add_argument("--min-time", type=float, default=0.2,
+                        help="seconds to spend timing each module/count/mode (default: 0.2)")
+    parser.add_argument("--only", default="", help="only modules whose name contains this text")
+    parser.add_argument("--no-columnar", action="store_true", help="skip the numpy columnar decoders")
+    parser.add_argument("--output", default="decoder_bench.json", help="where to write the results")
+    parser.add_argument("--compare", help="baseline results file to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed us/instance slowdown vs the baseline (default: 0.25 = 25%%)")
+    args = parser.parse_args()
+
+    instance_counts = [int(n) for n in args.instances.split(",") if n.strip()]
+    columnar = HAVE_NUMPY and not args.no_columnar
+
+    config = get_openc3_config()
+    health_packets = [p for p in config.packets_tlm if "__HEALTH_" in p]
+    registry = DecoderRegistry(health_packets).load()
+    modules = {k: v for k, v in sorted(registry.modules().items()) if args.only in k}
+    print(f"Benchmarking {len(modules)} decoder modules (instances={instance_counts}, columnar={columnar})")
+
+    report = {
+        "version": BENCH_VERSION,
+        "created": datetime.datetime.utcnow().isoformat() + "Z",
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "numpy": HAVE_NUMPY,
+        "instances": instance_counts,
+        "min_time": args.min_time,
+        "results": {},
+        "skipped": {},
+    }
+    for core_name, reason in registry.failures.items():
+        if args.only in core_name:
+            report["skipped"][core_name] = f"failed to load: {reason}"
+
+    for core_name, entry in modules.items():
+        # Decoders print per-instance diagnostics; keep the report readable
+        with contextlib.redirect_stdout(io.StringIO()):
+            gen = generator_for(entry)
+            if gen is None:
+                report["skipped"][core_name] = "no synthetic frame decodes"
+                continue
+            result = bench_module(entry, gen, instance_counts, args.min_time, columnar)
+        if not result["rows"]:
+            report["skipped"][core_name] = "; ".join(result.get("errors", {}).values()) or "synthetic frames decode to no rows"
+            continue
+        report["results"][core_name] = result
+        print(f"  {core_name}: {len(result['rows'])} sizes, record {gen.record_size} B ({result['generator']})")
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    print_report(report)
+    print(f"\nWrote {args.output}: {len(report['results'])} modules, {len(report['skipped'])} skipped")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, report, args.threshold)
+        for name, mode, count, old, new in regressions:
+            print(f"REGRESSION: {name} [{mode}, {count} instances] {old:.3f} -> {new:.3f} us/instance")
+        print(f"{len(regressions)} regressions vs {args.compare} (threshold {args.threshold:.0%})")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
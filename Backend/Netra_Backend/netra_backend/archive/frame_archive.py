@@ -0,0 +1,305 @@
+# netra_backend/archive/frame_archive.py
+import fnmatch
+import logging
+import os
+import struct
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------------------------------------
+# Raw frame archive
+# ---------------------------------------------------------
+#
+# ws_ingestor appends every raw frame it receives, before decoding, so
+# frames can be decoded again later (see archive.reprocess):
+#
+#     <ARCHIVE_DIR>/<packet name>/<YYYYMMDD>/<HHMMSS>_<pid>_<n>.seg   frames
+#                                                   ..._<n>.idx   sparse index
+#
+# A segment holds frames of one packet and one UTC day (by frame time),
+# so a time range maps to day directories. Segments are append-only and
+# rotated by size and age. A .seg file is a sequence of blocks, each
+# compressed on its own with zlib:
+#
+#     block header  _BLOCK   magic, compressed size, frame count, min / max time (ns)
+#     payload       zlib( (_FRAME time_ns, length, frame bytes) * count )
+#
+# The .idx file has one _INDEX entry per block (min / max time, offset,
+# size, count): a sparse time index that lets readers skip blocks outside
+# the range without decompressing them. Block headers carry the same
+# fields, so after a crash the tail of a segment the index does not cover
+# yet is recovered by scanning headers; a torn last block is ignored.
+# Blocks are written when they are full or ARCHIVE_FLUSH_S old, which
+# bounds what a crash can lose (the OS has the data; there is no fsync).
+
+_MAGIC = b"NFA1"
+_BLOCK = struct.Struct("!4sIIqq")
+_FRAME = struct.Struct("!qI")
+_INDEX = struct.Struct("!qqQII")
+
+SEGMENT_SUFFIX = ".seg"
+INDEX_SUFFIX = ".idx"
+
+
+@dataclass(frozen=True)
+class BlockRef:
+    min_ns: int
+    max_ns: int
+    offset: int
+    size: int       # compressed payload bytes
+    count: int
+
+
+def _day(ts_ns: int) -> str:
+    return datetime.fromtimestamp(ts_ns / 1e9, timezone.utc).strftime("%Y%m%d")
+
+
+class _Segment:
+    """One open segment file and the block being filled."""
+
+    def __init__(self, path: str, level: int):
+        self.path = path
+        self.level = level
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._seg = open(path, "ab")
+        self._idx = open(path[:-len(SEGMENT_SUFFIX)] + INDEX_SUFFIX, "ab")
+        self.size = self._seg.tell()
+        self.opened_at = time.monotonic()
+        self.last_append = self.opened_at
+
+        self._records: List[bytes] = []
+        self._raw_bytes = 0
+        self._min_ns = self._max_ns = 0
+        self._block_started: Optional[float] = None
+
+    @property
+    def pending_frames(self) -> int:
+        return len(self._records) // 2
+
+    def append(self, ts_ns: int, frame: bytes) -> None:
+        if not self._records:
+            self._min_ns = self._max_ns = ts_ns
+            self._block_started = time.monotonic()
+        else:
+            self._min_ns = min(self._min_ns, ts_ns)
+            self._max_ns = max(self._max_ns, ts_ns)
+        self._records.append(_FRAME.pack(ts_ns, len(frame)))
+        self._records.append(frame)
+        self._raw_bytes += _FRAME.size + len(frame)
+        self.last_append = time.monotonic()
+
+    def block_due(self, max_frames: int, max_bytes: int, max_age: float) -> bool:
+        if not self._records:
+            return False
+        return (self.pending_frames >= max_frames or self._raw_bytes >= max_bytes
+                or time.monotonic() - self._block_started >= max_age)
+
+    def write_block(self) -> None:
+        if not self._records:
+            return
+        payload = zlib.compress(b"".join(self._records), self.level)
+        count = self.pending_frames
+        offset = self.size
+        self._seg.write(_BLOCK.pack(_MAGIC, len(payload), count, self._min_ns, self._max_ns))
+        self._seg.write(payload)
+        self._seg.flush()
+        # Index entry after its block: an entry never points past the data
+        self._idx.write(_INDEX.pack(self._min_ns, self._max_ns, offset, len(payload), count))
+        self._idx.flush()
+        self.size += _BLOCK.size + len(payload)
+        self._records = []
+        self._raw_bytes = 0
+        self._block_started = None
+
+    def close(self) -> None:
+        self.write_block()
+        self._seg.close()
+        self._idx.close()
+
+
+class FrameArchive:
+    """
+    Appends raw frames to per-packet, per-day segment files. Thread-safe;
+    a background thread writes blocks that reached ARCHIVE_FLUSH_S and
+    closes idle segments.
+    """
+
+    def __init__(self, root: str, segment_seconds: float = 3600.0, segment_bytes: int = 64 << 20,
+                 block_frames: int = 512, block_bytes: int = 256 << 10, flush_interval: float = 1.0,
+                 level: int = 6):
+        self.root = root
+        self.segment_seconds = segment_seconds
+        self.segment_bytes = segment_bytes
+        self.block_frames = max(1, block_frames)
+        self.block_bytes = block_bytes
+        self.flush_interval = flush_interval
+        self.level = level
+
+        self._lock = threading.Lock()
+        # (packet name, day) -> open segment
+        self._segments: Dict[Tuple[str, str], _Segment] = {}
+        self._seq = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._flush_loop, name="frame-archive", daemon=True)
+        self._thread.start()
+
+        self.frames = 0
+        self.bytes = 0
+
+    @classmethod
+    def from_env(cls) -> Optional["FrameArchive"]:
+        """Archive configured by ARCHIVE_* env vars; None when ARCHIVE_DIR is not set."""
+        root = os.getenv("ARCHIVE_DIR", "")
+        if not root:
+            return None
+        archive = cls(
+            root,
+            segment_seconds=float(os.getenv("ARCHIVE_SEGMENT_S", "3600")),
+            segment_bytes=int(os.getenv("ARCHIVE_SEGMENT_BYTES", str(64 << 20))),
+            block_frames=int(os.getenv("ARCHIVE_BLOCK_FRAMES", "512")),
+            block_bytes=int(os.getenv("ARCHIVE_BLOCK_BYTES", str(256 << 10))),
+            flush_interval=float(os.getenv("ARCHIVE_FLUSH_S", "1.0")),
+            level=int(os.getenv("ARCHIVE_COMPRESS_LEVEL", "6")),
+        )
+        logger.info("Archiving raw frames to %s", root)
+        return archive
+
+    def _open_segment(self, packet_name: str, day: str, ts_ns: int) -> _Segment:
+        self._seq += 1
+        started = datetime.fromtimestamp(ts_ns / 1e9, timezone.utc)
+        name = f"{started:%H%M%S}_{os.getpid()}_{self._seq}{SEGMENT_SUFFIX}"
+        segment = _Segment(os.path.join(self.root, packet_name, day, name), self.level)
+        self._segments[(packet_name, day)] = segment
+        return segment
+
+    def append(self, packet_name: str, frame: bytes, ts_ns: Optional[int] = None) -> None:
+        """Archive one raw frame; ts_ns is the frame time (default: now)."""
+        if ts_ns is None:
+            ts_ns = time.time_ns()
+        day = _day(ts_ns)
+        with self._lock:
+            segment = self._segments.get((packet_name, day))
+            if segment is not None and (segment.size >= self.segment_bytes
+                                        or time.monotonic() - segment.opened_at >= self.segment_seconds):
+                segment.close()
+                segment = None
+            if segment is None:
+                segment = self._open_segment(packet_name, day, ts_ns)
+            segment.append(ts_ns, frame)
+            if segment.block_due(self.block_frames, self.block_bytes, self.flush_interval):
+                segment.write_block()
+            self.frames += 1
+            self.bytes += len(frame)
+
+    def flush(self) -> None:
+        """Write every pending block."""
+        with self._lock:
+            for segment in self._segments.values():
+                segment.write_block()
+
+    def _flush_loop(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            try:
+                with self._lock:
+                    now = time.monotonic()
+                    for key, segment in list(self._segments.items()):
+                        if segment.block_due(self.block_frames, self.block_bytes, self.flush_interval):
+                            segment.write_block()
+                        # Segments of past days (or quiet packets) are closed when idle
+                        if now - segment.last_append >= min(self.segment_seconds, 300.0):
+                            segment.close()
+                            del self._segments[key]
+            except Exception:
+                logger.exception("Frame archive flush failed")
+
+    def close(self) -> None:
+        self._stop.set()
+        self._thread.join(timeout=5.0)
+        with self._lock:
+            for segment in self._segments.values():
+                segment.close()
+            self._segments.clear()
+
+
+# ----- reading -----
+
+def read_index(seg_path: str) -> List[BlockRef]:
+    """
+    Blocks of a segment: from its .idx, plus any blocks after the last
+    indexed one (found by scanning headers; a torn block ends the scan).
+    """
+    blocks: List[BlockRef] = []
+    idx_path = seg_path[:-len(SEGMENT_SUFFIX)] + INDEX_SUFFIX
+    try:
+        with open(idx_path, "rb") as f:
+            data = f.read()
+        for i in range(len(data) // _INDEX.size):
+            blocks.append(BlockRef(*_INDEX.unpack_from(data, i * _INDEX.size)))
+    except FileNotFoundError:
+        pass
+
+    end = blocks[-1].offset + _BLOCK.size + blocks[-1].size if blocks else 0
+    seg_size = os.path.getsize(seg_path)
+    if end < seg_size:
+        with open(seg_path, "rb") as f:
+            while end + _BLOCK.size <= seg_size:
+                f.seek(end)
+                magic, size, count, min_ns, max_ns = _BLOCK.unpack(f.read(_BLOCK.size))
+                if magic != _MAGIC or end + _BLOCK.size + size > seg_size:
+                    break
+                blocks.append(BlockRef(min_ns, max_ns, end, size, count))
+                end += _BLOCK.size + size
+    return blocks
+
+
+def read_segment(seg_path: str, start_ns: Optional[int] = None,
+                 end_ns: Optional[int] = None) -> Iterator[Tuple[int, bytes]]:
+    """(time_ns, frame) for the frames of a segment in [start_ns, end_ns), in file order."""
+    lo = start_ns if start_ns is not None else -(1 << 63)
+    hi = end_ns if end_ns is not None else (1 << 63) - 1
+    blocks = [b for b in read_index(seg_path) if b.max_ns >= lo and b.min_ns < hi]
+    if not blocks:
+        return
+    with open(seg_path, "rb", buffering=1 << 20) as f:
+        for block in blocks:
+            f.seek(block.offset + _BLOCK.size)
+            data = zlib.decompress(f.read(block.size))
+            view = memoryview(data)
+            pos = 0
+            for _ in range(block.count):
+                ts_ns, length = _FRAME.unpack_from(data, pos)
+                pos += _FRAME.size
+                if lo <= ts_ns < hi:
+                    yield ts_ns, bytes(view[pos:pos + length])
+                pos += length
+
+
+def segment_files(root: str, packet_pattern: str = "*", start: Optional[datetime] = None,
+                  end: Optional[datetime] = None) -> List[Tuple[str, str]]:
+    """(packet name, segment path) for every segment that may hold frames in [start, end)."""
+    first_day = start.astimezone(timezone.utc).strftime("%Y%m%d") if start else None
+    # end is exclusive: a range ending at midnight does not need that day
+    last_day = (end.astimezone(timezone.utc) - timedelta(microseconds=1)).strftime("%Y%m%d") if end else None
+    found = []
+    if not os.path.isdir(root):
+        return found
+    for packet_name in sorted(os.listdir(root)):
+        if not fnmatch.fnmatchcase(packet_name, packet_pattern):
+            continue
+        packet_dir = os.path.join(root, packet_name)
+        if not os.path.isdir(packet_dir):
+            continue
+        for day in sorted(os.listdir(packet_dir)):
+            if (first_day and day < first_day) or (last_day and day > last_day):
+                continue
+            day_dir = os.path.join(packet_dir, day)
+            for name in sorted(os.listdir(day_dir)):
+                if name.endswith(SEGMENT_SUFFIX):
+                    found.append((packet_name, os.path.join(day_dir, name)))
+    return found
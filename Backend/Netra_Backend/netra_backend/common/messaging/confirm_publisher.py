@@ -0,0 +1,330 @@
+# netra_backend/common/messaging/confirm_publisher.py
+import collections
+import datetime
+import functools
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+import pika
+
+from netra_backend.common.messaging.wire_format import JsonRowsFormat, WireFormat
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Batch:
+    routing_key: str
+    # Decoded packets already encoded by the wire format, one per input message
+    parts: List[bytes] = field(default_factory=list)
+    delivery_tags: List[int] = field(default_factory=list)
+    rows: int = 0
+    size: int = 0
+    # Declared column types of the packet (same decoder for the whole batch)
+    column_types: Dict[str, str] = field(default_factory=dict)
+
+
+# A flushed batch on its way to the broker: (routing_key, body, input delivery tags, rows, packets)
+_Outgoing = Tuple[str, bytes, List[int], int, int]
+
+
+class BatchingConfirmPublisher:
+    """
+    Publisher for decoded telemetry, acking the consumer's input messages
+    once the output that carries them is confirmed.
+
+    - Decoded packets with the same routing key are micro-batched into one
+      AMQP message, bounded by a packet count, a byte size and a time
+      budget (consumer I/O thread).
+    - Batches are published from an I/O thread of their own (pika
+      SelectConnection, like RabbitMQPublisher) with asynchronous publisher
+      confirms: up to `window` messages are unconfirmed at a time, and the
+      confirm callback acks the input deliveries of each confirmed batch on
+      the consumer's channel (acks must go out on the channel that received
+      the input). A nack, or losing the publishing connection before the
+      confirm, requeues those inputs instead of losing them.
+    - While the publishing connection is down, flushed batches wait in
+      memory; their inputs stay unacked, so the consumer prefetch bounds
+      them.
+
+    Packets arrive already encoded (see wire_format.WireFormat) and the
+    wire format joins them into the message body; meta["packets"] says how
+    many decoded packets went into the message and meta["column_types"]
+    carries the decoder's declared column types, if any.
+
+    `on_settled(delivery_tags, published)` is called (consumer I/O thread)
+    after a batch's inputs were acked (published=True) or requeued / left
+    for redelivery (False).
+
+    publish(), ack(), flush() and close() must only be called from the
+    consumer connection's I/O thread.
+    """
+
+    def __init__(self, connection: pika.BlockingConnection,
+                 channel: pika.adapters.blocking_connection.BlockingChannel,
+                 exchange: str,
+                 url: str,
+                 max_packets: int = 20,
+                 max_bytes: int = 1 << 20,
+                 max_delay: float = 0.02,
+                 window: int = 64,
+                 wire_format: Optional[WireFormat] = None,
+                 on_settled: Optional[Callable[[List[int], bool], None]] = None,
+                 reconnect_delay: float = 2.0):
+        self.connection = connection
+        self.channel = channel
+        self.exchange = exchange
+        self.url = url
+        self.max_packets = max(1, max_packets)
+        self.max_bytes = max_bytes
+        self.max_delay = max_delay
+        self.window = max(1, window)
+        self.wire_format = wire_format or JsonRowsFormat()
+        self.on_settled = on_settled
+        self.reconnect_delay = reconnect_delay
+
+        # Consumer I/O thread
+        self._batches: Dict[str, _Batch] = {}
+        self._timer = None
+        # Inputs handed to the publishing thread and not settled yet
+        self._unsettled = 0
+
+        # Handed over to the publishing thread
+        self._lock = threading.Lock()
+        self._outbox: Deque[_Outgoing] = collections.deque()
+        self._wake = threading.Event()
+        self._closing = False
+
+        # Publishing thread only
+        self._pub_connection: Optional[pika.SelectConnection] = None
+        self._pub_channel = None
+        self._ready = False
+        # publish delivery tag -> batch
+        self._inflight: "collections.OrderedDict[int, _Outgoing]" = collections.OrderedDict()
+        self._next_tag = 1
+
+        self._thread = threading.Thread(target=self._run, name=f"amqp-confirm-{exchange}", daemon=True)
+        self._thread.start()
+
+    # ----- consumer I/O thread -----
+
+    @property
+    def is_open(self) -> bool:
+        return self.channel.is_open
+
+    def ack(self, delivery_tag: int) -> None:
+        """Ack an input message that produced nothing to publish."""
+        self.channel.basic_ack(delivery_tag=delivery_tag)
+
+    def publish(self, routing_key: str, part: bytes, rows: int, delivery_tag: int,
+                column_types: Optional[Dict[str, str]] = None) -> None:
+        """
+        Queue one decoded packet (encoded with wire_format.encode_packet).
+        The input `delivery_tag` is acked once the batch holding it is confirmed.
+        """
+        batch = self._batches.get(routing_key)
+        if batch is None:
+            batch = self._batches[routing_key] = _Batch(routing_key, column_types=dict(column_types or {}))
+        batch.parts.append(part)
+        batch.delivery_tags.append(delivery_tag)
+        batch.rows += rows
+        batch.size += len(part)
+
+        if len(batch.parts) >= self.max_packets or batch.size >= self.max_bytes:
+            self._flush_batch(self._batches.pop(routing_key))
+        elif self._timer is None:
+            self._timer = self.connection.call_later(self.max_delay, self._on_timer)
+
+    def flush(self) -> None:
+        """Hand every pending batch to the publishing thread now."""
+        if self._timer is not None:
+            self.connection.remove_timeout(self._timer)
+            self._timer = None
+        batches, self._batches = self._batches, {}
+        for batch in batches.values():
+            self._flush_batch(batch)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """
+        Flush, wait up to `timeout` for the outstanding confirms (so their
+        inputs are acked) and stop the publishing thread. Inputs still
+        unacked then are redelivered by the broker.
+        """
+        try:
+            self.flush()
+            deadline = time.monotonic() + timeout
+            while self._unsettled and self.channel.is_open and time.monotonic() < deadline:
+                self.connection.process_data_events(time_limit=0.05)
+        finally:
+            self._closing = True
+            pub_connection = self._pub_connection
+            if pub_connection is not None:
+                try:
+                    pub_connection.ioloop.add_callback_threadsafe(self._close_connection)
+                except Exception:
+                    pass
+            self._wake.set()
+            self._thread.join(timeout)
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        self.flush()
+
+    def _flush_batch(self, batch: _Batch) -> None:
+        meta = {
+            "packet_name": batch.routing_key,
+            "timestamp": datetime.datetime.utcnow().isoformat() + "Z",
+            "packets": len(batch.parts),
+        }
+        if batch.column_types:
+            meta["column_types"] = batch.column_types
+        body = self.wire_format.encode_message(meta, batch.parts)
+
+        self._unsettled += len(batch.delivery_tags)
+        with self._lock:
+            self._outbox.append((batch.routing_key, body, batch.delivery_tags, batch.rows, len(batch.parts)))
+        pub_connection = self._pub_connection
+        if pub_connection is not None and self._ready:
+            try:
+                pub_connection.ioloop.add_callback_threadsafe(self._pump)
+            except Exception:
+                pass  # reconnecting; published once the channel is back
+
+    def _settle(self, delivery_tags: List[int], published: bool) -> None:
+        """Ack the batch's inputs, or nack them back onto their queues."""
+        self._unsettled -= len(delivery_tags)
+        if not self.channel.is_open:
+            # Unacked inputs are redelivered by the broker
+            published = False
+        else:
+            for tag in delivery_tags:
+                if published:
+                    self.channel.basic_ack(delivery_tag=tag)
+                else:
+                    self.channel.basic_nack(delivery_tag=tag, requeue=True)
+        if self.on_settled is not None:
+            self.on_settled(delivery_tags, published)
+
+    # ----- publishing thread -----
+
+    def _run(self) -> None:
+        while not self._closing:
+            try:
+                self._pub_connection = pika.SelectConnection(
+                    pika.URLParameters(self.url),
+                    on_open_callback=self._on_connection_open,
+                    on_open_error_callback=self._on_connection_open_error,
+                    on_close_callback=self._on_connection_closed,
+                )
+                self._pub_connection.ioloop.start()
+            except Exception:
+                logger.exception("Decoded telemetry publisher I/O loop failed")
+            self._on_disconnected()
+            if not self._closing:
+                self._wake.wait(self.reconnect_delay)
+                self._wake.clear()
+
+    def _on_connection_open(self, connection) -> None:
+        connection.channel(on_open_callback=self._on_channel_open)
+
+    def _on_connection_open_error(self, connection, error) -> None:
+        logger.error("Cannot connect the decoded telemetry publisher to RabbitMQ: %s", error)
+        connection.ioloop.stop()
+
+    def _on_connection_closed(self, connection, reason) -> None:
+        if not self._closing:
+            logger.warning("Decoded telemetry publisher connection closed: %s", reason)
+        self._ready = False
+        self._pub_channel = None
+        connection.ioloop.stop()
+
+    def _close_connection(self) -> None:
+        self._ready = False
+        connection = self._pub_connection
+        if connection is not None and not (connection.is_closing or connection.is_closed):
+            connection.close()
+
+    def _on_channel_open(self, channel) -> None:
+        self._pub_channel = channel
+        self._next_tag = 1
+        channel.add_on_close_callback(lambda _ch, reason: self._close_connection())
+        channel.confirm_delivery(ack_nack_callback=self._on_confirm)
+        channel.exchange_declare(exchange=self.exchange, exchange_type="topic", durable=True,
+                                 callback=self._on_exchange_declared)
+
+    def _on_exchange_declared(self, _frame) -> None:
+        self._ready = True
+        self._pump()
+
+    def _pump(self) -> None:
+        """Publish waiting batches while the confirm window has room."""
+        if not self._ready or self._pub_channel is None or not self._pub_channel.is_open:
+            return
+        properties = pika.BasicProperties(
+            delivery_mode=2,  # make message persistent
+            content_type=self.wire_format.content_type,
+        )
+        while len(self._inflight) < self.window:
+            with self._lock:
+                if not self._outbox:
+                    return
+                outgoing = self._outbox.popleft()
+            routing_key, body = outgoing[0], outgoing[1]
+            try:
+                self._pub_channel.basic_publish(exchange=self.exchange, routing_key=routing_key,
+                                                body=body, properties=properties)
+            except Exception as e:
+                logger.warning("Error publishing decoded batch for %s: %s; reconnecting", routing_key, e)
+                with self._lock:
+                    self._outbox.appendleft(outgoing)
+                self._close_connection()
+                return
+            self._inflight[self._next_tag] = outgoing
+            self._next_tag += 1
+
+    def _on_confirm(self, frame) -> None:
+        method = frame.method
+        if method.multiple:
+            tags = [t for t in self._inflight if t <= method.delivery_tag]
+        else:
+            tags = [method.delivery_tag] if method.delivery_tag in self._inflight else []
+        published = not isinstance(method, pika.spec.Basic.Nack)
+        for tag in tags:
+            routing_key, _, delivery_tags, rows, packets = self._inflight.pop(tag)
+            if published:
+                logger.info("Published %d decoded rows (%d packets) to exchange '%s' key '%s'",
+                            rows, packets, self.exchange, routing_key)
+            else:
+                logger.error("Broker rejected decoded batch for %s (%d packets); requeueing inputs",
+                             routing_key, packets)
+            self._hand_back(delivery_tags, published)
+        self._pump()
+
+    def _hand_back(self, delivery_tags: List[int], published: bool) -> None:
+        """Settle inputs on the consumer I/O thread."""
+        try:
+            self.connection.add_callback_threadsafe(
+                functools.partial(self._settle, delivery_tags, published))
+        except Exception:
+            # Consumer connection is gone; the broker redelivers its unacked inputs
+            pass
+
+    def _on_disconnected(self) -> None:
+        """Published batches left unconfirmed: requeue their inputs."""
+        self._ready = False
+        self._pub_channel = None
+        self._pub_connection = None
+        if self._inflight:
+            logger.warning("%d decoded batches unconfirmed when the publisher connection closed; "
+                           "requeueing their inputs", len(self._inflight))
+        for _, _, delivery_tags, _, _ in self._inflight.values():
+            self._hand_back(delivery_tags, False)
+        self._inflight.clear()
+        if self._closing:
+            with self._lock:
+                outbox, self._outbox = list(self._outbox), collections.deque()
+            for _, _, delivery_tags, _, _ in outbox:
+                self._hand_back(delivery_tags, False)
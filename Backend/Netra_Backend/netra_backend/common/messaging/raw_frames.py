@@ -0,0 +1,96 @@
+# netra_backend/common/messaging/raw_frames.py
+import base64
+import itertools
+import json
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------------------------------------
+# Message formats for telemetry.raw
+# ---------------------------------------------------------
+#
+# The AMQP content_type says how a raw packet is carried:
+#
+#   (none) / application/json
+#       Legacy: the OpenC3 packet dict as it came off the websocket,
+#       including the base64 "buffer" field.
+#
+#   application/vnd.netra.frame.v1
+#       The body is the raw frame bytes. The packet's other scalar fields
+#       travel as AMQP headers under their OpenC3 names (__packet, __time
+#       in ns, __type, received counters, ...), plus x-ingest-seq, the
+#       ingestor's own per-process message counter.
+#
+# Frame messages skip a JSON encode/decode and a base64 round trip per
+# packet on both sides, and are about a third smaller on the broker.
+# ws_ingestor picks the format with WS_RAW_FORMAT (json | frame);
+# consumers accept both, so the two can be switched in any order.
+
+CONTENT_TYPE_FRAME = "application/vnd.netra.frame.v1"
+RAW_FORMATS = ("json", "frame")
+
+HDR_PACKET = "__packet"
+HDR_TIME = "__time"
+HDR_SEQ = "x-ingest-seq"
+
+# (routing_key, body, content_type, headers), as taken by RabbitMQPublisher.publish_batch
+Message = Tuple[str, bytes, Optional[str], Optional[Dict[str, Any]]]
+
+
+def decode_buffer(buffer_b64: str) -> bytes:
+    """
+    Convert OpenC3 'buffer' field (base64 with possible newlines) to raw frame bytes.
+    """
+    return base64.b64decode(buffer_b64.replace("\n", ""))
+
+
+def json_message(pkt: Dict) -> Message:
+    """Legacy message: the packet dict as JSON."""
+    body = json.dumps(pkt, default=str).encode("utf-8")
+    return pkt.get("__packet", "<no __packet field>"), body, None, None
+
+
+class RawFrameEncoder:
+    """
+    OpenC3 packet dict -> telemetry.raw message in the configured format.
+    Packets without a usable buffer are sent as JSON so the consumer still
+    sees (and reports) them.
+    """
+
+    def __init__(self, raw_format: str = "json"):
+        if raw_format not in RAW_FORMATS:
+            raise ValueError(f"WS_RAW_FORMAT must be one of {RAW_FORMATS}, not {raw_format!r}")
+        self.raw_format = raw_format
+        self._seq = itertools.count(1)
+
+    def encode(self, pkt: Dict) -> Tuple[Message, Optional[bytes]]:
+        """The message, and the decoded frame when there is one (for the archive)."""
+        buffer_b64 = pkt.get("buffer")
+        frame = None
+        if buffer_b64:
+            try:
+                frame = decode_buffer(buffer_b64) or None
+            except Exception:
+                logger.warning("Undecodable buffer for %s; publishing it as JSON",
+                               pkt.get("__packet", "<no __packet field>"))
+        if self.raw_format == "json" or frame is None:
+            return json_message(pkt), frame
+
+        headers = {k: v for k, v in pkt.items()
+                   if k != "buffer" and isinstance(v, (str, int, float, bool))}
+        headers[HDR_SEQ] = next(self._seq)
+        routing_key = headers.get(HDR_PACKET, "<no __packet field>")
+        return (routing_key, frame, CONTENT_TYPE_FRAME, headers), frame
+
+
+def frame_from_message(content_type: Optional[str],
+                       headers: Optional[Dict[str, Any]], body: bytes) -> Optional[Tuple[str, bytes]]:
+    """(packet name, raw frame) of a frame message; None for any other format."""
+    if content_type != CONTENT_TYPE_FRAME:
+        return None
+    packet_name = (headers or {}).get(HDR_PACKET)
+    if isinstance(packet_name, bytes):
+        packet_name = packet_name.decode("utf-8", "replace")
+    return packet_name or "<no __packet>", body
@@ -0,0 +1,78 @@
+# netra_backend/common/messaging/raw_topology.py
+import os
+from dataclasses import dataclass
+
+# ---------------------------------------------------------
+# telemetry.raw queue topology
+# ---------------------------------------------------------
+#
+# RAW_TOPOLOGY=per_packet (default)
+#
+#     telemetry.raw (direct) --<name>--> pkt.<name>      one queue per packet
+#
+# RAW_TOPOLOGY=sharded
+#
+#     telemetry.raw (direct) --<name>--> telemetry.raw.shards (x-consistent-hash)
+#                                            |-- weight 1 --> raw.shard.0
+#                                            |-- ...
+#                                            `-- weight 1 --> raw.shard.<RAW_SHARDS-1>
+#
+#   The health packets (the ones the health consumer decodes) are routed by
+#   an exchange-to-exchange binding into a consistent-hash exchange, which
+#   hashes the routing key (packet name) onto RAW_SHARDS shard queues: all
+#   frames of a packet land on one shard, in order. Other packets keep their
+#   pkt.<name> queue. Shard queues are single-active-consumer, so however
+#   health consumer replicas subscribe, one of them at a time consumes a
+#   shard; replicas divide the shards between them (see
+#   services/shard_claims.py).
+#
+#   Needs the rabbitmq_consistent_hash_exchange broker plugin.
+
+TOPOLOGY_PER_PACKET = "per_packet"
+TOPOLOGY_SHARDED = "sharded"
+TOPOLOGIES = (TOPOLOGY_PER_PACKET, TOPOLOGY_SHARDED)
+
+# Packets the health consumer decodes (and, when sharded, the ones on shards)
+HEALTH_MARKER = "__HEALTH_"
+
+# Binding key of a shard queue on the consistent-hash exchange: its weight
+SHARD_WEIGHT = "1"
+
+
+def is_health_packet(packet_name: str) -> bool:
+    return HEALTH_MARKER in packet_name
+
+
+@dataclass
+class RawTopology:
+    mode: str = TOPOLOGY_PER_PACKET
+    shards: int = 8
+    shard_exchange: str = "telemetry.raw.shards"
+
+    def __post_init__(self):
+        if self.mode not in TOPOLOGIES:
+            raise ValueError(f"RAW_TOPOLOGY must be one of {TOPOLOGIES}, not {self.mode!r}")
+        self.shards = max(1, self.shards)
+
+    @classmethod
+    def from_env(cls) -> "RawTopology":
+        return cls(
+            mode=os.getenv("RAW_TOPOLOGY", TOPOLOGY_PER_PACKET).lower(),
+            shards=int(os.getenv("RAW_SHARDS", "8")),
+            shard_exchange=os.getenv("RABBITMQ_SHARD_EXCHANGE", "telemetry.raw.shards"),
+        )
+
+    @property
+    def sharded(self) -> bool:
+        return self.mode == TOPOLOGY_SHARDED
+
+    def routes_to_shards(self, packet_name: str) -> bool:
+        return self.sharded and is_health_packet(packet_name)
+
+    @staticmethod
+    def packet_queue(packet_name: str) -> str:
+        return f"pkt.{packet_name}"
+
+    @staticmethod
+    def shard_queue(index: int) -> str:
+        return f"raw.shard.{index}"
@@ -0,0 +1,182 @@
+# netra_backend/common/messaging/spool.py
+import logging
+import os
+import re
+import struct
+from typing import BinaryIO, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------------------------------------
+# Write-ahead spool for outgoing AMQP messages
+# ---------------------------------------------------------
+#
+# An ordered, append-only queue of records on disk, used by
+# RabbitMQPublisher for the messages it cannot hand to the broker right
+# now (channel down, unconfirmed at a disconnect, memory limit reached):
+#
+#     <directory>/spool-<seq>.wal     records: u32 length, then the payload
+#
+# Records are read back in order with a cursor that can be rewound to a
+# position returned by read() (messages published but never confirmed).
+# Segments before the oldest position still needed are deleted, and the
+# spool disappears entirely once everything in it is confirmed, so a
+# healthy publisher does no disk I/O at all.
+#
+# Writes are flushed to the OS, not fsynced: a spool survives a process or
+# container restart, not a host crash. After a crash a torn last record is
+# skipped. Confirmed records of the oldest remaining segment are sent
+# again after a restart (consumers deduplicate raw frames).
+
+_LEN = struct.Struct("!I")
+_NAME = re.compile(r"^spool-(\d+)\.wal$")
+
+# (segment, offset) of a record
+Position = Tuple[int, int]
+
+
+class Spool:
+    def __init__(self, directory: str, segment_bytes: int = 16 << 20, max_bytes: int = 2 << 30):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+        self._sizes: Dict[int, int] = {}
+        for name in os.listdir(directory):
+            m = _NAME.match(name)
+            if m:
+                self._sizes[int(m.group(1))] = os.path.getsize(os.path.join(directory, name))
+        self._segments: List[int] = sorted(self._sizes)
+        self.bytes = sum(self._sizes.values())
+
+        # A restarted process never appends to a segment that may end in a torn record
+        self._writer: Optional[BinaryIO] = None
+        self._write_seq: Optional[int] = None
+        self._reader: Optional[BinaryIO] = None
+        self._reader_seq: Optional[int] = None
+        self._cursor: Optional[Position] = (self._segments[0], 0) if self._segments else None
+
+        self.dropped = 0
+        if self.bytes:
+            logger.info("Spool %s holds %d bytes in %d segments from a previous run",
+                        directory, self.bytes, len(self._segments))
+
+    def _path(self, seq: int) -> str:
+        return os.path.join(self.directory, f"spool-{seq:012d}.wal")
+
+    def __len__(self) -> int:
+        return self.bytes
+
+    def has_unread(self) -> bool:
+        if self._cursor is None:
+            return False
+        seq, offset = self._cursor
+        return seq != self._segments[-1] or offset < self._sizes[seq]
+
+    def append(self, payloads: Sequence[bytes]) -> None:
+        for payload in payloads:
+            size = _LEN.size + len(payload)
+            if self.bytes + size > self.max_bytes:
+                self.dropped += 1
+                if self.dropped == 1 or self.dropped % 10000 == 0:
+                    logger.error("Spool %s full (%d bytes); %d messages dropped",
+                                 self.directory, self.bytes, self.dropped)
+                continue
+            if self._writer is None or self._sizes[self._write_seq] >= self.segment_bytes:
+                self._rotate()
+            self._writer.write(_LEN.pack(len(payload)))
+            self._writer.write(payload)
+            self._sizes[self._write_seq] += size
+            self.bytes += size
+
+    def _rotate(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        seq = self._segments[-1] + 1 if self._segments else 1
+        self._writer = open(self._path(seq), "ab")
+        self._write_seq = seq
+        self._segments.append(seq)
+        self._sizes[seq] = 0
+        if self._cursor is None:
+            self._cursor = (seq, 0)
+
+    def flush(self) -> None:
+        if self._writer is not None:
+            self._writer.flush()
+
+    def read(self) -> Optional[Tuple[bytes, Position]]:
+        """Next unread record and its position, or None."""
+        while self._cursor is not None:
+            seq, offset = self._cursor
+            size = self._sizes[seq]
+            if offset + _LEN.size <= size:
+                if seq == self._write_seq:
+                    self._writer.flush()
+                if self._reader_seq != seq:
+                    if self._reader is not None:
+                        self._reader.close()
+                    self._reader = open(self._path(seq), "rb")
+                    self._reader_seq = seq
+                self._reader.seek(offset)
+                (length,) = _LEN.unpack(self._reader.read(_LEN.size))
+                end = offset + _LEN.size + length
+                if end <= size:
+                    payload = self._reader.read(length)
+                    self._cursor = (seq, end)
+                    return payload, (seq, offset)
+                logger.warning("Skipping torn record at the end of %s", self._path(seq))
+            # End of this segment
+            if seq == self._segments[-1]:
+                self._cursor = (seq, size)
+                return None
+            self._cursor = (self._segments[self._segments.index(seq) + 1], 0)
+        return None
+
+    def rewind(self, position: Position) -> None:
+        """Read again from `position` (a record returned by read())."""
+        self._cursor = position
+
+    def release(self, position: Optional[Position]) -> None:
+        """
+        Records before `position` (or, with None, before the read cursor) are
+        no longer needed: delete their whole segments. An empty spool is
+        removed from disk.
+        """
+        if position is None:
+            if self._cursor is not None and not self.has_unread():
+                self.reset()
+                return
+            position = self._cursor
+        if position is None:
+            return
+        while self._segments and self._segments[0] < position[0]:
+            self._delete(self._segments.pop(0))
+
+    def _delete(self, seq: int) -> None:
+        if self._reader_seq == seq:
+            self._reader.close()
+            self._reader = self._reader_seq = None
+        if self._write_seq == seq:
+            self._writer.close()
+            self._writer = self._write_seq = None
+        self.bytes -= self._sizes.pop(seq)
+        try:
+            os.remove(self._path(seq))
+        except FileNotFoundError:
+            pass
+
+    def reset(self) -> None:
+        """Delete every segment."""
+        for seq in self._segments:
+            self._delete(seq)
+        self._segments = []
+        self._cursor = None
+        self.bytes = 0
+
+    def close(self) -> None:
+        for f in (self._writer, self._reader):
+            if f is not None:
+                f.close()
+        self._writer = self._reader = None
+        self._write_seq = self._reader_seq = None
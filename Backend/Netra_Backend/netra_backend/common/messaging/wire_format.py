@@ -0,0 +1,258 @@
+# netra_backend/common/messaging/wire_format.py
+import json
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import msgpack
+except ImportError:  # msgpack is optional; columnar messages fall back to JSON framing
+    msgpack = None
+
+logger = logging.getLogger(__name__)
+
+HAVE_MSGPACK = msgpack is not None
+
+# ---------------------------------------------------------
+# Wire formats for telemetry.decoded
+# ---------------------------------------------------------
+#
+# The AMQP content_type says how a decoded message is encoded:
+#
+#   application/json
+#       Legacy rows format (easy to read in the management UI):
+#       {"meta": {...}, "data": [{col: value, ...}, ...]}
+#
+#   application/vnd.netra.columnar.v1+msgpack
+#   application/vnd.netra.columnar.v1+json
+#       Columnar format, version 1. The body is a stream of documents -
+#       concatenated msgpack objects, or one JSON document per line:
+#
+#           {"v": 1, "meta": {...}}                                  header
+#           {"columns": [names], "types": [tags], "data": [[...], ...]}  one per decoded packet
+#
+#       Column names appear once per packet and "data" holds one value
+#       list per column. Type tags: int, float, bool, str, ts (ISO 8601
+#       text, converted back to datetime on read), null, any, and the
+#       declared timestamp tags epoch_s / epoch_ms (raw integers, converted
+#       to UTC datetimes on read; see decoding.frame).
+#
+# Rows messages carry declared column types in meta["column_types"]
+# instead, so readers can convert the same columns without guessing.
+#
+# One document per packet lets a micro-batch be built by concatenating
+# packets that were encoded independently on the decode thread.
+
+CONTENT_TYPE_JSON = "application/json"
+COLUMNAR_VERSION = 1
+CONTENT_TYPE_COLUMNAR_MSGPACK = f"application/vnd.netra.columnar.v{COLUMNAR_VERSION}+msgpack"
+CONTENT_TYPE_COLUMNAR_JSON = f"application/vnd.netra.columnar.v{COLUMNAR_VERSION}+json"
+
+Rows = List[Dict[str, Any]]
+ColumnLists = Dict[str, List[Any]]
+
+_TYPE_TAGS = {bool: "bool", int: "int", float: "float", str: "str", datetime: "ts"}
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_EPOCH_UNITS = {"epoch_s": 1, "epoch_ms": 1000}
+
+
+def column_type(values: Sequence[Any]) -> str:
+    """Type tag for one column of plain Python values."""
+    kinds = {type(v) for v in values}
+    kinds.discard(type(None))
+    if not kinds:
+        return "null"
+    if len(kinds) == 1:
+        return _TYPE_TAGS.get(kinds.pop(), "any")
+    if kinds == {int, float}:
+        return "float"
+    return "any"
+
+
+def _typed_value(value: Any, tag: str) -> Any:
+    if value is None or isinstance(value, datetime):
+        return value
+    if tag == "ts":
+        return datetime.fromisoformat(value)
+    try:
+        return _EPOCH + timedelta(seconds=value / _EPOCH_UNITS[tag])
+    except (OverflowError, TypeError):
+        # Not representable as a timestamp (garbage epoch); store NULL
+        return None
+
+
+def typed_values(values: Sequence[Any], tag: str) -> List[Any]:
+    """
+    Convert one column to Python values according to its type tag:
+    epoch_s / epoch_ms integers and ISO 8601 "ts" text become aware UTC
+    datetimes. Other tags pass through unchanged.
+    """
+    if tag != "ts" and tag not in _EPOCH_UNITS:
+        return list(values)
+    return [_typed_value(v, tag) for v in values]
+
+
+def rows_to_column_lists(rows: Rows) -> ColumnLists:
+    """Pivot decoder rows into {column: [values...]}; missing keys become None."""
+    names: Dict[str, None] = {}
+    for row in rows:
+        for key in row:
+            names.setdefault(key)
+    return {name: [row.get(name) for row in rows] for name in names}
+
+
+def column_lists_to_rows(columns: ColumnLists) -> Rows:
+    names = list(columns)
+    return [dict(zip(names, values)) for values in zip(*columns.values())]
+
+
+@dataclass
+class ColumnBatch:
+    """One decoded packet read back from a columnar message."""
+    columns: ColumnLists
+    types: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def num_rows(self) -> int:
+        for values in self.columns.values():
+            return len(values)
+        return 0
+
+
+class WireFormat:
+    """
+    Encoder for one telemetry.decoded format. encode_packet() runs on the
+    decode thread; encode_message() joins already-encoded packets into one
+    AMQP body (see BatchingConfirmPublisher).
+    """
+    name = ""
+    content_type = ""
+
+    def encode_packet(self, rows: Optional[Rows] = None, columns: Optional[ColumnLists] = None,
+                      column_types: Optional[Dict[str, str]] = None) -> bytes:
+        raise NotImplementedError
+
+    def encode_message(self, meta: Dict[str, Any], parts: List[bytes]) -> bytes:
+        raise NotImplementedError
+
+
+class JsonRowsFormat(WireFormat):
+    name = "json"
+    content_type = CONTENT_TYPE_JSON
+
+    def encode_packet(self, rows: Optional[Rows] = None, columns: Optional[ColumnLists] = None,
+                      column_types: Optional[Dict[str, str]] = None) -> bytes:
+        # Declared types go in the message meta (see BatchingConfirmPublisher)
+        if rows is None:
+            rows = column_lists_to_rows(columns)
+        return json.dumps(rows, default=str).encode("utf-8")
+
+    def encode_message(self, meta: Dict[str, Any], parts: List[bytes]) -> bytes:
+        # Splice the pre-serialized row arrays together instead of re-encoding rows
+        data = b",".join(part[1:-1] for part in parts if len(part) > 2)
+        return b'{"meta": ' + json.dumps(meta).encode("utf-8") + b', "data": [' + data + b']}'
+
+
+class ColumnarFormat(WireFormat):
+    def __init__(self, framing: str = "msgpack"):
+        if framing == "msgpack" and msgpack is None:
+            raise ValueError("msgpack framing requested but msgpack is not installed")
+        if framing not in ("msgpack", "json"):
+            raise ValueError(f"unknown columnar framing {framing!r}")
+        self.framing = framing
+        self.name = f"columnar+{framing}"
+        self.content_type = CONTENT_TYPE_COLUMNAR_MSGPACK if framing == "msgpack" else CONTENT_TYPE_COLUMNAR_JSON
+
+    def _dump(self, doc: Dict[str, Any]) -> bytes:
+        if self.framing == "msgpack":
+            return msgpack.packb(doc, default=str, use_bin_type=True)
+        return json.dumps(doc, default=str, separators=(",", ":")).encode("utf-8") + b"\n"
+
+    def encode_packet(self, rows: Optional[Rows] = None, columns: Optional[ColumnLists] = None,
+                      column_types: Optional[Dict[str, str]] = None) -> bytes:
+        if columns is None:
+            columns = rows_to_column_lists(rows)
+        column_types = column_types or {}
+        types = []
+        data = []
+        for name, values in columns.items():
+            tag = column_types.get(name) or column_type(values)
+            if tag == "ts":
+                values = [None if v is None else v.isoformat() for v in values]
+            elif not isinstance(values, list):
+                values = list(values)
+            types.append(tag)
+            data.append(values)
+        return self._dump({"columns": list(columns), "types": types, "data": data})
+
+    def encode_message(self, meta: Dict[str, Any], parts: List[bytes]) -> bytes:
+        return self._dump({"v": COLUMNAR_VERSION, "meta": meta}) + b"".join(parts)
+
+
+def get_wire_format(name: str) -> WireFormat:
+    """
+    Resolve a HEALTH_WIRE_FORMAT setting: "json" (rows), "columnar"
+    (msgpack framing when available, else JSON framing), or explicitly
+    "columnar+msgpack" / "columnar+json".
+    """
+    name = name.lower()
+    if name == "json":
+        return JsonRowsFormat()
+    if name == "columnar":
+        if msgpack is None:
+            logger.warning("msgpack not installed; using JSON framing for the columnar wire format")
+            return ColumnarFormat("json")
+        return ColumnarFormat("msgpack")
+    if name.startswith("columnar+"):
+        return ColumnarFormat(name.split("+", 1)[1])
+    raise ValueError(f"unknown wire format {name!r}")
+
+
+# ---------------------------------------------------------
+# Reading
+# ---------------------------------------------------------
+
+def is_columnar(content_type: Optional[str]) -> bool:
+    return bool(content_type) and content_type.startswith("application/vnd.netra.columnar.")
+
+
+def _iter_documents(body: bytes, content_type: str):
+    if content_type.endswith("+msgpack"):
+        if msgpack is None:
+            raise ValueError(f"cannot read {content_type}: msgpack is not installed")
+        unpacker = msgpack.Unpacker(raw=False)
+        unpacker.feed(body)
+        yield from unpacker
+    elif content_type.endswith("+json"):
+        for line in body.splitlines():
+            if line.strip():
+                yield json.loads(line)
+    else:
+        raise ValueError(f"unknown columnar framing in {content_type!r}")
+
+
+def decode_columnar(body: bytes, content_type: str) -> Tuple[Dict[str, Any], List[ColumnBatch]]:
+    """
+    Read a columnar message into (meta, one ColumnBatch per decoded packet).
+    Raises ValueError for unsupported versions or framings.
+    """
+    if content_type != CONTENT_TYPE_COLUMNAR_MSGPACK and content_type != CONTENT_TYPE_COLUMNAR_JSON:
+        raise ValueError(f"unsupported columnar content type {content_type!r}")
+
+    docs = _iter_documents(body, content_type)
+    header = next(docs, None)
+    if not isinstance(header, dict) or header.get("v") != COLUMNAR_VERSION:
+        raise ValueError(f"unsupported columnar message header: {header!r}")
+
+    batches = []
+    for doc in docs:
+        names = doc["columns"]
+        types = doc["types"]
+        columns = {
+            name: typed_values(values, tag)
+            for name, tag, values in zip(names, types, doc["data"])
+        }
+        batches.append(ColumnBatch(columns, dict(zip(names, types))))
+    return header.get("meta", {}), batches
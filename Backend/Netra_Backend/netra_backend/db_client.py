@@ -1,12 +1,21 @@
 # netra_backend/db_client.py
 import psycopg2
+import contextlib
+import io
 import logging
 import os
-from typing import Dict, List, Any, Set
+import struct
+from operator import itemgetter
+from typing import Callable, Dict, List, Any, Optional, Sequence, Set, Tuple
 
 import psycopg2
 from psycopg2.extras import execute_values
-from datetime import datetime
+from datetime import datetime, timezone
+
+from netra_backend import db_packing, db_partitions, db_rollups
+from netra_backend.db_packing import PackedLayout, PackedLayouts
+from netra_backend.db_partitions import PartitionPolicies, PartitionPolicy
+from netra_backend.db_rollups import RollupPolicy
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +32,253 @@ def _infer_pg_type(value: Any) -> str:
     return "TEXT"
 
 
+def _infer_column_pg_type(values: Sequence[Any]) -> Optional[str]:
+    """
+    Type for a column from all of its values in a batch, like _infer_pg_type
+    but ints mixed with floats widen to DOUBLE PRECISION and other mixes
+    fall back to TEXT. None when every value is NULL.
+    """
+    # One value per distinct Python type is enough
+    samples = dict(zip(map(type, values), values))
+    samples.pop(type(None), None)
+    kinds = {_infer_pg_type(v) for v in samples.values()}
+    if not kinds:
+        return None
+    if len(kinds) == 1:
+        return kinds.pop()
+    if kinds == {"BIGINT", "DOUBLE PRECISION"}:
+        return "DOUBLE PRECISION"
+    return "TEXT"
+
+
+# ---------------------------------------------------------
+# Binary COPY encoding
+# ---------------------------------------------------------
+#
+# COPY ... FROM STDIN (FORMAT binary) skips Postgres' text parsing, but every
+# value must already be in the column's exact wire type. Values are coerced
+# per column type the way an INSERT's assignment cast would (e.g. a float
+# into a BIGINT column is rounded); anything else raises _NotBinary and the
+# batch is loaded with a plain INSERT instead.
+
+_COPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack("!ii", 0, 0)
+_COPY_TRAILER = struct.pack("!h", -1)
+_NULL_FIELD = struct.pack("!i", -1)
+_PG_EPOCH = datetime(2000, 1, 1, tzinfo=timezone.utc)
+
+
+class _NotBinary(Exception):
+    """A value cannot be sent in binary COPY format."""
+
+
+def _as_int(value: Any) -> int:
+    if isinstance(value, bool):
+        raise _NotBinary("boolean into integer column")
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        try:
+            return round(value)  # Postgres rounds float -> int half to even, like round()
+        except (ValueError, OverflowError):
+            raise _NotBinary("non-finite float into integer column")
+    raise _NotBinary(f"{type(value).__name__} into integer column")
+
+
+def _int_encoder(fmt: str) -> Callable[[Any], bytes]:
+    packer = struct.Struct(fmt)
+
+    def encode(value: Any) -> bytes:
+        try:
+            return packer.pack(_as_int(value))
+        except struct.error:
+            raise _NotBinary("integer out of range")
+    return encode
+
+
+def _float_encoder(fmt: str) -> Callable[[Any], bytes]:
+    packer = struct.Struct(fmt)
+
+    def encode(value: Any) -> bytes:
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise _NotBinary(f"{type(value).__name__} into float column")
+        try:
+            return packer.pack(value)
+        except (struct.error, OverflowError):
+            raise _NotBinary("float out of range")
+    return encode
+
+
+def _encode_bool(value: Any) -> bytes:
+    if not isinstance(value, bool):
+        raise _NotBinary(f"{type(value).__name__} into boolean column")
+    return b"\x01" if value else b"\x00"
+
+
+def _encode_text(value: Any) -> bytes:
+    if isinstance(value, str):
+        return value.encode("utf-8")
+    if isinstance(value, bool):
+        return b"true" if value else b"false"
+    if isinstance(value, (int, float)):
+        return repr(value).encode("ascii")
+    raise _NotBinary(f"{type(value).__name__} into text column")
+
+
+def _encode_timestamp(value: Any) -> bytes:
+    if not isinstance(value, datetime):
+        raise _NotBinary(f"{type(value).__name__} into timestamp column")
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    delta = value - _PG_EPOCH
+    micros = (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+    return struct.pack("!q", micros)
+
+
+# information_schema udt_name -> encoder
+_BINARY_ENCODERS: Dict[str, Callable[[Any], bytes]] = {
+    "int2": _int_encoder("!h"),
+    "int4": _int_encoder("!i"),
+    "int8": _int_encoder("!q"),
+    "float4": _float_encoder("!f"),
+    "float8": _float_encoder("!d"),
+    "bool": _encode_bool,
+    "text": _encode_text,
+    "varchar": _encode_text,
+    "timestamptz": _encode_timestamp,
+    "timestamp": _encode_timestamp,
+}
+
+# Array element type OIDs (binary array format carries the element type)
+_ARRAY_ELEMENTS = {"_int2": ("int2", 21), "_int8": ("int8", 20), "_float4": ("float4", 700),
+                   "_float8": ("float8", 701), "_bool": ("bool", 16)}
+
+
+def _array_encoder(element_udt: str, oid: int) -> Callable[[Any], bytes]:
+    encode_element = _BINARY_ENCODERS[element_udt]
+    pack_len = struct.Struct("!i").pack
+
+    def encode(value: Any) -> bytes:
+        if not isinstance(value, (list, tuple)):
+            raise _NotBinary(f"{type(value).__name__} into array column")
+        if not value:
+            return struct.pack("!iii", 0, 0, oid)
+        parts = []
+        has_null = 0
+        for element in value:
+            if element is None:
+                has_null = 1
+                parts.append(_NULL_FIELD)
+            else:
+                data = encode_element(element)
+                parts.append(pack_len(len(data)))
+                parts.append(data)
+        # One dimension, lower bound 1
+        return struct.pack("!iiiii", 1, has_null, oid, len(value), 1) + b"".join(parts)
+    return encode
+
+
+def _encode_varbit(value: Any) -> bytes:
+    if not isinstance(value, str) or value.strip("01"):
+        raise _NotBinary("bit string expected")
+    padded = value + "0" * (-len(value) % 8)
+    data = int(padded, 2).to_bytes(len(padded) // 8, "big") if padded else b""
+    return struct.pack("!i", len(value)) + data
+
+
+_BINARY_ENCODERS.update({udt: _array_encoder(*element) for udt, element in _ARRAY_ELEMENTS.items()})
+_BINARY_ENCODERS["varbit"] = _encode_varbit
+
+
+def encode_copy_binary(encoders: Sequence[Callable[[Any], bytes]], values: Sequence[Sequence[Any]]) -> bytes:
+    """
+    Build a binary COPY payload. Raises _NotBinary if a value does not fit
+    its column's encoder.
+    """
+    buf = io.BytesIO()
+    write = buf.write
+    write(_COPY_HEADER)
+    field_count = struct.pack("!h", len(encoders))
+    pack_len = struct.Struct("!i").pack
+    for row in values:
+        write(field_count)
+        for encode, value in zip(encoders, row):
+            if value is None:
+                write(_NULL_FIELD)
+            else:
+                data = encode(value)
+                write(pack_len(len(data)))
+                write(data)
+    write(_COPY_TRAILER)
+    return buf.getvalue()
+
+
+# ---------------------------------------------------------
+# Schema cache invalidation
+# ---------------------------------------------------------
+#
+# PostgresClient keeps {table: {column: udt_name}} for the current schema,
+# loaded with one catalog query at startup, so inserts never touch
+# information_schema. The cache is invalidated:
+#
+#   - by NOTIFY on SCHEMA_CHANNEL, sent by a DDL event trigger (installed
+#     at startup when the user may create event triggers, i.e. superuser)
+#     with the affected table name as payload, for tables created, altered
+#     or dropped by anyone else (migrations, psql, another worker);
+#   - when an INSERT / COPY hits UndefinedTable (table dropped meanwhile,
+#     or no event trigger installed);
+#   - after a rollback (tables created in the transaction are gone).
+
+SCHEMA_CHANNEL = "netra_schema"
+
+_SCHEMA_TRIGGER_SQL = f"""
+CREATE OR REPLACE FUNCTION netra_notify_schema_change() RETURNS event_trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+    r record;
+BEGIN
+    IF TG_EVENT = 'sql_drop' THEN
+        FOR r IN SELECT object_name FROM pg_event_trigger_dropped_objects()
+                 WHERE object_type = 'table'
+        LOOP
+            PERFORM pg_notify('{SCHEMA_CHANNEL}', r.object_name);
+        END LOOP;
+    ELSE
+        FOR r IN SELECT c.relname FROM pg_event_trigger_ddl_commands() d
+                 JOIN pg_class c ON c.oid = d.objid
+                 WHERE d.classid = 'pg_class'::regclass AND c.relkind IN ('r', 'p')
+        LOOP
+            PERFORM pg_notify('{SCHEMA_CHANNEL}', r.relname);
+        END LOOP;
+    END IF;
+END
+$$;
+"""
+
+# Integer columns a batch with floats may widen to DOUBLE PRECISION
+_INTEGER_UDTS = {"int2", "int4", "int8"}
+# Text columns a batch with datetimes retypes to TIMESTAMPTZ, converting the
+# stored text with _TEXT_TIMESTAMP_SQL
+_TEXT_UDTS = {"text", "varchar"}
+
+# Timestamps decoders used to store as text: ISO 8601 ('2026-01-16 12:00:00',
+# in the server's time zone unless it has an offset) and HEALTH_EPS's IST wall clock
+# ('January 16, 2026 5:30:00 PM'); anything else (e.g. 'INVALID_TS(...)')
+# becomes NULL. <col> is the quoted column.
+_TEXT_TIMESTAMP_SQL = r"""CASE
+    WHEN <col> ~ '^\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}' THEN <col>::TIMESTAMPTZ
+    WHEN <col> ~ '^[A-Z][a-z]+ \d{1,2}, \d{4} \d{1,2}:\d{2}:\d{2} [AP]M$'
+        THEN to_timestamp(<col>, 'FMMonth FMDD, YYYY FMHH12:MI:SS AM')::TIMESTAMP AT TIME ZONE 'Asia/Kolkata'
+END"""
+
+# Per-table schema version, bumped by every automatic change
+SCHEMA_VERSIONS_TABLE = "SCHEMA_VERSIONS"
+
+_SCHEMA_EVENT_TRIGGERS = {
+    "netra_schema_ddl_end": "ddl_command_end",
+    "netra_schema_sql_drop": "sql_drop",
+}
+
+
 class PostgresClient:
     """
     Simple PostgreSQL client for:
@@ -39,11 +295,29 @@ class PostgresClient:
         self.user = os.getenv("DB_USER", "netra_user")
         self.password = os.getenv("DB_PASSWORD", "netra_password")
 
+        self.schema_notify = os.getenv("DB_SCHEMA_NOTIFY", "1") == "1"
+        # Add missing columns / widen INT -> DOUBLE as decoders change (see evolve_table)
+        self.schema_evolve = os.getenv("DB_SCHEMA_EVOLVE", "1") == "1"
+        # Time partitioning and retention of packet tables (see db_partitions)
+        self.partitions = PartitionPolicies.from_env()
+        # Channel groups of opted-in wide packets stored as arrays (see db_packing)
+        self.packing = PackedLayouts.from_env()
+        self._unpacked_warned: Set[str] = set()
+        # 1m / 1h / 1d aggregates for dashboards (see db_rollups)
+        self.rollups = RollupPolicy.from_env()
+
         self.conn = None
-        self._known_tables: Set[str] = set()
+        # Schema cache: table -> {column: udt_name} (see load_schema)
+        self._schema: Dict[str, Dict[str, str]] = {}
+        self._schema_loaded = False
+        self._listen_conn = None
         self._connect()
         self._ensure_decoder_not_found_table()
         self._ensure_decoder_failed_table()
+        self._ensure_schema_versions_table()
+        self._ensure_rollups()
+        self._start_schema_listener()
+        self.load_schema()
 
     def _connect(self) -> None:
         logger.info(
@@ -63,80 +337,470 @@ class PostgresClient:
         self.conn.autocommit = True
         logger.info("Connected to Postgres")
 
-    def _table_exists_in_db(self, table_name: str) -> bool:
-        """Check if table actually exists in the database."""
+    def ensure_connection(self) -> None:
+        """Reconnect if the connection was closed (e.g. Postgres restarted)."""
+        if self.conn is None or self.conn.closed:
+            self._forget_schema()
+            self._connect()
+            self._ensure_decoder_not_found_table()
+            self._ensure_decoder_failed_table()
+            self._ensure_schema_versions_table()
+            self._ensure_rollups()
+        if self.schema_notify and (self._listen_conn is None or self._listen_conn.closed):
+            self._start_schema_listener()
+
+    # ----- schema cache -----
+
+    def load_schema(self) -> None:
+        """Load every table's columns in the current schema (one catalog query)."""
+        schema: Dict[str, Dict[str, str]] = {}
         with self.conn.cursor() as cur:
-            cur.execute("""
-                SELECT EXISTS (
-                    SELECT FROM information_schema.tables 
-                    WHERE table_name = %s
-                );
-            """, (table_name,))
-            return cur.fetchone()[0]
+            cur.execute(
+                "SELECT table_name, column_name, udt_name FROM information_schema.columns "
+                "WHERE table_schema = current_schema() ORDER BY table_name, ordinal_position"
+            )
+            for table, column, udt_name in cur.fetchall():
+                schema.setdefault(table, {})[column] = udt_name
+        self._schema = schema
+        self._schema_loaded = True
+        logger.info("Schema cache loaded: %d tables", len(schema))
+
+    def _load_table(self, packet_table: str) -> Optional[Dict[str, str]]:
+        with self.conn.cursor() as cur:
+            cur.execute(
+                "SELECT column_name, udt_name FROM information_schema.columns "
+                "WHERE table_schema = current_schema() AND table_name = %s ORDER BY ordinal_position",
+                (packet_table,),
+            )
+            columns = dict(cur.fetchall())
+        if not columns:
+            return None
+        self._schema[packet_table] = columns
+        return columns
+
+    def _forget_schema(self) -> None:
+        # Reloaded in one query on next use
+        self._schema.clear()
+        self._schema_loaded = False
+
+    def invalidate_table(self, packet_table: str) -> None:
+        """Drop one table from the schema cache; reloaded from the catalog on next use."""
+        self._schema.pop(packet_table, None)
+
+    def _start_schema_listener(self) -> None:
+        if not self.schema_notify:
+            return
+        self._install_schema_trigger()
+        try:
+            conn = psycopg2.connect(
+                host=self.host,
+                port=self.port,
+                dbname=self.dbname,
+                user=self.user,
+                password=self.password,
+            )
+            conn.autocommit = True
+            with conn.cursor() as cur:
+                cur.execute(f"LISTEN {SCHEMA_CHANNEL}")
+        except psycopg2.Error as e:
+            logger.warning("Cannot LISTEN for schema changes (%s); relying on UndefinedTable", e)
+            self._listen_conn = None
+            return
+        self._listen_conn = conn
+        # Anything may have changed while nobody was listening
+        self._forget_schema()
+
+    def _install_schema_trigger(self) -> None:
+        try:
+            with self.conn.cursor() as cur:
+                cur.execute("SELECT evtname FROM pg_event_trigger WHERE evtname = ANY(%s)",
+                            (list(_SCHEMA_EVENT_TRIGGERS),))
+                existing = {row[0] for row in cur.fetchall()}
+                missing = [name for name in _SCHEMA_EVENT_TRIGGERS if name not in existing]
+                if not missing:
+                    return
+                cur.execute(_SCHEMA_TRIGGER_SQL)
+                for name in missing:
+                    cur.execute(
+                        f"CREATE EVENT TRIGGER {name} ON {_SCHEMA_EVENT_TRIGGERS[name]} "
+                        "EXECUTE FUNCTION netra_notify_schema_change()"
+                    )
+            logger.info("Installed schema change event triggers: %s", ", ".join(missing))
+        except psycopg2.Error as e:
+            # Event triggers need superuser; other workers' DDL then shows up as UndefinedTable
+            logger.warning("Cannot install schema change event trigger (%s)", e)
+
+    def _poll_schema_changes(self) -> None:
+        """Apply pending schema NOTIFYs. Reads the socket only; no round trip."""
+        conn = self._listen_conn
+        if conn is None:
+            return
+        try:
+            conn.poll()
+        except psycopg2.Error as e:
+            logger.warning("Schema listener connection lost (%s); reloading schema on next use", e)
+            conn.close()
+            self._listen_conn = None
+            self._forget_schema()
+            return
+        if not conn.notifies:
+            return
+        own_pid = self.conn.get_backend_pid()
+        for notify in conn.notifies:
+            # Our own CREATE TABLEs are already cached
+            if notify.pid != own_pid:
+                logger.info("Schema changed: %s", notify.payload)
+                self.invalidate_table(notify.payload)
+        conn.notifies.clear()
+
+    def table_columns(self, packet_table: str) -> Optional[Dict[str, str]]:
+        """
+        {column: udt_name} for a table in the current schema, or None if it
+        does not exist. Served from the schema cache.
+        """
+        self._poll_schema_changes()
+        if not self._schema_loaded:
+            self.load_schema()
+        columns = self._schema.get(packet_table)
+        if columns is None:
+            # Not cached: created or changed elsewhere since the last load
+            columns = self._load_table(packet_table)
+        return columns
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """
+        Run the block in one transaction (the connection is otherwise in
+        autocommit mode). Commits on success, rolls back on error.
+        """
+        self.conn.autocommit = False
+        try:
+            yield
+            self.conn.commit()
+        except Exception:
+            if not self.conn.closed:
+                self.conn.rollback()
+            self._forget_schema()
+            raise
+        finally:
+            if not self.conn.closed:
+                self.conn.autocommit = True
+
+    @contextlib.contextmanager
+    def savepoint(self, name: str = "batch"):
+        """
+        Inside transaction(): undo just this block if it raises, keeping the
+        rest of the transaction. The error is re-raised.
+        """
+        with self.conn.cursor() as cur:
+            cur.execute(f"SAVEPOINT {name}")
+        try:
+            yield
+        except Exception:
+            if not self.conn.closed:
+                with self.conn.cursor() as cur:
+                    cur.execute(f"ROLLBACK TO SAVEPOINT {name}")
+            self._forget_schema()
+            raise
+        with self.conn.cursor() as cur:
+            cur.execute(f"RELEASE SAVEPOINT {name}")
 
     def ensure_table_for_packet(self, packet_table: str, sample_row: Dict[str, Any]) -> None:
         """
         Ensure a table exists for this packet.
         Table name will be quoted exactly as provided (so use UPPERCASE if you like).
         """
-        # If we think it exists, verify it actually does in the DB
-        if packet_table in self._known_tables:
-            if self._table_exists_in_db(packet_table):
-                logger.info("Table %s already exists in DB, skipping creation", packet_table)
-                return
-            else:
-                # Table was deleted externally, remove from cache
-                self._known_tables.discard(packet_table)
-                logger.warning("Table %s was deleted externally, recreating...", packet_table)
+        # Schema cache; tables dropped elsewhere are invalidated (NOTIFY / UndefinedTable)
+        if self.table_columns(packet_table) is not None:
+            return
 
-        columns_sql_parts = []
+        column_types = {}
         for key, value in sample_row.items():
             col_type = _infer_pg_type(value)
+            logger.info("  Column '%s': value=%s, inferred_type=%s", key, type(value).__name__, col_type)
+            column_types[key] = col_type
+        self._create_table(packet_table, column_types)
+
+    def _create_table(self, packet_table: str, column_types: Dict[str, str]) -> None:
+        columns_sql_parts = []
+        for key, col_type in column_types.items():
             col_name = key  # assume safe; if needed, sanitize externally
-            logger.info("  Column '%s': value=%s, inferred_type=%s", col_name, type(value).__name__, col_type)
             columns_sql_parts.append(f'"{col_name}" {col_type}')
 
-        # Add a simple surrogate PK id and a timestamp
-        columns_sql = ", ".join(
-            ['id BIGSERIAL PRIMARY KEY', 'created_at TIMESTAMPTZ DEFAULT NOW()'] + columns_sql_parts
-        )
+        policy = self._partition_policy(packet_table)
+        time_column = policy.time_column
+        if policy.partitioned and time_column != "created_at" and column_types.get(time_column) != "TIMESTAMPTZ":
+            logger.warning("%s: no TIMESTAMPTZ column %r to partition on; using created_at", packet_table, time_column)
+            time_column = "created_at"
 
-        # Quote table name to preserve case and underscores
-        table_quoted = f'"{packet_table}"'
-        create_sql = f"CREATE TABLE IF NOT EXISTS {table_quoted} ({columns_sql});"
+        if policy.partitioned:
+            create_sql = db_partitions.create_table_sql(packet_table, columns_sql_parts, policy, time_column)
+        else:
+            # Add a simple surrogate PK id and a timestamp
+            columns_sql = ", ".join(
+                ['id BIGSERIAL PRIMARY KEY', 'created_at TIMESTAMPTZ DEFAULT NOW()'] + columns_sql_parts
+            )
+
+            # Quote table name to preserve case and underscores
+            table_quoted = f'"{packet_table}"'
+            create_sql = f"CREATE TABLE IF NOT EXISTS {table_quoted} ({columns_sql});"
 
         logger.info("Creating table %s with SQL: %s", packet_table, create_sql)
         with self.conn.cursor() as cur:
             cur.execute(create_sql)
+            if policy.partitioned:
+                created = db_partitions.ensure_partitions(cur, packet_table, policy, datetime.now(timezone.utc),
+                                                          time_column=time_column)
+                db_partitions.ensure_indexes(cur, packet_table, policy, time_column, list(column_types))
+                logger.info("Partitioned %s by %s on %s: %d partitions ahead",
+                            packet_table, policy.interval, time_column, len(created))
+            cur.execute(
+                f'INSERT INTO "{SCHEMA_VERSIONS_TABLE}" (table_name, version, change) VALUES (%s, 1, %s) '
+                "ON CONFLICT (table_name) DO NOTHING",
+                (packet_table, "created"),
+            )
+
+        # Another worker may have created it first with other columns
+        self._load_table(packet_table)
+
+    def _partition_policy(self, table: str) -> PartitionPolicy:
+        # A packed storage table follows its packet's policy
+        packed = self.packing.for_storage(table)
+        return self.partitions.for_table(packed[0] if packed else table)
 
-        self._known_tables.add(packet_table)
+    def evolve_table(self, packet_table: str, keys: List[str],
+                     values: List[Sequence[Any]]) -> Tuple[List[str], List[Sequence[Any]]]:
+        """
+        Make the table fit a batch before it is written: create it, add
+        columns the batch has but the table lacks, widen integer columns
+        that now receive floats to DOUBLE PRECISION, and retype text columns
+        that now receive datetimes (e.g. a decoder that stopped formatting a
+        timestamp) to TIMESTAMPTZ, converting the values already stored.
+        Types are inferred from all of the batch's values, not just the
+        first row. Columns that are new and NULL in every row are left out
+        of the batch (they would only insert NULLs) until a value arrives
+        to type them; returns the (keys, values) to write. Packed columns of
+        a packed storage table take their layout's types.
+        """
+        columns = self.table_columns(packet_table)
+        if not self.schema_evolve and columns is not None:
+            return keys, values
+        packed = self.packing.for_storage(packet_table)
+        declared = packed[1].column_types() if packed else {}
+
+        new_types: Dict[str, str] = {}
+        widen: List[str] = []
+        retype: List[str] = []
+        all_null: List[int] = []
+        for i, key in enumerate(keys):
+            udt = None if columns is None else columns.get(key)
+            if udt is None:
+                col_type = declared.get(key) or _infer_column_pg_type(list(map(itemgetter(i), values)))
+                if col_type is None:
+                    all_null.append(i)
+                else:
+                    new_types[key] = col_type
+            elif udt in _INTEGER_UDTS and float in set(map(type, map(itemgetter(i), values))):
+                widen.append(key)
+            elif udt in _TEXT_UDTS and any(isinstance(row[i], datetime) for row in values):
+                retype.append(key)
+
+        if all_null and len(all_null) == len(keys) and new_types == {}:
+            # Nothing to infer from; type them TEXT, as a first row of NULLs always did
+            new_types = {keys[i]: "TEXT" for i in all_null}
+            all_null = []
+
+        if columns is None:
+            self._create_table(packet_table, new_types)
+        elif new_types or widen or retype:
+            self._alter_table(packet_table, new_types, widen, retype)
+
+        if all_null:
+            logger.debug("Leaving out all-NULL new columns of %s: %s",
+                         packet_table, [keys[i] for i in all_null])
+            dropped = set(all_null)
+            keep = [i for i in range(len(keys)) if i not in dropped]
+            pick = itemgetter(*keep) if len(keep) > 1 else (lambda row, i=keep[0]: (row[i],))
+            keys = [keys[i] for i in keep]
+            values = [pick(row) for row in values]
+        return keys, values
+
+    def _alter_table(self, packet_table: str, new_types: Dict[str, str], widen: List[str],
+                     retype: Sequence[str] = ()) -> None:
+        actions = [f'ADD COLUMN IF NOT EXISTS "{k}" {t}' for k, t in new_types.items()]
+        actions += [f'ALTER COLUMN "{k}" TYPE DOUBLE PRECISION' for k in widen]
+        actions += [
+            f'ALTER COLUMN "{k}" TYPE TIMESTAMPTZ USING ' + _TEXT_TIMESTAMP_SQL.replace("<col>", f'"{k}"')
+            for k in retype
+        ]
+        change = "; ".join(
+            [f"add {k} {t}" for k, t in new_types.items()] + [f"widen {k} to DOUBLE PRECISION" for k in widen]
+            + [f"retype {k} TEXT to TIMESTAMPTZ" for k in retype]
+        )
+        packed = self.packing.for_storage(packet_table) if widen or retype else None
+        view_columns = None
+        with self.conn.cursor() as cur:
+            if packed:
+                # A column a view selects cannot change type; rebuilt below
+                view_columns = list(self._load_table(packed[0]) or ())
+                cur.execute(f'DROP VIEW IF EXISTS "{packed[0]}"')
+            # ADD COLUMN without a default is a catalog-only change; widening
+            # and retyping rewrite the table
+            cur.execute(f'ALTER TABLE "{packet_table}" ' + ", ".join(actions))
+            cur.execute(
+                f'INSERT INTO "{SCHEMA_VERSIONS_TABLE}" AS v (table_name, version, change) VALUES (%s, 2, %s) '
+                "ON CONFLICT (table_name) DO UPDATE "
+                "SET version = v.version + 1, updated_at = NOW(), change = EXCLUDED.change "
+                "RETURNING version",
+                (packet_table, change),
+            )
+            version = cur.fetchone()[0]
+        logger.warning("Schema of %s evolved to version %d: %s", packet_table, version, change)
+        self._load_table(packet_table)
+        if packed:
+            self._create_view(packed[0], packed[1], view_columns)
+
+    def _prepare_batch(self, packet_table: str, keys: List[str], values: List[Sequence[Any]]
+                       ) -> Tuple[str, List[str], List[Sequence[Any]]]:
+        """
+        (table, keys, values) to write for a batch: evolve_table() for a
+        plain table; for a packed packet, the batch packed for its storage
+        table, whose view is extended with any new columns.
+        """
+        layout = self.packing.for_table(packet_table)
+        if layout is not None:
+            storage = db_packing.storage_table(packet_table)
+            if self.table_columns(storage) is None and self.table_columns(packet_table) is not None:
+                # Created before packing was enabled; stays a plain table
+                if packet_table not in self._unpacked_warned:
+                    self._unpacked_warned.add(packet_table)
+                    logger.warning("%s is a plain table; not packing it", packet_table)
+                layout = None
+        if layout is None:
+            keys, values = self.evolve_table(packet_table, keys, values)
+            return packet_table, keys, values
+
+        packed_keys, packed_values, members = layout.pack(keys, values)
+        packed_keys, packed_values = self.evolve_table(storage, packed_keys, packed_values)
+        packed_columns = layout.column_types()
+        names = members + [k for k in packed_keys if k not in packed_columns]
+        view_columns = self.table_columns(packet_table)
+        if view_columns is None or any(name not in view_columns for name in names):
+            self._create_view(packet_table, layout, names)
+        return storage, packed_keys, packed_values
+
+    def _create_view(self, packet_table: str, layout: PackedLayout, names: Sequence[str]) -> None:
+        """(Re)create a packed packet's view with its current columns plus `names`."""
+        if self.conn.autocommit:
+            with self.transaction():
+                self._create_view(packet_table, layout, names)
+            return
+        storage = db_packing.storage_table(packet_table)
+        with self.conn.cursor() as cur:
+            # Serializes view rebuilds (self-conflicting) without blocking writers
+            cur.execute(f'LOCK TABLE "{storage}" IN SHARE UPDATE EXCLUSIVE MODE')
+            current = list(self._load_table(packet_table) or ())
+            names = current + [n for n in names if n not in current]
+            cur.execute(f'DROP VIEW IF EXISTS "{packet_table}"')
+            cur.execute(layout.view_sql(packet_table, names, self.table_columns(storage) or {}))
+        logger.info("View %s over %s: %d columns", packet_table, storage, len(names))
+        self._load_table(packet_table)
+
+    def copy_values(self, packet_table: str, keys: List[str], values: List[Sequence[Any]],
+                    sample_row: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Bulk-load rows with COPY ... FROM STDIN (FORMAT binary). Falls back
+        to a multi-row INSERT when a column type or value has no binary
+        encoding. Meant to run inside transaction(); creates the table from
+        the first row if needed.
+        """
+        if not values:
+            return
+        self.update_rollups(packet_table, keys, values)
+        packet_table, keys, values = self._prepare_batch(packet_table, keys, values)
+        if sample_row is None:
+            sample_row = dict(zip(keys, values[0]))
+
+        types = self._schema[packet_table]
+        try:
+            missing = [k for k in keys if k not in types]
+            if missing:
+                # Let the INSERT raise the usual UndefinedColumn error
+                raise _NotBinary(f"unknown columns {missing}")
+            encoders = []
+            for k in keys:
+                encoder = _BINARY_ENCODERS.get(types[k])
+                if encoder is None:
+                    raise _NotBinary(f"column {k!r} has type {types[k]}")
+                encoders.append(encoder)
+            payload = encode_copy_binary(encoders, values)
+        except _NotBinary as e:
+            logger.debug("Binary COPY not possible for %s (%s); using INSERT", packet_table, e)
+            self._execute_insert(packet_table, keys, values, sample_row)
+            return
+
+        columns_sql = ", ".join(f'"{k}"' for k in keys)
+        copy_sql = f'COPY "{packet_table}" ({columns_sql}) FROM STDIN WITH (FORMAT binary)'
+        logger.debug("COPY %d rows into %s", len(values), packet_table)
+        try:
+            with self.conn.cursor() as cur:
+                cur.copy_expert(copy_sql, io.BytesIO(payload))
+        except psycopg2.errors.UndefinedTable:
+            # The transaction is aborted; the caller retries after a rollback
+            logger.warning("Table %s disappeared during COPY", packet_table)
+            self.invalidate_table(packet_table)
+            raise
 
     def insert_rows(self, packet_table: str, rows: List[Dict[str, Any]]) -> None:
         """
         Insert multiple rows into the packet's table.
         Assumes ensure_table_for_packet has already been called at least once.
         """
-        if packet_table not in self._known_tables:
-            # create from first row on the fly
-            self.ensure_table_for_packet(packet_table, rows[0])
-
-        table_quoted = f'"{packet_table}"'
         # All rows assumed to have same keys
         keys = list(rows[0].keys())
-        columns_sql = ", ".join(f'"{k}"' for k in keys)
         values = [[row.get(k) for k in keys] for row in rows]
+        self._insert_values(packet_table, keys, values, rows[0])
+
+    def insert_columns(self, packet_table: str, columns: Dict[str, List[Any]]) -> None:
+        """
+        Insert a columnar batch ({column: [values...]}, all lists the same
+        length, e.g. from decoding.columnar.to_pylists) without building a
+        dict per row.
+        """
+        keys = list(columns.keys())
+        values = list(zip(*columns.values()))
+        if not values:
+            return
+        sample_row = dict(zip(keys, values[0]))
+        self._insert_values(packet_table, keys, values, sample_row)
+
+    def _insert_values(self, packet_table: str, keys: List[str], values: List[Sequence[Any]],
+                       sample_row: Dict[str, Any]) -> None:
+        self.update_rollups(packet_table, keys, values)
+        # create from the batch on the fly, add new columns
+        packet_table, keys, values = self._prepare_batch(packet_table, keys, values)
+        self._execute_insert(packet_table, keys, values, dict(zip(keys, values[0])))
+
+    def _execute_insert(self, packet_table: str, keys: List[str], values: List[Sequence[Any]],
+                        sample_row: Dict[str, Any]) -> None:
+        table_quoted = f'"{packet_table}"'
+        columns_sql = ", ".join(f'"{k}"' for k in keys)
 
         insert_sql = f"INSERT INTO {table_quoted} ({columns_sql}) VALUES %s"
 
-        logger.debug("Inserting %d rows into %s", len(rows), packet_table)
+        logger.debug("Inserting %d rows into %s", len(values), packet_table)
         try:
             with self.conn.cursor() as cur:
                 execute_values(cur, insert_sql, values)
         except psycopg2.errors.UndefinedTable:
+            self.invalidate_table(packet_table)
+            if not self.conn.autocommit:
+                # Inside transaction(): the caller rolls back and retries
+                logger.warning("Table %s disappeared during insert", packet_table)
+                raise
             # Table was deleted between check and insert, recreate and retry
             logger.warning("Table %s disappeared during insert, recreating...", packet_table)
-            self._known_tables.discard(packet_table)
-            self.ensure_table_for_packet(packet_table, rows[0])
+            self.evolve_table(packet_table, keys, values)
             # Retry insert
             with self.conn.cursor() as cur:
                 execute_values(cur, insert_sql, values)
@@ -156,7 +820,6 @@ class PostgresClient:
         """
         with self.conn.cursor() as cur:
             cur.execute(create_sql)
-        self._known_tables.add("DECODER_NOT_FOUND")
 
     def _ensure_decoder_failed_table(self) -> None:
         """
@@ -173,7 +836,125 @@ class PostgresClient:
         """
         with self.conn.cursor() as cur:
             cur.execute(create_sql)
-        self._known_tables.add("DECODER_FAILED")
+
+    def maintain_partitions(self, now: Optional[datetime] = None) -> None:
+        """
+        For every time-partitioned table in the schema: create partitions
+        through the policy's premake horizon, make sure its indexes exist,
+        and expire partitions past retention. Each table is done in one
+        transaction (rows may move out of its default partition); a table
+        that fails is logged and skipped.
+        """
+        now = now or datetime.now(timezone.utc)
+        with self.conn.cursor() as cur:
+            tables = db_partitions.partitioned_tables(cur)
+        created = expired = 0
+        for table, (time_column, existing) in tables.items():
+            policy = self._partition_policy(table)
+            try:
+                with self.transaction(), self.conn.cursor() as cur:
+                    if policy.partitioned:
+                        created += len(db_partitions.ensure_partitions(cur, table, policy, now, existing,
+                                                                       time_column))
+                    db_partitions.ensure_indexes(cur, table, policy, time_column,
+                                                 list(self.table_columns(table) or ()))
+                    for name in db_partitions.expired_partitions(existing, policy, now):
+                        db_partitions.expire_partition(cur, table, name, policy.on_expire,
+                                                       self.partitions.archive_schema)
+                        self.invalidate_table(name)
+                        expired += 1
+                        logger.info("Retention: %s partition %s of %s", policy.on_expire, name, table)
+            except (psycopg2.OperationalError, psycopg2.InterfaceError):
+                raise
+            except psycopg2.Error as e:
+                logger.error("Partition maintenance failed for %s: %s", table, e)
+        logger.info("Partition maintenance: %d tables, %d partitions ensured, %d expired",
+                    len(tables), created, expired)
+
+    def _ensure_schema_versions_table(self) -> None:
+        """
+        One row per packet table: version 1 when the writer created it,
+        bumped on every automatic ALTER (see evolve_table).
+        """
+        create_sql = f"""
+        CREATE TABLE IF NOT EXISTS "{SCHEMA_VERSIONS_TABLE}" (
+            table_name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL,
+            updated_at TIMESTAMPTZ DEFAULT NOW(),
+            change TEXT
+        );
+        """
+        with self.conn.cursor() as cur:
+            cur.execute(create_sql)
+
+    def _ensure_rollups(self) -> None:
+        """ROLLUPS table and the netra_rollup() query function used by the dashboards."""
+        with self.conn.cursor() as cur:
+            cur.execute(db_rollups.CREATE_TABLE_SQL)
+            cur.execute(db_rollups.CREATE_BACKFILLS_SQL)
+            # CREATE OR REPLACE from every client at once can fail with "tuple concurrently updated"
+            cur.execute("SELECT 1 FROM pg_proc WHERE proname = %s", (db_rollups.QUERY_FUNCTION,))
+            if cur.fetchone() is None:
+                cur.execute(db_rollups.QUERY_FUNCTION_SQL)
+
+    def update_rollups(self, packet_table: str, keys: List[str], values: List[Sequence[Any]]) -> None:
+        """Merge a batch into its table's rollups (no-op for tables without rollups)."""
+        time_index = self.rollups.time_index(packet_table, keys)
+        if time_index is None:
+            return
+        rows = db_rollups.aggregate(keys, values, time_index)
+        if not rows:
+            return
+        with self.conn.cursor() as cur:
+            execute_values(cur, db_rollups.UPSERT_SQL, [(packet_table,) + row for row in rows])
+        logger.debug("Rollups of %s: %d buckets updated", packet_table, len(rows))
+
+    def backfill_rollups(self) -> None:
+        """
+        Rebuild the rollups of every rolled-up table not backfilled yet from
+        all of its raw rows, one transaction per table. Writes to the table
+        wait meanwhile (SHARE lock), so no row is counted twice or missed.
+        """
+        if not self.rollups.backfill or not self.rollups.tables:
+            return
+        self.load_schema()
+        schema = dict(self._schema)
+        with self.conn.cursor() as cur:
+            cur.execute(f'SELECT table_name FROM "{db_rollups.BACKFILLS_TABLE}"')
+            skip = {name for (name,) in cur.fetchall()}
+            # Partitions and packed storage tables are read through their parent / view
+            cur.execute(
+                "SELECT c.relname FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace "
+                "WHERE n.nspname = current_schema() AND c.relispartition"
+            )
+            skip.update(name for (name,) in cur.fetchall())
+        skip.update(t for t in schema if self.packing.for_storage(t))
+        for table in sorted(schema):
+            if table in skip or not self.rollups.enabled_for(table):
+                continue
+            plan = db_rollups.backfill_plan(schema[table], self.rollups.time_columns)
+            if plan is None:
+                logger.warning("Not backfilling rollups of %s: no timestamp or numeric columns", table)
+                continue
+            time_column, columns = plan
+            logger.info("Backfilling rollups of %s (%d columns on %s)", table, len(columns), time_column)
+            try:
+                with self.transaction(), self.conn.cursor() as cur:
+                    cur.execute(f'LOCK TABLE "{table}" IN SHARE MODE')
+                    cur.execute(f'DELETE FROM "{db_rollups.ROLLUPS_TABLE}" WHERE table_name = %s', (table,))
+                    cur.execute(db_rollups.backfill_sql(table, time_column, columns), (table,))
+                    buckets = cur.rowcount
+                    cur.execute(
+                        f'INSERT INTO "{db_rollups.BACKFILLS_TABLE}" (table_name, time_column, buckets) '
+                        "VALUES (%s, %s, %s) ON CONFLICT (table_name) DO NOTHING",
+                        (table, time_column, buckets),
+                    )
+            except (psycopg2.OperationalError, psycopg2.InterfaceError):
+                raise
+            except psycopg2.Error as e:
+                logger.error("Rollup backfill failed for %s: %s", table, e)
+                continue
+            logger.info("Backfilled rollups of %s: %d buckets", table, buckets)
 
     def insert_decoder_not_found(self, packet_name: str, hex_payload: str, error: str) -> None:
         """
@@ -194,3 +975,19 @@ class PostgresClient:
                 'INSERT INTO "DECODER_FAILED" (packet_name, hex_payload, error) VALUES (%s, %s, %s)',
                 (packet_name, hex_payload, error),
             )
+
+    def insert_decoder_errors(self, rows_by_table: Dict[str, List[Tuple[Any, ...]]]) -> None:
+        """
+        Batch insert into DECODER_NOT_FOUND / DECODER_FAILED, one transaction:
+        {table: [(created_at, packet_name, hex_payload, error), ...]}.
+        """
+        with self.transaction():
+            with self.conn.cursor() as cur:
+                for table, rows in rows_by_table.items():
+                    if table not in ("DECODER_NOT_FOUND", "DECODER_FAILED"):
+                        raise ValueError(f"not an error table: {table}")
+                    execute_values(
+                        cur,
+                        f'INSERT INTO "{table}" (created_at, packet_name, hex_payload, error) VALUES %s',
+                        rows,
+                    )
@@ -0,0 +1,278 @@
+# netra_backend/db_packing.py
+import fnmatch
+import json
+import logging
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------------------------------------
+# Packed storage for very wide packet tables
+# ---------------------------------------------------------
+#
+# A packet such as HEALTH_EPS decodes to ~250 named columns, most of them
+# numbered channels of a few kinds (PS_Current_A_<name>_NN, PS_OnOff_...,
+# Battery_Temp_C_NN). Opted-in packets (DB_PACKED_TABLES) store each such
+# group in one column instead:
+#
+#     "HEALTH_EPS_packed"     storage table: scalar columns as before, plus
+#                             "PS_Current_A" REAL[], "PS_OnOff" BIT VARYING, ...
+#     "HEALTH_EPS"            view with the original named columns:
+#                             "PS_Current_A"[1] AS "PS_Current_A_OBC_00", ...
+#
+# so Grafana and od_data_handler keep querying the packet name. A member
+# column's element comes from the number at the end of its name (element
+# 1 holds member number `first`), so the mapping needs no bookkeeping and
+# channels renamed by a decoder change read the same element.
+#
+# Element types: real, double, smallint, bigint, boolean (typed arrays) and
+# bits (a bit string, one bit per member, for bitmaps; `labels` maps text
+# values such as OFF/ON to 0/1 and back in the view). A missing member of
+# a bits group is stored as 0.
+#
+# Layouts are built in (LAYOUTS) and can be replaced or added from a JSON
+# file (DB_PACKED_LAYOUTS), keyed by table name or glob:
+#
+#     {"HEALTH_OBC": [{"prefix": "Temp_C", "type": "smallint"},
+#                     {"prefix": "Status", "type": "bits", "first": 0}]}
+#
+# Only tables created while packing is on are packed; an existing plain
+# table keeps being written as it is.
+
+STORAGE_SUFFIX = "_packed"
+
+# type -> (storage column type, information_schema udt_name)
+_TYPES = {
+    "real": ("REAL[]", "_float4"),
+    "double": ("DOUBLE PRECISION[]", "_float8"),
+    "smallint": ("SMALLINT[]", "_int2"),
+    "bigint": ("BIGINT[]", "_int8"),
+    "boolean": ("BOOLEAN[]", "_bool"),
+    "bits": ("BIT VARYING", "varbit"),
+}
+
+LAYOUTS: Dict[str, List[Dict[str, Any]]] = {
+    "HEALTH_EPS": [
+        {"prefix": "Active_HW", "type": "bits", "first": 0},
+        {"prefix": "PS_OnOff", "type": "bits", "first": 0, "labels": ["OFF", "ON"]},
+        {"prefix": "PS_Overcurrent", "type": "bits", "first": 0},
+        {"prefix": "PS_Current_A", "type": "real", "first": 0},
+        {"prefix": "Solar_Panel_Voltage_V", "type": "real"},
+        {"prefix": "Solar_Panel_Current_A", "type": "real"},
+        {"prefix": "Solar_Temp_C", "type": "smallint"},
+        {"prefix": "Output_Converter_Voltage_V", "type": "real"},
+        {"prefix": "Battery_Temp_C", "type": "smallint"},
+    ],
+}
+
+
+def storage_table(table: str) -> str:
+    return f"{table}{STORAGE_SUFFIX}"
+
+
+@dataclass(frozen=True)
+class PackGroup:
+    column: str                     # storage column
+    pattern: str                    # member columns; group 1 is the member number
+    type: str = "real"
+    first: int = 1                  # member number stored as element 1
+    labels: Optional[Tuple[str, str]] = None  # bits only: text for 0 and 1
+    regex: Any = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        if self.type not in _TYPES:
+            raise ValueError(f"unknown packed type {self.type!r} for {self.column}")
+        if self.labels is not None and self.type != "bits":
+            raise ValueError(f"labels only apply to bits groups ({self.column})")
+        object.__setattr__(self, "regex", re.compile(self.pattern))
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "PackGroup":
+        config = dict(config)
+        prefix = config.pop("prefix", None)
+        if prefix is not None:
+            config.setdefault("column", prefix)
+            config.setdefault("pattern", rf"^{re.escape(prefix)}_(?:.*_)?(\d+)$")
+        if config.get("labels") is not None:
+            config["labels"] = tuple(config["labels"])
+        return cls(**config)
+
+    @property
+    def sql_type(self) -> str:
+        return _TYPES[self.type][0]
+
+    @property
+    def udt_name(self) -> str:
+        return _TYPES[self.type][1]
+
+    def position(self, name: str) -> Optional[int]:
+        """1-based element of a member column, None for other columns."""
+        m = self.regex.match(name)
+        if m is None:
+            return None
+        position = int(m.group(1)) - self.first + 1
+        return position if position >= 1 else None
+
+    def pack(self, members: Sequence[Tuple[int, int]], length: int, row: Sequence[Any]) -> Any:
+        """Storage value for one row from its (value index, position) members."""
+        if self.type == "bits":
+            on = True if self.labels is None else self.labels[1]
+            bits = ["0"] * length
+            seen = False
+            for i, position in members:
+                value = row[i]
+                if value is not None:
+                    seen = True
+                    if value == on:
+                        bits[position - 1] = "1"
+            return "".join(bits) if seen else None
+        elements: List[Any] = [None] * length
+        seen = False
+        for i, position in members:
+            value = row[i]
+            if value is not None:
+                seen = True
+                elements[position - 1] = value
+        return elements if seen else None
+
+    def view_expr(self, position: int) -> str:
+        col = f'"{self.column}"'
+        if self.type != "bits":
+            return f"{col}[{position}]"
+        bit = f"get_bit({col}, {position - 1})"
+        if self.labels is None:
+            value = f"{bit} = 1"
+        else:
+            off, on = (label.replace("'", "''") for label in self.labels)
+            value = f"CASE {bit} WHEN 1 THEN '{on}' ELSE '{off}' END"
+        # get_bit raises past the end of the string; a shorter row reads NULL
+        return f"CASE WHEN length({col}) >= {position} THEN {value} END"
+
+
+# Per key tuple: scalar value indices, and per group (group, length, [(value index, position)])
+_Plan = Tuple[List[int], List[Tuple[PackGroup, int, List[Tuple[int, int]]]]]
+
+
+class PackedLayout:
+    def __init__(self, groups: Sequence[PackGroup]):
+        self.groups = list(groups)
+        self._plans: Dict[Tuple[str, ...], _Plan] = {}
+
+    def column_types(self) -> Dict[str, str]:
+        """{storage column: SQL type} of the packed columns."""
+        return {g.column: g.sql_type for g in self.groups}
+
+    def member(self, name: str) -> Optional[Tuple[PackGroup, int]]:
+        for group in self.groups:
+            position = group.position(name)
+            if position is not None:
+                return group, position
+        return None
+
+    def _plan(self, keys: Sequence[str]) -> _Plan:
+        plan = self._plans.get(tuple(keys))
+        if plan is None:
+            scalars: List[int] = []
+            members: Dict[str, List[Tuple[int, int]]] = {}
+            for i, key in enumerate(keys):
+                found = self.member(key)
+                if found is None:
+                    scalars.append(i)
+                else:
+                    members.setdefault(found[0].column, []).append((i, found[1]))
+            groups = [
+                (g, max(p for _, p in members[g.column]), members[g.column])
+                for g in self.groups if g.column in members
+            ]
+            plan = self._plans[tuple(keys)] = (scalars, groups)
+        return plan
+
+    def pack(self, keys: Sequence[str], values: Sequence[Sequence[Any]]
+             ) -> Tuple[List[str], List[Tuple[Any, ...]], List[str]]:
+        """
+        (storage keys, storage values, member columns) for a batch in the
+        named layout. Packed columns follow the scalar ones.
+        """
+        scalars, groups = self._plan(keys)
+        packed_keys = [keys[i] for i in scalars] + [g.column for g, _, _ in groups]
+        packed = [
+            tuple([row[i] for i in scalars] + [g.pack(members, length, row) for g, length, members in groups])
+            for row in values
+        ]
+        member_names = [keys[i] for _, _, members in groups for i, _ in members]
+        return packed_keys, packed, member_names
+
+    def view_sql(self, table: str, names: Sequence[str], storage_columns: Dict[str, str]) -> str:
+        """
+        CREATE VIEW for `table` over its storage table with `names` (member
+        and scalar columns). Scalars missing from the storage table are left
+        out until they exist.
+        """
+        packed = set(self.column_types())
+        select = ['"id"', '"created_at"']
+        for name in names:
+            if name in ("id", "created_at"):
+                continue
+            if name in storage_columns and name not in packed:
+                select.append(f'"{name}"')
+                continue
+            found = self.member(name)
+            if found is not None and found[0].column in storage_columns:
+                select.append(f'{found[0].view_expr(found[1])} AS "{name}"')
+        return f'CREATE VIEW "{table}" AS SELECT {", ".join(select)} FROM "{storage_table(table)}"'
+
+
+@dataclass
+class PackedLayouts:
+    # Tables (names or globs) stored packed
+    tables: List[str] = field(default_factory=list)
+    layouts: Dict[str, List[Dict[str, Any]]] = field(default_factory=lambda: dict(LAYOUTS))
+    _built: Dict[str, Optional[PackedLayout]] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def from_env(cls) -> "PackedLayouts":
+        tables = [t.strip() for t in os.getenv("DB_PACKED_TABLES", "").split(",") if t.strip()]
+        layouts = cls(tables)
+
+        path = os.getenv("DB_PACKED_LAYOUTS", "")
+        if path:
+            with open(path) as f:
+                layouts.layouts.update(json.load(f))
+            logger.info("Loaded packed layouts from %s", path)
+        for pattern in tables:
+            if layouts._config(pattern) is None:
+                logger.warning("DB_PACKED_TABLES: no packed layout for %s", pattern)
+        if tables:
+            logger.info("Packed storage for: %s", ", ".join(tables))
+        return layouts
+
+    def _config(self, table: str) -> Optional[List[Dict[str, Any]]]:
+        if table in self.layouts:
+            return self.layouts[table]
+        for pattern, config in self.layouts.items():
+            if fnmatch.fnmatchcase(table, pattern):
+                return config
+        return None
+
+    def for_table(self, table: str) -> Optional[PackedLayout]:
+        """Layout of a packet table that is stored packed, else None."""
+        if table in self._built:
+            return self._built[table]
+        layout = None
+        if any(t == table or fnmatch.fnmatchcase(table, t) for t in self.tables):
+            config = self._config(table)
+            if config is not None:
+                layout = PackedLayout([PackGroup.from_config(g) for g in config])
+        self._built[table] = layout
+        return layout
+
+    def for_storage(self, storage: str) -> Optional[Tuple[str, PackedLayout]]:
+        """(packet table, layout) when `storage` is a packed storage table."""
+        if not storage.endswith(STORAGE_SUFFIX):
+            return None
+        table = storage[:-len(STORAGE_SUFFIX)]
+        layout = self.for_table(table)
+        return None if layout is None else (table, layout)
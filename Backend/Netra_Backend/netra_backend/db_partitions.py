@@ -0,0 +1,298 @@
+# netra_backend/db_partitions.py
+import fnmatch
+import json
+import logging
+import os
+import re
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------------------------------------
+# Time-partitioned packet tables
+# ---------------------------------------------------------
+#
+# New packet tables are created PARTITION BY RANGE on a time column
+# (created_at by default, or a decoded TIMESTAMPTZ column such as epoch),
+# with one partition per day or week:
+#
+#     "HEALTH_EPS"                    partitioned parent (what queries use)
+#     "HEALTH_EPS_d20260116"          [2026-01-16, 2026-01-17) UTC
+#     "HEALTH_EPS_default"            NULL / out-of-range time values
+#
+# A row whose time is beyond the premade partitions lands in the default
+# partition; when its range's partition is created later, those rows are
+# moved out of the default in the same transaction (Postgres refuses to
+# create a partition whose range the default partition still holds rows of).
+#
+# Partitions are created `premake` periods ahead, by the writer when it
+# creates the table and by PostgresClient.maintain_partitions() (run
+# periodically by the DB worker), which also applies retention: whole
+# partitions older than `retention_days` are dropped, detached (left as
+# standalone tables), or detached and moved to the archive schema.
+# Every parent gets a BRIN index on the time column (tiny, and range scans
+# skip blocks) and B-tree indexes on the `btree_columns` it has, e.g. the
+# epoch column od_data_handler filters and orders by.
+#
+# Policies come from env (DB_PARTITION_*) with per-table overrides from a
+# JSON file (DB_PARTITION_POLICIES), keyed by table name or glob:
+#
+#     {"default": {"interval": "day", "retention_days": 0},
+#      "HEALTH_ADCS_*": {"retention_days": 90, "on_expire": "archive"},
+#      "HEALTH_EPS": {"interval": "week", "time_column": "epoch"}}
+#
+# Tables created before partitioning stay plain heaps; convert them by
+# hand (create the partitioned table, INSERT ... SELECT, swap names).
+
+INTERVALS = {"day": timedelta(days=1), "week": timedelta(days=7)}
+# Partition name suffix letter per interval
+_KIND = {"day": "d", "week": "w"}
+_KIND_INTERVAL = {v: INTERVALS[k] for k, v in _KIND.items()}
+_PARTITION_RE = re.compile(r"_([dw])(\d{8})$")
+
+EXPIRE_ACTIONS = ("drop", "detach", "archive")
+
+# Postgres truncates identifiers at 63 bytes; leave room for suffixes
+_MAX_BASE = 48
+
+
+@dataclass(frozen=True)
+class PartitionPolicy:
+    interval: str = "day"           # day | week | none (plain table)
+    time_column: str = "created_at"
+    premake: int = 7                # partitions kept ready ahead of now
+    retention_days: int = 0         # 0 = keep forever
+    on_expire: str = "detach"       # drop | detach | archive
+    btree_columns: Tuple[str, ...] = ("epoch",)
+
+    @property
+    def partitioned(self) -> bool:
+        return self.interval in INTERVALS
+
+    def updated(self, overrides: Dict[str, Any]) -> "PartitionPolicy":
+        overrides = dict(overrides)
+        if "btree_columns" in overrides:
+            overrides["btree_columns"] = tuple(overrides["btree_columns"])
+        policy = replace(self, **overrides)
+        if policy.interval != "none" and policy.interval not in INTERVALS:
+            raise ValueError(f"unknown partition interval {policy.interval!r}")
+        if policy.on_expire not in EXPIRE_ACTIONS:
+            raise ValueError(f"unknown on_expire action {policy.on_expire!r}")
+        return policy
+
+
+@dataclass
+class PartitionPolicies:
+    default: PartitionPolicy = field(default_factory=PartitionPolicy)
+    # (table name or glob, policy), in file order
+    overrides: List[Tuple[str, PartitionPolicy]] = field(default_factory=list)
+    archive_schema: str = "archive"
+
+    @classmethod
+    def from_env(cls) -> "PartitionPolicies":
+        default = PartitionPolicy().updated({
+            "interval": os.getenv("DB_PARTITION_INTERVAL", "day"),
+            "premake": int(os.getenv("DB_PARTITION_PREMAKE", "7")),
+            "retention_days": int(os.getenv("DB_RETENTION_DAYS", "0")),
+            "on_expire": os.getenv("DB_RETENTION_ACTION", "detach"),
+        })
+        policies = cls(default, [], os.getenv("DB_ARCHIVE_SCHEMA", "archive"))
+
+        path = os.getenv("DB_PARTITION_POLICIES", "")
+        if path:
+            with open(path) as f:
+                config = json.load(f)
+            if "default" in config:
+                policies.default = default.updated(config.pop("default"))
+            for pattern, overrides in config.items():
+                policies.overrides.append((pattern, policies.default.updated(overrides)))
+            logger.info("Loaded %d partition policies from %s", len(policies.overrides), path)
+        return policies
+
+    def for_table(self, table: str) -> PartitionPolicy:
+        for pattern, policy in self.overrides:
+            if pattern == table:
+                return policy
+        for pattern, policy in self.overrides:
+            if fnmatch.fnmatchcase(table, pattern):
+                return policy
+        return self.default
+
+
+# ----- naming and bounds -----
+
+def _base(table: str) -> str:
+    return table[:_MAX_BASE]
+
+
+def partition_name(table: str, interval: str, start: datetime) -> str:
+    return f"{_base(table)}_{_KIND[interval]}{start:%Y%m%d}"
+
+
+def default_partition_name(table: str) -> str:
+    return f"{_base(table)}_default"
+
+
+def partition_range(name: str) -> Optional[Tuple[datetime, datetime]]:
+    """[start, end) of a partition created here, from its name; None for others."""
+    m = _PARTITION_RE.search(name)
+    if m is None:
+        return None
+    start = datetime.strptime(m.group(2), "%Y%m%d").replace(tzinfo=timezone.utc)
+    return start, start + _KIND_INTERVAL[m.group(1)]
+
+
+def period_start(now: datetime, interval: str) -> datetime:
+    """Start of the day (UTC midnight) or ISO week (Monday) containing `now`."""
+    day = now.astimezone(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    if interval == "week":
+        day -= timedelta(days=day.weekday())
+    return day
+
+
+def _bound(ts: datetime) -> str:
+    return ts.strftime("%Y-%m-%d %H:%M:%S+00")
+
+
+# ----- DDL -----
+
+def create_table_sql(table: str, columns_sql_parts: Sequence[str], policy: PartitionPolicy,
+                     time_column: str) -> str:
+    """CREATE TABLE for a partitioned packet table (time_column: the partition key)."""
+    if time_column == "created_at":
+        # The primary key of a partitioned table must include the partition key
+        head = ["id BIGSERIAL", "created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()"]
+        tail = ["PRIMARY KEY (id, created_at)"]
+    else:
+        # A decoded time column can be NULL, so it cannot be in a primary key
+        head = ["id BIGSERIAL", "created_at TIMESTAMPTZ DEFAULT NOW()"]
+        tail = []
+    columns_sql = ", ".join(head + list(columns_sql_parts) + tail)
+    return f'CREATE TABLE IF NOT EXISTS "{table}" ({columns_sql}) PARTITION BY RANGE ("{time_column}");'
+
+
+def ensure_partitions(cur, table: str, policy: PartitionPolicy, now: datetime,
+                      existing: Sequence[str] = (), time_column: Optional[str] = None) -> List[str]:
+    """
+    Create the default partition and partitions from the current period
+    through `premake` periods ahead; returns the partitions created.
+    Continues after the newest existing partition so ranges never overlap,
+    even if the policy's interval changed. Rows of a new range already in
+    the default partition are moved into it, so run this in a transaction.
+    """
+    time_column = time_column or policy.time_column
+    cur.execute(f'CREATE TABLE IF NOT EXISTS "{default_partition_name(table)}" PARTITION OF "{table}" DEFAULT')
+
+    step = INTERVALS[policy.interval]
+    start = period_start(now, policy.interval)
+    ends = [r[1] for r in map(partition_range, existing) if r is not None]
+    if ends and max(ends) > start:
+        start = max(ends)
+    horizon = period_start(now, policy.interval) + step * (policy.premake + 1)
+
+    created = []
+    while start < horizon:
+        name = partition_name(table, policy.interval, start)
+        if not _move_default_rows(cur, table, name, time_column, start, start + step):
+            cur.execute(
+                f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "{table}" '
+                f"FOR VALUES FROM ('{_bound(start)}') TO ('{_bound(start + step)}')"
+            )
+        created.append(name)
+        start += step
+    return created
+
+
+def _move_default_rows(cur, table: str, name: str, time_column: str,
+                       start: datetime, end: datetime) -> bool:
+    """
+    If the default partition holds rows in [start, end), build partition
+    `name` as a standalone table, move those rows into it and attach it;
+    returns whether it did. Attaching checks the default partition no
+    longer has rows in the range, which holds after the move.
+    """
+    default = default_partition_name(table)
+    column = f'"{time_column}"'
+    where = f"{column} >= '{_bound(start)}' AND {column} < '{_bound(end)}'"
+    cur.execute(f'SELECT EXISTS (SELECT 1 FROM "{default}" WHERE {where})')
+    if not cur.fetchone()[0]:
+        return False
+    cur.execute(f'CREATE TABLE "{name}" (LIKE "{table}" INCLUDING DEFAULTS INCLUDING CONSTRAINTS)')
+    cur.execute(
+        f'WITH moved AS (DELETE FROM "{default}" WHERE {where} RETURNING *) '
+        f'INSERT INTO "{name}" SELECT * FROM moved'
+    )
+    moved = cur.rowcount
+    cur.execute(
+        f'ALTER TABLE "{table}" ATTACH PARTITION "{name}" '
+        f"FOR VALUES FROM ('{_bound(start)}') TO ('{_bound(end)}')"
+    )
+    logger.warning("Moved %d rows of %s from %s into new partition %s", moved, table, default, name)
+    return True
+
+
+def ensure_indexes(cur, table: str, policy: PartitionPolicy, time_column: str,
+                   columns: Sequence[str]) -> None:
+    """BRIN on the partition key, B-tree on the policy's btree_columns that exist."""
+    base = _base(table)
+    cur.execute(f'CREATE INDEX IF NOT EXISTS "{base}_{time_column[:10]}_brin" ON "{table}" USING brin ("{time_column}")')
+    for column in policy.btree_columns:
+        if column in columns and column != time_column:
+            cur.execute(f'CREATE INDEX IF NOT EXISTS "{base}_{column[:10]}_idx" ON "{table}" ("{column}")')
+
+
+def expired_partitions(existing: Sequence[str], policy: PartitionPolicy, now: datetime) -> List[str]:
+    """Partitions whose whole range is older than the retention period."""
+    if policy.retention_days <= 0:
+        return []
+    cutoff = now - timedelta(days=policy.retention_days)
+    return sorted(
+        name for name in existing
+        if (r := partition_range(name)) is not None and r[1] <= cutoff
+    )
+
+
+def expire_partition(cur, table: str, name: str, action: str, archive_schema: str) -> None:
+    if action == "drop":
+        cur.execute(f'DROP TABLE IF EXISTS "{name}"')
+        return
+    cur.execute(f'ALTER TABLE "{table}" DETACH PARTITION "{name}"')
+    if action == "archive":
+        cur.execute(f'CREATE SCHEMA IF NOT EXISTS "{archive_schema}"')
+        cur.execute(f'ALTER TABLE "{name}" SET SCHEMA "{archive_schema}"')
+
+
+# ----- catalog -----
+
+_PARTKEY_RE = re.compile(r'^RANGE \("?([^")]+)"?\)$')
+
+
+def partitioned_tables(cur) -> Dict[str, Tuple[str, List[str]]]:
+    """{parent: (partition key column, [partition names])} in the current schema."""
+    cur.execute(
+        "SELECT c.oid, c.relname, pg_get_partkeydef(c.oid) "
+        "FROM pg_partitioned_table p "
+        "JOIN pg_class c ON c.oid = p.partrelid "
+        "JOIN pg_namespace n ON n.oid = c.relnamespace "
+        "WHERE n.nspname = current_schema() AND NOT c.relispartition"
+    )
+    parents = cur.fetchall()
+    cur.execute(
+        "SELECT i.inhparent, c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = ANY(%s)",
+        ([oid for oid, _, _ in parents],),
+    )
+    children: Dict[int, List[str]] = {}
+    for parent_oid, name in cur.fetchall():
+        children.setdefault(parent_oid, []).append(name)
+
+    tables = {}
+    for oid, name, keydef in parents:
+        m = _PARTKEY_RE.match(keydef or "")
+        if m is None:
+            continue  # not one of ours (list/hash or multi-column key)
+        tables[name] = (m.group(1), children.get(oid, []))
+    return tables
@@ -0,0 +1,282 @@
+# netra_backend/db_rollups.py
+import fnmatch
+import logging
+import os
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from operator import itemgetter
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------------------------------------
+# Pre-aggregated rollups for dashboards
+# ---------------------------------------------------------
+#
+# For the packet tables in DB_ROLLUP_TABLES every batch the writer stores
+# also updates per-column aggregates in ROLLUPS_TABLE, one row per
+#
+#     (table_name, resolution, column_name, bucket)   resolution: 1m | 1h | 1d
+#
+# holding n, min, max, sum and the last value (by time) of the numeric
+# columns, bucketed on the row's time column (the first of
+# DB_ROLLUP_TIME_COLUMNS the packet has). A batch is aggregated here and
+# merged into the stored rows with INSERT ... ON CONFLICT DO UPDATE, in the
+# writer's transaction, so late or backfilled rows only touch their own
+# buckets and the rollups commit together with the raw rows.
+#
+# Dashboards read them through netra_rollup(), which picks the coarsest
+# resolution that fits the panel interval and regroups it to that interval:
+#
+#     SELECT time, metric, value
+#     FROM netra_rollup('HEALTH_EPS', ARRAY['Battery_Total_Voltage_V'], 'avg',
+#                       $__interval_ms, $__timeFrom(), $__timeTo())
+#
+# (aggregates: avg, min, max, sum, count, last). Messages redelivered after
+# a crash are counted again, as their raw rows are inserted again.
+#
+# Rows stored before a table had rollups are aggregated once by
+# PostgresClient.backfill_rollups() (DB worker start, DB_ROLLUP_BACKFILL):
+# with writes to the table blocked, its rollups are rebuilt from all of its
+# raw rows in one INSERT ... SELECT, and the table is recorded in
+# BACKFILLS_TABLE so later starts skip it.
+
+ROLLUPS_TABLE = "ROLLUPS"
+BACKFILLS_TABLE = "ROLLUP_BACKFILLS"
+
+# (name, seconds), finest first; each one a multiple of the previous
+RESOLUTIONS: Tuple[Tuple[str, int], ...] = (("1m", 60), ("1h", 3600), ("1d", 86400))
+
+_NUMERIC = (int, float)  # exact types: bool is not rolled up
+# Column types backfill_plan() rolls up / accepts as the time column
+_NUMERIC_UDTS = {"int2", "int4", "int8", "float4", "float8", "numeric"}
+_TIME_UDTS = {"timestamptz", "timestamp"}
+
+# (n, min, max, sum, last, last_at)
+_Agg = Tuple[int, float, float, float, float, datetime]
+
+CREATE_TABLE_SQL = f"""
+CREATE TABLE IF NOT EXISTS "{ROLLUPS_TABLE}" (
+    table_name TEXT NOT NULL,
+    resolution TEXT NOT NULL,
+    column_name TEXT NOT NULL,
+    bucket TIMESTAMPTZ NOT NULL,
+    n BIGINT NOT NULL,
+    min DOUBLE PRECISION,
+    max DOUBLE PRECISION,
+    sum DOUBLE PRECISION,
+    last DOUBLE PRECISION,
+    last_at TIMESTAMPTZ,
+    PRIMARY KEY (table_name, resolution, column_name, bucket)
+);
+"""
+
+CREATE_BACKFILLS_SQL = f"""
+CREATE TABLE IF NOT EXISTS "{BACKFILLS_TABLE}" (
+    table_name TEXT PRIMARY KEY,
+    backfilled_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    time_column TEXT,
+    buckets BIGINT
+);
+"""
+
+_MERGE_SQL = """
+ON CONFLICT (table_name, resolution, column_name, bucket) DO UPDATE SET
+    n = r.n + EXCLUDED.n,
+    min = LEAST(r.min, EXCLUDED.min),
+    max = GREATEST(r.max, EXCLUDED.max),
+    sum = r.sum + EXCLUDED.sum,
+    last = CASE WHEN EXCLUDED.last_at >= r.last_at THEN EXCLUDED.last ELSE r.last END,
+    last_at = GREATEST(r.last_at, EXCLUDED.last_at)
+"""
+
+UPSERT_SQL = f"""
+INSERT INTO "{ROLLUPS_TABLE}" AS r
+    (table_name, resolution, column_name, bucket, n, min, max, sum, last, last_at)
+VALUES %s""" + _MERGE_SQL
+
+QUERY_FUNCTION = "netra_rollup"
+
+
+def resolution_for(interval_ms: int) -> Tuple[str, int]:
+    """Coarsest resolution no wider than a panel interval (the finest one for finer intervals)."""
+    for name, seconds in reversed(RESOLUTIONS):
+        if interval_ms >= seconds * 1000:
+            return name, seconds
+    return RESOLUTIONS[0]
+
+
+def _resolution_case(render: Callable[[str, int], str]) -> str:
+    # resolution_for() in SQL
+    whens = " ".join(
+        f"WHEN p_interval_ms >= {seconds * 1000} THEN {render(name, seconds)}"
+        for name, seconds in reversed(RESOLUTIONS[1:])
+    )
+    return f"CASE {whens} ELSE {render(*RESOLUTIONS[0])} END"
+
+
+QUERY_FUNCTION_SQL = f"""
+CREATE OR REPLACE FUNCTION {QUERY_FUNCTION}(
+    p_table TEXT, p_columns TEXT[], p_agg TEXT,
+    p_interval_ms BIGINT, p_from TIMESTAMPTZ, p_to TIMESTAMPTZ)
+RETURNS TABLE ("time" TIMESTAMPTZ, metric TEXT, value DOUBLE PRECISION)
+LANGUAGE sql STABLE AS $$
+    WITH res AS (
+        -- Coarsest rollup no wider than the panel interval (1m for finer ones)
+        SELECT {_resolution_case(lambda name, seconds: f"'{name}'")} AS resolution,
+               {_resolution_case(lambda name, seconds: f"INTERVAL '{seconds} seconds'")} AS width,
+               GREATEST(p_interval_ms, {RESOLUTIONS[0][1] * 1000}) / 1000.0 AS step_s
+    )
+    SELECT to_timestamp(floor(extract(epoch FROM r.bucket) / res.step_s) * res.step_s),
+           r.column_name,
+           CASE p_agg
+               WHEN 'min' THEN min(r.min)
+               WHEN 'max' THEN max(r.max)
+               WHEN 'sum' THEN sum(r.sum)
+               WHEN 'count' THEN sum(r.n)::DOUBLE PRECISION
+               WHEN 'last' THEN (array_agg(r.last ORDER BY r.last_at DESC))[1]
+               ELSE sum(r.sum) / NULLIF(sum(r.n), 0)::DOUBLE PRECISION
+           END
+    FROM "{ROLLUPS_TABLE}" r, res
+    WHERE r.table_name = p_table
+      AND r.resolution = res.resolution
+      AND r.column_name = ANY (p_columns)
+      AND r.bucket > p_from - res.width
+      AND r.bucket < p_to
+    GROUP BY 1, 2
+    ORDER BY 1, 2
+$$;
+"""
+
+
+def backfill_sql(table: str, time_column: str, columns: Sequence[str]) -> str:
+    """
+    INSERT ... SELECT aggregating every raw row of `table` into all
+    resolutions in one scan, merged like the writer's batches; one
+    parameter, the table name stored in the rollups.
+    """
+    unpivot = ", ".join(f"""('{c}', t."{c}"::DOUBLE PRECISION)""" for c in columns)
+    resolutions = ", ".join(f"('{name}', {seconds})" for name, seconds in RESOLUTIONS)
+    ts = f't."{time_column}"'
+    return f"""
+INSERT INTO "{ROLLUPS_TABLE}" AS r
+    (table_name, resolution, column_name, bucket, n, min, max, sum, last, last_at)
+SELECT %s, res.name, v.column_name,
+       to_timestamp(floor(extract(epoch FROM {ts}) / res.seconds) * res.seconds),
+       count(*), min(v.value), max(v.value), sum(v.value),
+       (array_agg(v.value ORDER BY {ts} DESC))[1], max({ts})
+FROM "{table}" t
+CROSS JOIN LATERAL (VALUES {unpivot}) AS v (column_name, value)
+CROSS JOIN (VALUES {resolutions}) AS res (name, seconds)
+WHERE {ts} IS NOT NULL AND v.value IS NOT NULL AND v.value <> 'NaN'
+GROUP BY 2, 3, 4""" + _MERGE_SQL
+
+
+def backfill_plan(columns: Mapping[str, str], time_columns: Sequence[str]
+                  ) -> Optional[Tuple[str, List[str]]]:
+    """
+    (time column, numeric columns) to backfill a table with `columns`
+    ({column: udt_name}) from: the first candidate time column stored as a
+    timestamp (one still TEXT has nothing to bucket on) and every numeric
+    column the writer would roll up. None when there is no such pair.
+    """
+    time_column = next((c for c in time_columns if columns.get(c) in _TIME_UDTS), None)
+    if time_column is None:
+        return None
+    values = [c for c, udt in columns.items() if udt in _NUMERIC_UDTS and c != "id"]
+    return (time_column, values) if values else None
+
+
+def _utc(ts: datetime) -> datetime:
+    return ts.replace(tzinfo=timezone.utc) if ts.tzinfo is None else ts
+
+
+def _merge(a: _Agg, b: _Agg) -> _Agg:
+    last, last_at = (b[4], b[5]) if b[5] >= a[5] else (a[4], a[5])
+    return a[0] + b[0], min(a[1], b[1]), max(a[2], b[2]), a[3] + b[3], last, last_at
+
+
+def aggregate(keys: Sequence[str], values: Sequence[Sequence[Any]], time_index: int
+              ) -> List[Tuple[Any, ...]]:
+    """
+    (resolution, column, bucket, n, min, max, sum, last, last_at) for every
+    numeric column and bucket a batch touches. Rows without a time value
+    are not rolled up.
+    """
+    minutes: Dict[int, List[Tuple[datetime, Sequence[Any]]]] = {}
+    first_step = RESOLUTIONS[0][1]
+    for row in values:
+        ts = row[time_index]
+        if isinstance(ts, datetime):
+            ts = _utc(ts)
+            minutes.setdefault(int(ts.timestamp()) // first_step * first_step, []).append((ts, row))
+
+    # (column index, resolution seconds, bucket start) -> aggregate
+    aggs: Dict[Tuple[int, int, int], _Agg] = {}
+    for start, rows in minutes.items():
+        rows.sort(key=itemgetter(0))
+        times = [ts for ts, _ in rows]
+        for i, column in enumerate(zip(*(row for _, row in rows))):
+            if i == time_index:
+                continue
+            # v == v drops NaN
+            numeric = [j for j, v in enumerate(column) if type(v) in _NUMERIC and v == v]
+            if not numeric:
+                continue
+            vals = [column[j] for j in numeric] if len(numeric) < len(column) else column
+            agg = (len(vals), min(vals), max(vals), float(sum(vals)), vals[-1], times[numeric[-1]])
+            for _, seconds in RESOLUTIONS:
+                key = (i, seconds, start // seconds * seconds)
+                aggs[key] = _merge(aggs[key], agg) if key in aggs else agg
+
+    names = {seconds: name for name, seconds in RESOLUTIONS}
+    return [
+        (names[seconds], keys[i], datetime.fromtimestamp(bucket, timezone.utc)) + agg
+        for (i, seconds, bucket), agg in aggs.items()
+    ]
+
+
+@dataclass
+class RollupPolicy:
+    # Tables (names or globs) with rollups
+    tables: List[str] = field(default_factory=list)
+    # Candidate time columns, first match wins
+    time_columns: List[str] = field(default_factory=list)
+    # Aggregate rows stored before rollups were enabled (see backfill_sql)
+    backfill: bool = True
+    _enabled: Dict[str, bool] = field(default_factory=dict, repr=False)
+    _warned: Set[str] = field(default_factory=set, repr=False)
+
+    @classmethod
+    def from_env(cls) -> "RollupPolicy":
+        def _list(name: str, default: str) -> List[str]:
+            return [t.strip() for t in os.getenv(name, default).split(",") if t.strip()]
+
+        policy = cls(
+            _list("DB_ROLLUP_TABLES", ""),
+            _list("DB_ROLLUP_TIME_COLUMNS", "Timestamp,Epoch_Time_Human,epoch,temp_epoch_time"),
+            os.getenv("DB_ROLLUP_BACKFILL", "1") == "1",
+        )
+        if policy.tables:
+            logger.info("Rollups (%s) for: %s", ", ".join(n for n, _ in RESOLUTIONS), ", ".join(policy.tables))
+        return policy
+
+    def enabled_for(self, table: str) -> bool:
+        enabled = self._enabled.get(table)
+        if enabled is None:
+            enabled = self._enabled[table] = any(
+                t == table or fnmatch.fnmatchcase(table, t) for t in self.tables
+            )
+        return enabled
+
+    def time_index(self, table: str, keys: Sequence[str]) -> Optional[int]:
+        """Index of the batch's time column, None if the table is not rolled up."""
+        if not self.enabled_for(table):
+            return None
+        for column in self.time_columns:
+            if column in keys:
+                return keys.index(column)
+        if table not in self._warned:
+            self._warned.add(table)
+            logger.warning("No rollups for %s: none of the time columns %s", table, self.time_columns)
+        return None
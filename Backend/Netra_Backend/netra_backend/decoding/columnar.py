@@ -0,0 +1,204 @@
+# netra_backend/decoding/columnar.py
+import re
+import struct
+from datetime import timezone
+from typing import Any, Callable, Dict, List, Mapping, Optional, Union
+
+from netra_backend.decoding.frame import Rows
+from netra_backend.decoding.layout import (
+    EPOCH_DATETIME,
+    EPOCH_RAW,
+    EPOCH_TEXT,
+    PacketLayout,
+    instance_locator,
+)
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; the row decoders work without it
+    np = None
+
+HAVE_NUMPY = np is not None
+
+# ---------------------------------------------------------
+# Columnar (vectorized) decode mode
+# ---------------------------------------------------------
+#
+# Row decoders:       decode_frame(frame: memoryview) -> List[Dict]
+# Columnar decoders:  decode_columns(frame: memoryview) -> Dict[str, column]
+#
+# A columnar decoder maps the instance region straight onto a NumPy
+# structured dtype with np.frombuffer (no copy) and does scaling, enum
+# lookups and epoch formatting as array operations. Every column has one
+# entry per instance; a column may be a numpy array or a plain list.
+#
+# Modules opt in by defining a module-level `decode_columns`. Modules that
+# declare a PacketLayout get one from compile_columnar() automatically
+# (see DecoderRegistry). Without numpy installed there are no columnar
+# decoders and everything stays on the row path.
+
+COLUMN_DECODER_NAME = "decode_columns"
+
+Columns = Dict[str, Any]
+ColumnDecoder = Callable[[memoryview], Columns]
+
+# struct code -> numpy little-endian scalar type
+_NP_TYPES = {
+    'b': 'i1', 'B': 'u1', '?': '?',
+    'h': '<i2', 'H': '<u2',
+    'i': '<i4', 'I': '<u4', 'l': '<i4', 'L': '<u4',
+    'q': '<i8', 'Q': '<u8',
+    'f': '<f4', 'd': '<f8',
+}
+_PAD_RE = re.compile(r'^(\d*)x$')
+
+
+def layout_dtype(layout: PacketLayout):
+    """
+    Structured dtype equivalent to the layout's struct format (packed, '<').
+    Pad fields become gaps between named fields.
+    """
+    names, formats, offsets = [], [], []
+    offset = 0
+    for f in layout.fields:
+        size = struct.calcsize('<' + f.fmt)
+        if f.name is None:
+            if not _PAD_RE.match(f.fmt):
+                raise ValueError(f"{layout.name}: unnamed field must be padding, got {f.fmt!r}")
+        else:
+            if f.fmt not in _NP_TYPES:
+                raise ValueError(f"{layout.name}: no numpy type for field {f.name!r} ({f.fmt!r})")
+            names.append(f.name)
+            formats.append(_NP_TYPES[f.fmt])
+            offsets.append(offset)
+        offset += size
+    return np.dtype({'names': names, 'formats': formats, 'offsets': offsets, 'itemsize': offset})
+
+
+def instance_array(frame: memoryview, dtype, offset: int, count: int):
+    """
+    View the first `count` complete records of `dtype` at `offset` (zero-copy);
+    empty when the frame ends before the first record.
+    """
+    available = max(len(frame) - offset, 0) // dtype.itemsize
+    if available <= 0 or count <= 0:
+        return np.empty(0, dtype=dtype)
+    return np.frombuffer(frame, dtype=dtype, count=min(count, available), offset=offset)
+
+
+def enum_column(values, mapping: Mapping[int, str], default: Union[str, Callable[[int], str]] = "UNKNOWN"):
+    """
+    Vectorized mapping.get(): look up each distinct value once, then scatter.
+    `default` is a string or a callable taking the unmapped value.
+    """
+    uniq, inverse = np.unique(values, return_inverse=True)
+    labels = np.empty(len(uniq), dtype=object)
+    for i, v in enumerate(uniq.tolist()):
+        if v in mapping:
+            labels[i] = mapping[v]
+        else:
+            labels[i] = default(v) if callable(default) else default
+    return labels[inverse.reshape(-1)]
+
+
+def epoch_datetime_column(seconds):
+    """Unix epoch seconds -> datetime64[s] (UTC)."""
+    return np.asarray(seconds).astype(np.int64).astype('datetime64[s]')
+
+
+def epoch_text_column(seconds):
+    """Unix epoch seconds -> 'YYYY-mm-dd HH:MM:SS' strings (UTC)."""
+    text = np.datetime_as_string(epoch_datetime_column(seconds), unit='s')
+    return np.char.replace(text, 'T', ' ')
+
+
+def compile_columnar(layout: PacketLayout) -> Optional[ColumnDecoder]:
+    """
+    Build a decode_columns(frame) for `layout`, or None when numpy is not
+    installed. Produces the same columns (and values, once converted with
+    to_pylists) as compile_layout(layout).
+    """
+    if np is None:
+        return None
+
+    dtype = layout_dtype(layout)
+    locate = instance_locator(layout, dtype.itemsize)
+    data_off = layout.header.data_offset
+    columns = layout.columns
+    count_column = layout.count_column
+
+    conversions = []
+    for f in layout.fields:
+        if f.name is None:
+            continue
+        if f.epoch == EPOCH_RAW:
+            conversions.append((f.name, None))
+        elif f.epoch == EPOCH_TEXT:
+            conversions.append((f.name, epoch_text_column))
+        elif f.epoch == EPOCH_DATETIME:
+            conversions.append((f.name, epoch_datetime_column))
+        elif f.enum is not None:
+            mapping = dict(f.enum)
+            conversions.append((f.name, lambda a, m=mapping: enum_column(a, m, lambda v: f"UNKNOWN({v})")))
+        elif f.scale is not None:
+            # float64 first so float32 fields scale like Python floats do
+            conversions.append((f.name, lambda a, s=f.scale: a.astype(np.float64) * s))
+        else:
+            conversions.append((f.name, None))
+
+    def decode_columns(frame: memoryview) -> Columns:
+        located = locate(frame)
+        if located is None:
+            return {}
+        (submodule_id, queue_id, count), n = located
+
+        records = instance_array(frame, dtype, data_off, n)
+        out: Columns = {
+            'Submodule_ID': [submodule_id] * n,
+            'Queue_ID': [queue_id] * n,
+            count_column: [count] * n,
+        }
+        for name, fn in conversions:
+            out[name] = records[name] if fn is None else fn(records[name])
+        for name, value in layout.constants.items():
+            out[name] = [value] * n
+        # Keep the layout's column order
+        return {c: out[c] for c in columns}
+
+    decode_columns.__name__ = f"{layout.name}__decode_columns"
+    decode_columns.layout = layout
+    decode_columns.dtype = dtype
+    return decode_columns
+
+
+def num_rows(columns: Columns) -> int:
+    for values in columns.values():
+        return len(values)
+    return 0
+
+
+def _to_pylist(values) -> List[Any]:
+    if np is None or not isinstance(values, np.ndarray):
+        return list(values)
+    if values.dtype.kind == 'M':
+        # datetime64 -> timezone-aware datetimes, like the row decoders produce (NaT -> None)
+        return [
+            None if d is None else d.replace(tzinfo=timezone.utc)
+            for d in values.astype('datetime64[us]').tolist()
+        ]
+    return values.tolist()
+
+
+def to_pylists(columns: Columns) -> Dict[str, List[Any]]:
+    """
+    Convert every column to a plain list of Python values (ints, floats,
+    str, datetime) so it can go to psycopg2 or a serializer as-is.
+    """
+    return {name: _to_pylist(values) for name, values in columns.items()}
+
+
+def columns_to_rows(columns: Columns) -> Rows:
+    """Materialize a columnar batch as the row format the decoders return."""
+    lists = to_pylists(columns)
+    names = list(lists)
+    return [dict(zip(names, values)) for values in zip(*lists.values())]
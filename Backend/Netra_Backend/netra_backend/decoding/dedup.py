@@ -0,0 +1,208 @@
+# netra_backend/decoding/dedup.py
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------------------------------------
+# Duplicate frame suppression
+# ---------------------------------------------------------
+#
+# OpenC3 replays packets when the streamer re-subscribes, and operators
+# re-dump on-board queues, so the same health frame (same primary header
+# timestamp / sequence count, submodule, queue and instances) can reach the
+# consumer many times. The consumer fingerprints each raw frame and skips
+# frames it has already decoded and acked.
+#
+# Protocol (one fingerprint per raw message):
+#
+#     if cache.claim(key):     # decode thread, before decoding
+#         ... decode, publish ...
+#         cache.commit(key)    # once the rows are published and the raw message acked
+#         cache.release(key)   # or: requeued / connection died / nothing decoded
+#
+# A claimed key is "in flight": a second copy arriving meanwhile is dropped
+# too. Only committed keys survive (and, with a backing file, are shared
+# across worker processes and restarts), so a message that is requeued, or a
+# frame whose decoder failed, is processed again when it comes back.
+
+# 128-bit digests keep accidental collisions out of reach
+_DIGEST_SIZE = 16
+
+
+def frame_fingerprint(packet_name: str, frame: bytes) -> bytes:
+    """
+    Identity of a raw frame: packet name, length and a BLAKE2b hash of the
+    frame bytes (header fields and instance region).
+    """
+    h = hashlib.blake2b(digest_size=_DIGEST_SIZE)
+    h.update(packet_name.encode("utf-8"))
+    h.update(len(frame).to_bytes(4, "little"))
+    h.update(frame)
+    return h.digest()
+
+
+class DedupCache:
+    """
+    Bounded, time-evicting set of frame fingerprints.
+
+    - In memory: an LRU of at most `max_entries` keys, each expiring `ttl`
+      seconds after it was committed.
+    - Optional persistent backing (`path`, an SQLite file): committed keys
+      are written through and looked up on a memory miss, so duplicates are
+      caught across HEALTH_DECODE_WORKERS processes on the same host and
+      across restarts. Expired rows are purged periodically.
+
+    Thread-safe; claim() runs on the decode thread, commit()/release() on
+    the pika I/O thread.
+    """
+
+    def __init__(self, max_entries: int = 100_000, ttl: float = 86400.0,
+                 path: Optional[str] = None, purge_interval: float = 300.0):
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl
+        self.path = path or None
+        self.purge_interval = purge_interval
+
+        self._lock = threading.Lock()
+        # key -> expiry time (wall clock, so it can be persisted); oldest first
+        self._seen: "OrderedDict[bytes, float]" = OrderedDict()
+        self._in_flight: Set[bytes] = set()
+
+        self.lookups = 0
+        self.hits = 0
+        self.in_flight_hits = 0
+        self.store_hits = 0
+        self.evictions = 0
+
+        self._db: Optional[sqlite3.Connection] = None
+        self._next_purge = 0.0
+        if self.path:
+            self._open_store()
+
+    # ----- persistent backing -----
+
+    def _open_store(self) -> None:
+        try:
+            db = sqlite3.connect(self.path, timeout=5.0, isolation_level=None, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS seen_frames ("
+                " fingerprint BLOB PRIMARY KEY,"
+                " expires_at REAL NOT NULL"
+                ") WITHOUT ROWID"
+            )
+        except sqlite3.Error as e:
+            logger.error("Cannot open dedup store %s (%s); using memory only", self.path, e)
+            return
+        self._db = db
+        logger.info("Frame dedup store: %s", self.path)
+
+    def _store_contains(self, key: bytes, now: float) -> bool:
+        try:
+            row = self._db.execute(
+                "SELECT expires_at FROM seen_frames WHERE fingerprint = ?", (key,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning("Dedup store lookup failed: %s", e)
+            return False
+        if row is None or row[0] <= now:
+            return False
+        self._remember(key, row[0])
+        return True
+
+    def _store_add(self, key: bytes, expires_at: float) -> None:
+        try:
+            self._db.execute(
+                "INSERT OR REPLACE INTO seen_frames (fingerprint, expires_at) VALUES (?, ?)",
+                (key, expires_at),
+            )
+            now = expires_at - self.ttl
+            if now >= self._next_purge:
+                self._next_purge = now + self.purge_interval
+                self._db.execute("DELETE FROM seen_frames WHERE expires_at <= ?", (now,))
+        except sqlite3.Error as e:
+            logger.warning("Dedup store write failed: %s", e)
+
+    # ----- memory -----
+
+    def _remember(self, key: bytes, expires_at: float) -> None:
+        self._seen[key] = expires_at
+        self._seen.move_to_end(key)
+        while len(self._seen) > self.max_entries:
+            self._seen.popitem(last=False)
+            self.evictions += 1
+
+    def _seen_recently(self, key: bytes, now: float) -> bool:
+        expires_at = self._seen.get(key)
+        if expires_at is None:
+            return False
+        if expires_at <= now:
+            del self._seen[key]
+            return False
+        self._seen.move_to_end(key)
+        return True
+
+    # ----- protocol -----
+
+    def claim(self, key: bytes) -> bool:
+        """
+        True if the frame should be processed (never seen, not in flight);
+        the key is then in flight until commit() or release().
+        False for a duplicate.
+        """
+        now = time.time()
+        with self._lock:
+            self.lookups += 1
+            if key in self._in_flight:
+                self.hits += 1
+                self.in_flight_hits += 1
+                return False
+            if self._seen_recently(key, now):
+                self.hits += 1
+                return False
+            if self._db is not None and self._store_contains(key, now):
+                self.hits += 1
+                self.store_hits += 1
+                return False
+            self._in_flight.add(key)
+            return True
+
+    def commit(self, key: bytes) -> None:
+        """The frame was processed and its raw message acked."""
+        expires_at = time.time() + self.ttl
+        with self._lock:
+            self._in_flight.discard(key)
+            self._remember(key, expires_at)
+            if self._db is not None:
+                self._store_add(key, expires_at)
+
+    def release(self, key: bytes) -> None:
+        """The frame was not processed (requeued, or not decoded); let it through next time."""
+        with self._lock:
+            self._in_flight.discard(key)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "lookups": self.lookups,
+                "hits": self.hits,
+                "in_flight_hits": self.in_flight_hits,
+                "store_hits": self.store_hits,
+                "hit_rate": self.hits / self.lookups if self.lookups else 0.0,
+                "entries": len(self._seen),
+                "in_flight": len(self._in_flight),
+                "evictions": self.evictions,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
@@ -0,0 +1,55 @@
+# netra_backend/decoding/frame.py
+from typing import Any, Callable, Dict, List
+
+# ---------------------------------------------------------
+# Frame decoder ABI
+# ---------------------------------------------------------
+#
+# Legacy decoders:   HEALTH_X(hex_str: str) -> List[Dict]
+# Frame decoders:    decode_frame(frame: memoryview) -> List[Dict]
+#
+# A decoder module opts into the frame ABI by defining a module-level
+# `decode_frame`. It receives a memoryview over the raw OpenC3 buffer and
+# should read fields with precompiled struct.Struct.unpack_from at byte
+# offsets instead of slicing hex and calling bytes.fromhex per field.
+
+FRAME_DECODER_NAME = "decode_frame"
+
+Rows = List[Dict[str, Any]]
+FrameDecoder = Callable[[memoryview], Rows]
+HexDecoder = Callable[[str], Rows]
+
+# ---------------------------------------------------------
+# Column types
+# ---------------------------------------------------------
+#
+# Timestamps are emitted raw (epoch integers straight from the frame) and
+# declared in a module-level mapping, e.g.
+#
+#     COLUMN_TYPES = {"Epoch_Time_Human": EPOCH_S}
+#
+# Layout-based modules get theirs from LAYOUT.column_types. The types
+# travel with the decoded message and the DB writer turns these columns
+# into TIMESTAMPTZ values; nothing downstream has to guess which strings
+# are dates.
+
+COLUMN_TYPES_NAME = "COLUMN_TYPES"
+
+EPOCH_S = "epoch_s"      # seconds since 1970-01-01 UTC
+EPOCH_MS = "epoch_ms"    # milliseconds since 1970-01-01 UTC
+TIMESTAMP = "ts"         # datetime object (ISO 8601 text once serialized)
+
+ColumnTypes = Dict[str, str]
+
+
+def hex_shim(hex_decoder: HexDecoder) -> FrameDecoder:
+    """
+    Adapt a legacy hex-string decoder to the frame ABI so the consumer can
+    call every decoder the same way while modules are being migrated.
+    """
+    def decode_frame(frame: memoryview) -> Rows:
+        return hex_decoder(frame.hex())
+
+    decode_frame.__name__ = f"{hex_decoder.__name__}__hex_shim"
+    decode_frame.__wrapped__ = hex_decoder
+    return decode_frame
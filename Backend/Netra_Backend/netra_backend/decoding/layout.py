@@ -0,0 +1,254 @@
+# netra_backend/decoding/layout.py
+import struct
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Callable, List, Mapping, Optional, Sequence, Tuple
+
+from netra_backend.decoding.frame import EPOCH_S, TIMESTAMP, ColumnTypes, FrameDecoder, Rows
+
+# ---------------------------------------------------------
+# Declarative health packet layouts
+# ---------------------------------------------------------
+#
+# Most health packets are the same shape: a fixed frame header, then
+#   Submodule ID (u8) | Queue ID (u8) | Number of instances (u16 LE)
+# followed by `count` fixed-size instance records. A PacketLayout
+# declares the header profile and the instance fields; compile_layout()
+# turns it into a frame-ABI decoder that unpacks the whole instance array
+# with one precompiled struct.Struct.iter_unpack.
+#
+# A decoder module switches over by defining
+#
+#     LAYOUT = PacketLayout(...)
+#     decode_frame = compile_layout(LAYOUT)
+#
+# and keeping its HEALTH_X(hex_str) function as a thin wrapper. Column
+# names and order are whatever the layout declares, so a module can be
+# migrated without changing the table the DB worker writes to. Epoch
+# fields are emitted raw and listed in LAYOUT.column_types.
+
+EPOCH_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# Epoch field renderings
+EPOCH_RAW = "raw"            # epoch seconds as sent, declared as an EPOCH_S column (default)
+EPOCH_TEXT = "text"          # 'YYYY-mm-dd HH:MM:SS' string
+EPOCH_DATETIME = "datetime"  # timezone-aware datetime (UTC)
+
+# Instance stride modes
+FIXED_STRIDE = "fixed"      # records are exactly record.size bytes apart
+TM_LEN_STRIDE = "tm_len"    # stride derived from TM_LEN / count, must equal record.size
+
+
+@dataclass(frozen=True)
+class HeaderProfile:
+    name: str
+    # Byte offset of SUB_MODULE_ID; QUEUE_ID and the u16 instance count follow it
+    submodule_offset: int
+    # Byte offset of the first instance record
+    data_offset: int
+    # Byte offset of the u16 TM_LEN field (only needed for TM_LEN_STRIDE)
+    tm_len_offset: Optional[int] = None
+
+
+# 26-byte frame header (TM_LEN at 24-25), count at 28-29, data at byte 30.
+# Matches the SUB_MODULE_ID offset in tlm_health.txt.
+ADCS_HEADER = HeaderProfile("ADCS", submodule_offset=26, data_offset=30, tm_len_offset=24)
+
+# Frames used by the SENSORS_* decoders: TM_LEN at 23-24, count at 27-28,
+# instance records packed straight after the count at byte 29.
+SENSORS_HEADER = HeaderProfile("SENSORS", submodule_offset=25, data_offset=29, tm_len_offset=23)
+
+# Same frame, but data read from byte 30 (one byte after the count), as the
+# ADCS *_CURRENT / EST_INNOV / RAW_*_SNS decoders do.
+SENSORS_HEADER_ALIGNED = HeaderProfile("SENSORS_ALIGNED", submodule_offset=25, data_offset=30, tm_len_offset=23)
+
+QM_HEADER = struct.Struct('<BBH')
+TM_LEN = struct.Struct('<H')
+
+# ((submodule_id, queue_id, count), number of complete instance records)
+Located = Tuple[Tuple[int, int, int], int]
+
+
+@dataclass(frozen=True)
+class Field:
+    """
+    One instance field. `fmt` is a little-endian struct code ('B', 'I', 'h',
+    'f', 'd', ...); a field with name=None is skipped (use pad()).
+    """
+    name: Optional[str]
+    fmt: str
+    scale: Optional[float] = None
+    enum: Optional[Mapping[int, str]] = None
+    epoch: Optional[str] = None
+
+
+def pad(nbytes: int) -> Field:
+    """Reserved / unused bytes inside an instance record."""
+    return Field(None, f"{nbytes}x")
+
+
+def epoch(name: str, fmt: str = 'I', render: str = EPOCH_RAW) -> Field:
+    """
+    Unix epoch seconds. Emitted as the raw integer and declared as a
+    timestamp column by default; EPOCH_TEXT / EPOCH_DATETIME render it here.
+    """
+    return Field(name, fmt, epoch=render)
+
+
+# Operation status + epoch prefix shared by almost every ADCS instance record
+ADCS_STATUS_FIELDS: Tuple[Field, ...] = (
+    Field('Operation_Status', 'B'),
+    epoch('Epoch_Time_Human'),
+)
+
+
+@dataclass(frozen=True)
+class PacketLayout:
+    name: str
+    header: HeaderProfile
+    fields: Sequence[Field]
+    # Column name for the instance count; older decoders use 'Number_of_Instances'
+    count_column: str = 'Number of Instances'
+    stride: str = FIXED_STRIDE
+    # Constant columns appended to every row
+    constants: Mapping[str, Any] = field(default_factory=dict)
+
+    @property
+    def record_format(self) -> str:
+        return '<' + ''.join(f.fmt for f in self.fields)
+
+    @property
+    def columns(self) -> List[str]:
+        return (
+            ['Submodule_ID', 'Queue_ID', self.count_column]
+            + [f.name for f in self.fields if f.name is not None]
+            + list(self.constants)
+        )
+
+    @property
+    def column_types(self) -> ColumnTypes:
+        types: ColumnTypes = {}
+        for f in self.fields:
+            if f.epoch == EPOCH_RAW:
+                types[f.name] = EPOCH_S
+            elif f.epoch == EPOCH_DATETIME:
+                types[f.name] = TIMESTAMP
+        return types
+
+
+@lru_cache(maxsize=4096)
+def format_epoch(epoch_seconds: int) -> str:
+    # Instances in one frame are usually seconds apart, so this cache hits often
+    return datetime.fromtimestamp(epoch_seconds, timezone.utc).strftime(EPOCH_FORMAT)
+
+
+def _converter(f: Field) -> Optional[Callable[[Any], Any]]:
+    if f.epoch == EPOCH_RAW:
+        return None
+    if f.epoch == EPOCH_TEXT:
+        return format_epoch
+    if f.epoch == EPOCH_DATETIME:
+        return lambda v: datetime.fromtimestamp(v, timezone.utc)
+    if f.enum is not None:
+        mapping = dict(f.enum)
+        return lambda v: mapping.get(v, f"UNKNOWN({v})")
+    if f.scale is not None:
+        scale = f.scale
+        # Multiply (not divide) so values match the hand-written decoders bit for bit
+        return lambda v: v * scale
+    return None
+
+
+def _check_layout(layout: PacketLayout) -> None:
+    for f in layout.fields:
+        if f.epoch not in (None, EPOCH_RAW, EPOCH_TEXT, EPOCH_DATETIME):
+            raise ValueError(f"{layout.name}: unknown epoch rendering {f.epoch!r} for {f.name!r}")
+    if layout.stride not in (FIXED_STRIDE, TM_LEN_STRIDE):
+        raise ValueError(f"{layout.name}: unknown stride mode {layout.stride!r}")
+    if layout.stride == TM_LEN_STRIDE and layout.header.tm_len_offset is None:
+        raise ValueError(f"{layout.name}: TM_LEN stride needs a header with tm_len_offset")
+
+
+def instance_locator(layout: PacketLayout, record_size: int) -> Callable[[memoryview], Optional[Located]]:
+    """
+    Build locate(frame) -> ((submodule_id, queue_id, count), n) where n is the
+    number of complete instance records starting at header.data_offset, or
+    None when the frame carries no decodable instances. Shared by the row
+    and columnar decoders so both agree on what a frame contains.
+    """
+    _check_layout(layout)
+    header = layout.header
+    sub_off = header.submodule_offset
+    data_off = header.data_offset
+    tm_len_off = header.tm_len_offset
+    tm_len_stride = layout.stride == TM_LEN_STRIDE
+
+    def locate(frame: memoryview) -> Optional[Located]:
+        if len(frame) < data_off:
+            return None
+
+        prefix = QM_HEADER.unpack_from(frame, sub_off)
+        count = prefix[2]
+        if count == 0:
+            return None
+
+        end = len(frame)
+        if tm_len_stride:
+            payload_len = TM_LEN.unpack_from(frame, tm_len_off)[0] - 4
+            # The original decoders derive the segment length in hex characters
+            # ((2 * TM_LEN - 8) // count) and can only unpack it if it is exactly
+            # one record, so keep that rule.
+            if (2 * payload_len) // count != 2 * record_size:
+                return None
+            end = min(end, data_off + payload_len)
+
+        # Only complete records, at most `count` of them
+        n = min(count, max(end - data_off, 0) // record_size)
+        if n == 0:
+            return None
+        return prefix, n
+
+    return locate
+
+
+def compile_layout(layout: PacketLayout) -> FrameDecoder:
+    """
+    Build a decode_frame(frame) for `layout`. All per-field work (offsets,
+    struct format, scale/enum/epoch conversion) is resolved here once.
+    """
+    record = struct.Struct(layout.record_format)
+    locate = instance_locator(layout, record.size)
+    data_off = layout.header.data_offset
+    columns = tuple(layout.columns)
+    constants = tuple(layout.constants.values())
+
+    # Positions (in the unpacked tuple) that need converting; pad bytes produce no value
+    converters = []
+    for pos, f in enumerate(f for f in layout.fields if f.name is not None):
+        fn = _converter(f)
+        if fn is not None:
+            converters.append((pos, fn))
+    converters = tuple(converters)
+
+    def decode_frame(frame: memoryview) -> Rows:
+        located = locate(frame)
+        if located is None:
+            return []
+        prefix, n = located
+
+        rows = []
+        for values in record.iter_unpack(frame[data_off:data_off + n * record.size]):
+            if converters:
+                values = list(values)
+                for pos, fn in converters:
+                    values[pos] = fn(values[pos])
+                values = tuple(values)
+            rows.append(dict(zip(columns, prefix + values + constants)))
+        return rows
+
+    decode_frame.__name__ = f"{layout.name}__decode_frame"
+    decode_frame.layout = layout
+    decode_frame.record = record
+    return decode_frame
+
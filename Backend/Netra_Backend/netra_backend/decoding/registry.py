@@ -0,0 +1,254 @@
+# netra_backend/decoding/registry.py
+import importlib
+import logging
+import pkgutil
+import sys
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional
+
+from netra_backend.decoding.columnar import COLUMN_DECODER_NAME, ColumnDecoder, compile_columnar
+from netra_backend.decoding.frame import (
+    COLUMN_TYPES_NAME,
+    FRAME_DECODER_NAME,
+    ColumnTypes,
+    FrameDecoder,
+    hex_shim,
+)
+from netra_backend.decoding.layout import PacketLayout
+
+logger = logging.getLogger(__name__)
+
+DECODER_PACKAGE = "netra_backend.health_decoders"
+
+
+class DecoderNotFound(Exception):
+    pass
+
+
+@dataclass
+class DecoderEntry:
+    core_name: str
+    module_name: str
+    func: Callable
+    # Frame-ABI entry point: the module's own decode_frame, or a hex shim around func
+    decode_frame: FrameDecoder
+    native_frame: bool
+    # Vectorized entry point (None when numpy is missing or the module has none)
+    decode_columns: Optional[ColumnDecoder] = None
+    # Declared column types (timestamps emitted as raw epochs etc.)
+    column_types: ColumnTypes = field(default_factory=dict)
+
+
+def core_name_for_packet(packet_name: str) -> str:
+    """
+    'RAW__TLM__EMULATOR__HEALTH_ADCS_TEMP' -> 'HEALTH_ADCS_TEMP'
+    (everything after the target name is the decoder module name).
+    """
+    parts = packet_name.split("__")
+    if len(parts) < 4:
+        raise DecoderNotFound(f"Unexpected packet name format: {packet_name}")
+    return "__".join(parts[3:])
+
+
+def _resolve_decoder_fn(module, core_name: str) -> Optional[Callable]:
+    """
+    Try the exact function name first, then the first callable starting with HEALTH_
+    (handles modules like HEALTH_COMS_S -> HEALTH_COMMS_SBAND_TM_PROP_QUEUE0).
+    """
+    func = getattr(module, core_name, None)
+    if callable(func):
+        return func
+
+    for attr_name in sorted(dir(module)):
+        if attr_name.startswith("HEALTH_"):
+            candidate = getattr(module, attr_name)
+            if callable(candidate):
+                logger.debug("Found alternative decoder function: %s in %s", attr_name, module.__name__)
+                return candidate
+    return None
+
+
+class DecoderRegistry:
+    """
+    Imports every module in netra_backend.health_decoders once and keeps an
+    O(1) packet_name -> decoder table for the consumer hot path.
+
+    - load() resolves all decoders up front and records what is broken/missing
+    - get() is a plain dict lookup (no importlib / dir() scans per message)
+    - reload() re-imports a single decoder module in place
+    """
+
+    def __init__(self, packet_names: Iterable[str], package: str = DECODER_PACKAGE):
+        self.package = package
+        self.packet_names: List[str] = list(packet_names)
+
+        self._by_core: Dict[str, DecoderEntry] = {}
+        self._by_packet: Dict[str, DecoderEntry] = {}
+        # core_name -> reason, for modules that failed to import or have no decoder function
+        self.failures: Dict[str, str] = {}
+        # packet_name -> reason, for subscribed packets we cannot decode
+        self.missing: Dict[str, str] = {}
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    def _discover_modules(self) -> List[str]:
+        pkg = importlib.import_module(self.package)
+        return sorted(
+            m.name for m in pkgutil.iter_modules(pkg.__path__)
+            if m.name.startswith("HEALTH_")
+        )
+
+    def _load_module(self, core_name: str, reload: bool = False) -> Optional[DecoderEntry]:
+        module_name = f"{self.package}.{core_name}"
+        try:
+            if reload and module_name in sys.modules:
+                module = importlib.reload(sys.modules[module_name])
+            else:
+                module = importlib.import_module(module_name)
+        except ModuleNotFoundError:
+            self.failures[core_name] = f"Decoder module not found: {module_name}"
+            return None
+        except BaseException as e:  # SyntaxError etc. must not kill startup
+            if isinstance(e, (KeyboardInterrupt, SystemExit)):
+                raise
+            self.failures[core_name] = f"{type(e).__name__}: {e}"
+            return None
+
+        func = _resolve_decoder_fn(module, core_name)
+        if func is None:
+            self.failures[core_name] = f"No valid decoder function found in {module_name}"
+            return None
+
+        frame_fn = getattr(module, FRAME_DECODER_NAME, None)
+        native_frame = callable(frame_fn)
+        if not native_frame:
+            frame_fn = hex_shim(func)
+
+        layout = getattr(module, "LAYOUT", None)
+        column_types = getattr(module, COLUMN_TYPES_NAME, None)
+        if column_types is None and isinstance(layout, PacketLayout):
+            column_types = layout.column_types
+
+        columns_fn = getattr(module, COLUMN_DECODER_NAME, None)
+        if not callable(columns_fn):
+            try:
+                columns_fn = compile_columnar(layout) if isinstance(layout, PacketLayout) else None
+            except ValueError as e:
+                logger.warning("No columnar decoder for %s: %s", core_name, e)
+                columns_fn = None
+
+        self.failures.pop(core_name, None)
+        return DecoderEntry(
+            core_name=core_name,
+            module_name=module_name,
+            func=func,
+            decode_frame=frame_fn,
+            native_frame=native_frame,
+            decode_columns=columns_fn,
+            column_types=dict(column_types or {}),
+        )
+
+    def load(self) -> "DecoderRegistry":
+        """
+        Import and resolve every decoder module and build the packet table.
+        """
+        self._by_core.clear()
+        self._by_packet.clear()
+        self.failures.clear()
+        self.missing.clear()
+
+        for core_name in self._discover_modules():
+            entry = self._load_module(core_name)
+            if entry is not None:
+                self._by_core[core_name] = entry
+
+        for packet_name in self.packet_names:
+            self._bind_packet(packet_name)
+
+        self.report()
+        return self
+
+    def _bind_packet(self, packet_name: str) -> None:
+        try:
+            core_name = core_name_for_packet(packet_name)
+        except DecoderNotFound as e:
+            self.missing[packet_name] = str(e)
+            return
+
+        entry = self._by_core.get(core_name)
+        if entry is None:
+            self._by_packet.pop(packet_name, None)
+            self.missing[packet_name] = self.failures.get(
+                core_name, f"Decoder module not found: {self.package}.{core_name}"
+            )
+            return
+
+        self._by_packet[packet_name] = entry
+        self.missing.pop(packet_name, None)
+
+    def report(self) -> None:
+        """
+        Log a verify_decoders-style summary of what loaded and what did not.
+        """
+        logger.info(
+            "Decoder registry: %d modules loaded (%d native frame ABI, %d columnar), %d/%d packets decodable",
+            len(self._by_core),
+            sum(1 for e in self._by_core.values() if e.native_frame),
+            sum(1 for e in self._by_core.values() if e.decode_columns is not None),
+            len(self._by_packet),
+            len(self.packet_names),
+        )
+        for core_name, reason in sorted(self.failures.items()):
+            logger.warning("Decoder FAIL: %s -> %s", core_name, reason)
+        for packet_name, reason in sorted(self.missing.items()):
+            logger.warning("No decoder for packet %s: %s", packet_name, reason)
+
+    # ------------------------------------------------------------------
+    # Lookup / reload
+    # ------------------------------------------------------------------
+
+    def get(self, packet_name: str) -> DecoderEntry:
+        entry = self._by_packet.get(packet_name)
+        if entry is None:
+            raise DecoderNotFound(
+                self.missing.get(packet_name, f"Packet not registered: {packet_name}")
+            )
+        return entry
+
+    def __contains__(self, packet_name: str) -> bool:
+        return packet_name in self._by_packet
+
+    def __len__(self) -> int:
+        return len(self._by_packet)
+
+    def modules(self) -> Dict[str, DecoderEntry]:
+        """Every decoder module that loaded, by core name (bound to a packet or not)."""
+        return dict(self._by_core)
+
+    def reload(self, name: str) -> DecoderEntry:
+        """
+        Re-import one decoder module and swap it into the table.
+        `name` may be a core name (HEALTH_EPS) or a full packet name.
+        The previous decoder stays active if the new version fails to load.
+        """
+        core_name = core_name_for_packet(name) if "__" in name else name
+
+        entry = self._load_module(core_name, reload=True)
+        if entry is None:
+            reason = self.failures.get(core_name, "unknown error")
+            if core_name in self._by_core:
+                logger.error("Reload of %s failed (%s); keeping previous decoder", core_name, reason)
+            raise DecoderNotFound(f"Reload of {core_name} failed: {reason}")
+
+        self._by_core[core_name] = entry
+        for packet_name in self.packet_names:
+            if packet_name.endswith(f"__{core_name}"):
+                self._bind_packet(packet_name)
+
+        logger.info(
+            "Reloaded decoder %s (%s, %s)",
+            core_name, entry.func.__name__, "frame ABI" if entry.native_frame else "hex shim",
+        )
+        return entry
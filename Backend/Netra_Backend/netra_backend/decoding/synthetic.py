@@ -0,0 +1,157 @@
+# netra_backend/decoding/synthetic.py
+import contextlib
+import io
+import random
+import struct
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+from netra_backend.decoding.frame import FrameDecoder
+from netra_backend.decoding.layout import (
+    ADCS_HEADER,
+    QM_HEADER,
+    SENSORS_HEADER,
+    SENSORS_HEADER_ALIGNED,
+    TM_LEN,
+    HeaderProfile,
+    PacketLayout,
+)
+
+# ---------------------------------------------------------
+# Synthetic health frames
+# ---------------------------------------------------------
+#
+# Builds valid raw frames for any decoder module, for benchmarks and
+# regression checks (see bench_decoders.py):
+#
+#   - Modules with a PacketLayout: records are packed field by field with
+#     plausible values (valid enum codes, recent epoch times).
+#   - Hand-written decoders: the header profile and instance record size
+#     are found by probing the decoder with small frames (probe_generator),
+#     and records are filled with seeded random bytes.
+#
+# Frames follow the header profiles in decoding.layout: filler bytes up to
+# TM_LEN, then SUB_MODULE_ID, QUEUE_ID, the u16 instance count and the
+# instance records. TM_LEN is set to the payload length + 4, as on the
+# spacecraft.
+
+HEADER_PROFILES = (ADCS_HEADER, SENSORS_HEADER, SENSORS_HEADER_ALIGNED)
+
+# TM_LEN and the instance count are u16
+MAX_PAYLOAD = 0xFFFF - 4
+
+# Recent epoch (2026-01-01) so timestamp columns stay in range
+_EPOCH_BASE = 1767225600
+_INT_RANGES = {
+    'b': (-128, 127), 'B': (0, 255), 'h': (-32768, 32767), 'H': (0, 65535),
+    'i': (-2**31, 2**31 - 1), 'I': (0, 2**32 - 1), 'l': (-2**31, 2**31 - 1), 'L': (0, 2**32 - 1),
+    'q': (-2**63, 2**63 - 1), 'Q': (0, 2**64 - 1),
+}
+
+# Record sizes tried by probe_generator, and the instance counts used to confirm one
+_MAX_PROBE_RECORD = 512
+_PROBE_COUNTS = (3, 5)
+
+
+def build_frame(header: HeaderProfile, records: bytes, count: int,
+                submodule_id: int = 1, queue_id: int = 0) -> bytes:
+    """Wrap packed instance records in a frame header."""
+    frame = bytearray(header.data_offset)
+    # Recognizable filler for the outer header
+    for i in range(min(header.submodule_offset, 23)):
+        frame[i] = (0xA5 + i) & 0xFF
+    if header.tm_len_offset is not None:
+        TM_LEN.pack_into(frame, header.tm_len_offset, min(len(records) + 4, 0xFFFF))
+    QM_HEADER.pack_into(frame, header.submodule_offset, submodule_id, queue_id, count)
+    return bytes(frame) + records
+
+
+def _field_value(f, index: int, rng: random.Random):
+    if f.epoch is not None:
+        return _EPOCH_BASE + 10 * index
+    if f.enum:
+        return rng.choice(list(f.enum))
+    if f.fmt in ('f', 'd'):
+        return rng.uniform(-100.0, 100.0)
+    if f.fmt == '?':
+        return rng.random() < 0.5
+    lo, hi = _INT_RANGES[f.fmt]
+    return rng.randint(lo, hi)
+
+
+def layout_records(layout: PacketLayout, count: int, seed: int = 0) -> bytes:
+    """`count` packed instance records with plausible values for every field."""
+    rng = random.Random(seed)
+    record = struct.Struct(layout.record_format)
+    named = [f for f in layout.fields if f.name is not None]
+    return b"".join(
+        record.pack(*[_field_value(f, i, rng) for f in named])
+        for i in range(count)
+    )
+
+
+@dataclass(frozen=True)
+class FrameGenerator:
+    """How to build frames for one decoder module."""
+    name: str
+    header: HeaderProfile
+    record_size: int
+    layout: Optional[PacketLayout] = None
+    # Hand-written decoders that only decode zero-filled records
+    zero_fill: bool = False
+
+    @property
+    def max_instances(self) -> int:
+        return max(1, MAX_PAYLOAD // self.record_size)
+
+    def records(self, count: int, seed: int = 0) -> bytes:
+        if self.layout is not None:
+            return layout_records(self.layout, count, seed)
+        if self.zero_fill:
+            return bytes(count * self.record_size)
+        return random.Random(seed).randbytes(count * self.record_size)
+
+    def frame(self, count: int, seed: int = 0) -> bytes:
+        """A frame with `count` instances (capped so TM_LEN fits in 16 bits)."""
+        count = min(count, self.max_instances)
+        return build_frame(self.header, self.records(count, seed), count)
+
+
+def layout_generator(layout: PacketLayout, name: Optional[str] = None) -> FrameGenerator:
+    return FrameGenerator(name or layout.name, layout.header, struct.calcsize(layout.record_format), layout)
+
+
+def _decoded_rows(decode_frame: FrameDecoder, frame: bytes) -> int:
+    # Hand-written decoders print on short or odd frames; keep probing quiet
+    with contextlib.redirect_stdout(io.StringIO()):
+        try:
+            return len(decode_frame(memoryview(frame)))
+        except Exception:
+            return -1
+
+
+def probe_generator(name: str, decode_frame: FrameDecoder,
+                    headers: Sequence[HeaderProfile] = HEADER_PROFILES) -> Optional[FrameGenerator]:
+    """
+    Find a header profile and record size for which `decode_frame` returns
+    exactly one row per instance, trying random and then zero-filled
+    records. Returns None when nothing fits (e.g. variable-length records).
+    """
+    for zero_fill in (False, True):
+        for header in headers:
+            for size in range(1, _MAX_PROBE_RECORD + 1):
+                gen = FrameGenerator(name, header, size, zero_fill=zero_fill)
+                if all(_decoded_rows(decode_frame, gen.frame(n, seed=n)) == n for n in _PROBE_COUNTS):
+                    return gen
+    return None
+
+
+def generator_for(entry) -> Optional[FrameGenerator]:
+    """
+    FrameGenerator for a DecoderEntry (see DecoderRegistry.modules()), or
+    None when no frame could be found that the decoder accepts.
+    """
+    layout = getattr(entry.decode_frame, "layout", None)
+    if isinstance(layout, PacketLayout):
+        return layout_generator(layout, entry.core_name)
+    return probe_generator(entry.core_name, entry.decode_frame)
@@ -1,6 +1,10 @@
 
 import struct 
-from datetime import datetime
+
+from netra_backend.decoding.frame import EPOCH_S
+
+COLUMN_TYPES = {'Epoch_Time_Human': EPOCH_S}
+
 def HEALTH_ADCS_CMD_ATTITUDE_ANGLE(hex_str):
     # hex_str is expected to be a continuous hex string (no spaces)
     
@@ -66,7 +70,6 @@ def HEALTH_ADCS_CMD_ATTITUDE_ANGLE(hex_str):
             # Epoch Time
             epoch_hex = seg[offset:offset+8]
             epoch_time = struct.unpack('<I', bytes.fromhex(epoch_hex))[0]
-            epoch_time_human = datetime.utcfromtimestamp(epoch_time).strftime('%Y-%m-%d %H:%M:%S')
             offset += 8
             
             # Roll (8 bytes)
@@ -94,7 +97,7 @@ def HEALTH_ADCS_CMD_ATTITUDE_ANGLE(hex_str):
                 'Queue_ID':             queue_id,
                 'Number_of_Instances':  count,
                 'Operation_Status':     operation_status,
-                'Epoch_Time_Human':     epoch_time_human,
+                'Epoch_Time_Human':     epoch_time,
                 'Commanded_Roll':       roll,
                 'Commanded_Pitch':      pitch,
                 'Commanded_Yaw':        yaw,
@@ -1,6 +1,10 @@
 
 import struct 
-from datetime import datetime
+
+from netra_backend.decoding.frame import EPOCH_S
+
+COLUMN_TYPES = {'Epoch_Time_Human': EPOCH_S}
+
 
 def HEALTH_ADCS_MEAS_RW_SPEED(hex_str):
     # 1. Skip metadata header (26 bytes)
@@ -52,7 +56,6 @@ def HEALTH_ADCS_MEAS_RW_SPEED(hex_str):
             # Epoch: 4 bytes (UINT32)
             epoch_hex = seg[2:10]
             epoch_time = struct.unpack('<I', bytes.fromhex(epoch_hex))[0]
-            epoch_time_human = datetime.utcfromtimestamp(epoch_time).strftime('%Y-%m-%d %H:%M:%S')
             
             # Number of Reaction Wheels (N): 1 byte
             num_rw = int(seg[10:12], 16)
@@ -72,7 +75,7 @@ def HEALTH_ADCS_MEAS_RW_SPEED(hex_str):
                 'Queue_ID':             queue_id,
                 'Number_of_Instances':  count,
                 'Operation_Status':     operation_status,
-                'Epoch_Time_Human':     epoch_time_human,
+                'Epoch_Time_Human':     epoch_time,
                 'Num_Reaction_Wheels':  num_rw
             }
             
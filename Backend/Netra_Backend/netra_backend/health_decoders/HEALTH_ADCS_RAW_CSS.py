@@ -1,5 +1,9 @@
 import struct
-from datetime import datetime
+
+from netra_backend.decoding.frame import EPOCH_S
+
+COLUMN_TYPES = {'Epoch_Time_Human': EPOCH_S}
+
 
 def HEALTH_ADCS_RAW_CSS(hex_str):
     header_skip_len = 29  # metadata header in bytes
@@ -28,8 +32,6 @@ def HEALTH_ADCS_RAW_CSS(hex_str):
         operation_status = int(seg[0:2], 16)
         epoch_bytes = bytes.fromhex(seg[2:10])
         epoch_time = struct.unpack('<I', epoch_bytes)[0]
-        epoch_time_human = datetime.utcfromtimestamp(epoch_time) \
-                    .strftime('%Y-%m-%d %H:%M:%S')
         
         CSS_AD_Value_0= int(seg[10:14], 16) 
         CSS_AD_Value_1= int(seg[14:18], 16) 
@@ -42,7 +44,7 @@ def HEALTH_ADCS_RAW_CSS(hex_str):
             'Queue_ID':               queue_id,
             'Number of Instances':                   count,
             'Operation_Status':       operation_status,
-            'Epoch_Time_Human':       epoch_time_human,
+            'Epoch_Time_Human':       epoch_time,
             'CSS_AD_Value_0':         CSS_AD_Value_0,
             'CSS_AD_Value_1':         CSS_AD_Value_1,
             'CSS_AD_Value_2':         CSS_AD_Value_2,
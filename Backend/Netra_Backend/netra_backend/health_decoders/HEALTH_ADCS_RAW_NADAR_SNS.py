@@ -1,45 +1,25 @@
-import struct 
-from datetime import datetime
+from netra_backend.decoding.layout import (
+    ADCS_STATUS_FIELDS,
+    SENSORS_HEADER_ALIGNED,
+    Field,
+    PacketLayout,
+    compile_layout,
+)
 
+LAYOUT = PacketLayout(
+    name='HEALTH_ADCS_RAW_NADAR_SNS',
+    header=SENSORS_HEADER_ALIGNED,
+    fields=ADCS_STATUS_FIELDS + (
+        Field('Raw_NADAR_X', 'h'),
+        Field('Raw_NADAR_Y', 'h'),
+        Field('NADAR_sensor_capture_status', 'B'),
+        Field('nadar_capture_result', 'B'),
+    ),
+)
+
+decode_frame = compile_layout(LAYOUT)
 
-def HEALTH_ADCS_RAW_NADAR_SNS(hex_str):
-    header_skip_len = 29  # metadata header in bytes
-    tc_len=struct.unpack('<H', bytes.fromhex(hex_str[46:50]))[0]
-    tm_len=tc_len*2 -8
-    submodule_id = int(hex_str[50:52], 16)
-    queue_id = int(hex_str[52:54], 16)
-    count_offset = (header_skip_len - 2) * 2
 
-    count = struct.unpack('<H', bytes.fromhex(hex_str[count_offset:count_offset + 4]))[0]
-    if count == 0:
-        print("[WARN] Sensor count is zero. Skipping parsing.")
-        return []
-    # Force segment length = 11 bytes = 22 hex characters
-    segment_len = 22
-    data_payload = hex_str[60:60+count * segment_len]
-    segments = []
-    for idx in range(count):
-        seg = data_payload[idx * segment_len:(idx + 1) * segment_len]
-        if len(seg) < segment_len:
-           continue
-        operation_status = int(seg[0:2], 16)
-        epoch_bytes = bytes.fromhex(seg[2:10])
-        epoch_time = struct.unpack('<I', epoch_bytes)[0]
-        epoch_time_human = datetime.utcfromtimestamp(epoch_time) \
-                                .strftime('%Y-%m-%d %H:%M:%S')
-        raw_nadar_sns_x = struct.unpack('<h', bytes.fromhex(seg[10:14]))[0] 
-        raw_nadar_sns_y = struct.unpack('<h', bytes.fromhex(seg[14:18]))[0] 
-        NADIR_SENSOR_CAPTURE_STATUS =int(seg[18:20], 16)
-        NADIR_result = int(seg[20:22], 16)
-        segments.append({
-            'Submodule_ID':           submodule_id,
-            'Queue_ID':               queue_id,
-            'Number of Instances':                   count,
-            'Operation_Status':       operation_status,
-            'Epoch_Time_Human':       epoch_time_human,
-            'Raw_NADAR_X':        raw_nadar_sns_x,
-            'Raw_NADAR_Y':        raw_nadar_sns_y,
-            'NADAR_sensor_capture_status':     NADIR_SENSOR_CAPTURE_STATUS,
-            'nadar_capture_result':     NADIR_result
-        })
-    return segments
+def HEALTH_ADCS_RAW_NADAR_SNS(hex_str):
+    # Legacy hex-string entry point
+    return decode_frame(memoryview(bytes.fromhex(hex_str)))
@@ -1,5 +1,9 @@
 import struct
-from datetime import datetime, timezone
+
+from netra_backend.decoding.frame import EPOCH_S
+
+COLUMN_TYPES = {'Epoch_Time_Human': EPOCH_S}
+
 
 def HEALTH_ADCS_RAW_STAR_TRKR_MEAS(hex_str):
     # 1. Skip metadata header (26 bytes)
@@ -56,9 +60,6 @@ def HEALTH_ADCS_RAW_STAR_TRKR_MEAS(hex_str):
             fixed_fields = bytes.fromhex(seg_hex[0 : 20])
             op_status, epoch_ti, num_detected, _, num_identified, mode_val = struct.unpack('<BI B H B B', fixed_fields)
             
-            # Convert epoch integer to human-readable format (UTC)
-            timestamp_human = datetime.fromtimestamp(epoch_ti, timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
-            
             # Star Tracker identification mode (Table 49)
             mode_enum = {
                 0: "ADCS_STAR_MODE_TRACKING",
@@ -71,7 +72,7 @@ def HEALTH_ADCS_RAW_STAR_TRKR_MEAS(hex_str):
                 'Queue_ID': queue_id,
                 'Number of Instances': count,
                 'Operation_Status': op_status,
-                'Epoch_Time_Human': timestamp_human,
+                'Epoch_Time_Human': epoch_ti,
                 'Num_Stars_Detected': num_detected,
                 'Num_Star_Identified': num_identified,
                 'Identification_Mode': identification_mode,
@@ -1,5 +1,9 @@
 import struct
-from datetime import datetime, timezone
+
+from netra_backend.decoding.frame import EPOCH_S
+
+COLUMN_TYPES = {'Epoch_Time_Human': EPOCH_S}
+
 
 def HEALTH_ADCS_RW_SPEED_CMD(hex_str):
     # 1. Skip standard metadata header (26 bytes)
@@ -58,7 +62,7 @@ def HEALTH_ADCS_RW_SPEED_CMD(hex_str):
                 'Queue_ID': queue_id,
                 'Number of Instances': count,
                 'Operation_Status': op_status,
-                'Epoch_Time_Human': datetime.fromtimestamp(epoch_ti, timezone.utc).strftime('%Y-%m-%d %H:%M:%S'),
+                'Epoch_Time_Human': epoch_ti,
                 'Number_of_reaction_wheel': n_wheels
             }
             
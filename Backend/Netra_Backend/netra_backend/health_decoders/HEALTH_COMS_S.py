@@ -1,40 +1,44 @@
 import struct
-from datetime import datetime
+
+from netra_backend.decoding.frame import EPOCH_S
+
+COLUMN_TYPES = {'Time_Stamp_Human': EPOCH_S}
 
 # ---------------------------------------------------------
-# Helpers to read from a hex string at *byte* offsets
+# Helpers to read from a raw frame (bytes / memoryview) at *byte* offsets
 # ---------------------------------------------------------
 
-def _read_u8_at(hex_str, byte_offset):
-    i = byte_offset * 2
-    return int(hex_str[i:i+2], 16)
+_U8  = struct.Struct('<B')
+_U16 = struct.Struct('<H')
+_U32 = struct.Struct('<I')
+_U64 = struct.Struct('<Q')
+_I32 = struct.Struct('<i')
+_F64 = struct.Struct('<d')
 
-def _read_u16_at(hex_str, byte_offset):
-    i = byte_offset * 2
-    return struct.unpack('<H', bytes.fromhex(hex_str[i:i+4]))[0]
+def _read_u8_at(buf, byte_offset):
+    return _U8.unpack_from(buf, byte_offset)[0]
 
-def _read_u32_at(hex_str, byte_offset):
-    i = byte_offset * 2
-    return struct.unpack('<I', bytes.fromhex(hex_str[i:i+8]))[0]
+def _read_u16_at(buf, byte_offset):
+    return _U16.unpack_from(buf, byte_offset)[0]
 
-def _read_u64_at(hex_str, byte_offset):
-    i = byte_offset * 2
-    return struct.unpack('<Q', bytes.fromhex(hex_str[i:i+16]))[0]
+def _read_u32_at(buf, byte_offset):
+    return _U32.unpack_from(buf, byte_offset)[0]
 
-def _read_i32_at(hex_str, byte_offset):
-    i = byte_offset * 2
-    return struct.unpack('<i', bytes.fromhex(hex_str[i:i+8]))[0]
+def _read_u64_at(buf, byte_offset):
+    return _U64.unpack_from(buf, byte_offset)[0]
 
-def _read_f64_at(hex_str, byte_offset):
-    i = byte_offset * 2
-    return struct.unpack('<d', bytes.fromhex(hex_str[i:i+16]))[0]
+def _read_i32_at(buf, byte_offset):
+    return _I32.unpack_from(buf, byte_offset)[0]
+
+def _read_f64_at(buf, byte_offset):
+    return _F64.unpack_from(buf, byte_offset)[0]
 
 
 # ---------------------------------------------------------
 # SBAND TM PROP (Queue ID = 0) parser
 # ---------------------------------------------------------
 
-def HEALTH_COMMS_SBAND_TM_PROP_QUEUE0(hex_str):
+def decode_frame(frame):
     """
     Parse COMMS SBAND_TM_PROP_QUEUE_ID (Queue ID = 0) payload.
 
@@ -113,14 +117,11 @@ def HEALTH_COMMS_SBAND_TM_PROP_QUEUE0(hex_str):
     header_skip_len = 29  # bytes
 
     # Submodule / Queue ID (same absolute positions as your other decoders)
-    submodule_id = int(hex_str[50:52], 16)
-    queue_id     = int(hex_str[52:54], 16)
+    submodule_id = _read_u8_at(frame, 25)
+    queue_id     = _read_u8_at(frame, 26)
 
     # Number of instances (Uint16) at bytes 27–28
-    count_offset_hex = (header_skip_len - 2) * 2  # 27 * 2 = 54
-    instance_count = struct.unpack(
-        '<H', bytes.fromhex(hex_str[count_offset_hex:count_offset_hex + 4])
-    )[0]
+    instance_count = _read_u16_at(frame, header_skip_len - 2)
 
     if instance_count == 0:
         print("[WARN] SBAND_TM_PROP: instance count is zero. Skipping parsing.")
@@ -128,9 +129,8 @@ def HEALTH_COMMS_SBAND_TM_PROP_QUEUE0(hex_str):
 
     # Payload (instances) start at byte 29
     payload_start_byte = 25 + 4  # 25: submodule; +1 queue; +2 instances; +1 -> 29
-    payload_start_hex  = payload_start_byte * 2
 
-    total_payload_bytes = (len(hex_str) - payload_start_hex) // 2
+    total_payload_bytes = len(frame) - payload_start_byte
     bytes_per_instance = total_payload_bytes // instance_count
 
     if bytes_per_instance == 0:
@@ -191,18 +191,18 @@ def HEALTH_COMMS_SBAND_TM_PROP_QUEUE0(hex_str):
     segments = []
 
     for idx in range(instance_count):
-        inst_start_hex = payload_start_hex + idx * bytes_per_instance * 2
-        inst_end_hex   = inst_start_hex + bytes_per_instance * 2
+        inst_start = payload_start_byte + idx * bytes_per_instance
+        inst_end   = inst_start + bytes_per_instance
 
-        if inst_end_hex > len(hex_str):
+        if inst_end > len(frame):
             print(
                 f"[WARN] SBAND_TM_PROP: instance {idx} truncated "
-                f"(expected up to index {inst_end_hex}, len={len(hex_str)}). Stopping."
+                f"(expected up to byte {inst_end}, len={len(frame)}). Stopping."
             )
             break
 
-        # All byte offsets below are relative to this instance
-        inst_hex = hex_str[inst_start_hex:inst_end_hex]
+        # All byte offsets below are relative to this instance (zero-copy view)
+        inst = frame[inst_start:inst_end]
 
         seg = {
             "Submodule_ID":       submodule_id,
@@ -212,31 +212,28 @@ def HEALTH_COMMS_SBAND_TM_PROP_QUEUE0(hex_str):
         }
 
         # 1) time_stamp (uint64)
-        ts_raw = _read_u64_at(inst_hex, 0)
+        ts_raw = _read_u64_at(inst, 0)
         seg["Time_Stamp_Raw"] = ts_raw
-        try:
-            seg["Time_Stamp_Human"] = datetime.utcfromtimestamp(ts_raw) \
-                                          .strftime("%Y-%m-%d %H:%M:%S")
-        except (OverflowError, OSError, ValueError):
-            seg["Time_Stamp_Human"] = None
+        # Converted to a timestamp downstream (see COLUMN_TYPES)
+        seg["Time_Stamp_Human"] = ts_raw
 
         # 2) s_sband_cmn_tm (temps & voltages)
-        seg["Temp_MCU"]   = _read_i32_at(inst_hex, CMN_TM_OFFSET + 0)
-        seg["Temp_FPGA"]  = _read_i32_at(inst_hex, CMN_TM_OFFSET + 4)
-        seg["Temp_XCVR"]  = _read_i32_at(inst_hex, CMN_TM_OFFSET + 8)
+        seg["Temp_MCU"]   = _read_i32_at(inst, CMN_TM_OFFSET + 0)
+        seg["Temp_FPGA"]  = _read_i32_at(inst, CMN_TM_OFFSET + 4)
+        seg["Temp_XCVR"]  = _read_i32_at(inst, CMN_TM_OFFSET + 8)
 
-        seg["Volt_VINT"]  = _read_f64_at(inst_hex, CMN_TM_OFFSET + 12)
-        seg["Volt_VAUX"]  = _read_f64_at(inst_hex, CMN_TM_OFFSET + 20)
-        seg["Volt_VBRAM"] = _read_f64_at(inst_hex, CMN_TM_OFFSET + 28)
-        seg["Volt_VPINT"] = _read_f64_at(inst_hex, CMN_TM_OFFSET + 36)
-        seg["Volt_VPAUX"] = _read_f64_at(inst_hex, CMN_TM_OFFSET + 44)
-        seg["Volt_VPDRO"] = _read_f64_at(inst_hex, CMN_TM_OFFSET + 52)
+        seg["Volt_VINT"]  = _read_f64_at(inst, CMN_TM_OFFSET + 12)
+        seg["Volt_VAUX"]  = _read_f64_at(inst, CMN_TM_OFFSET + 20)
+        seg["Volt_VBRAM"] = _read_f64_at(inst, CMN_TM_OFFSET + 28)
+        seg["Volt_VPINT"] = _read_f64_at(inst, CMN_TM_OFFSET + 36)
+        seg["Volt_VPAUX"] = _read_f64_at(inst, CMN_TM_OFFSET + 44)
+        seg["Volt_VPDRO"] = _read_f64_at(inst, CMN_TM_OFFSET + 52)
 
         # 3) Middle (rx_tm[2], tx_tm, xmt_tm[2] & some reserved) as raw hex
         #    This is everything between the end of cmn_tm and the start of the tail.
         middle_start_byte = MIN_HEAD_BYTES
         middle_end_byte   = MIN_HEAD_BYTES + unknown_mid_bytes
-        seg["Middle_Block_Raw_Hex"] = inst_hex[middle_start_byte*2:middle_end_byte*2]
+        seg["Middle_Block_Raw_Hex"] = inst[middle_start_byte:middle_end_byte].hex()
 
         # 4) Tail fields (if we have enough bytes)
         if bytes_per_instance >= MIN_HEAD_BYTES + TAIL_BYTES:
@@ -244,60 +241,65 @@ def HEALTH_COMMS_SBAND_TM_PROP_QUEUE0(hex_str):
             b = tail_start_byte  # walker in bytes
 
             # uint32 Reserved
-            seg["Tail_Reserved0"] = _read_u32_at(inst_hex, b); b += 4
+            seg["Tail_Reserved0"] = _read_u32_at(inst, b); b += 4
 
-            seg["On_Count"]         = _read_u8_at(inst_hex, b); b += 1
-            seg["Off_Count"]        = _read_u8_at(inst_hex, b); b += 1
-            seg["SBand_Reset_Count"] = _read_u16_at(inst_hex, b); b += 2
-            seg["State"]            = _read_u8_at(inst_hex, b); b += 1
-            seg["Beacon_Tx_Count"]  = _read_u16_at(inst_hex, b); b += 2
+            seg["On_Count"]         = _read_u8_at(inst, b); b += 1
+            seg["Off_Count"]        = _read_u8_at(inst, b); b += 1
+            seg["SBand_Reset_Count"] = _read_u16_at(inst, b); b += 2
+            seg["State"]            = _read_u8_at(inst, b); b += 1
+            seg["Beacon_Tx_Count"]  = _read_u16_at(inst, b); b += 2
 
             # two reserved u8
-            seg["Tail_Reserved1"]   = _read_u8_at(inst_hex, b); b += 1
-            seg["Tail_Reserved2"]   = _read_u8_at(inst_hex, b); b += 1
+            seg["Tail_Reserved1"]   = _read_u8_at(inst, b); b += 1
+            seg["Tail_Reserved2"]   = _read_u8_at(inst, b); b += 1
 
             # rx_port_value (bit0 of this byte)
-            rx_port_raw             = _read_u8_at(inst_hex, b); b += 1
+            rx_port_raw             = _read_u8_at(inst, b); b += 1
             seg["RX_Port_Raw"]      = rx_port_raw
             seg["RX_Port_Value"]    = bool(rx_port_raw & 0x01)
 
             # 9 * uint16 Reserved
             reserved_16 = []
             for _ in range(9):
-                reserved_16.append(_read_u16_at(inst_hex, b))
+                reserved_16.append(_read_u16_at(inst, b))
                 b += 2
             seg["Tail_Reserved16_Block1"] = reserved_16
 
             # uint32 Reserved
-            seg["Tail_Reserved3"] = _read_u32_at(inst_hex, b); b += 4
+            seg["Tail_Reserved3"] = _read_u32_at(inst, b); b += 4
 
             # 3 * uint16 Reserved
             reserved_16_2 = []
             for _ in range(3):
-                reserved_16_2.append(_read_u16_at(inst_hex, b))
+                reserved_16_2.append(_read_u16_at(inst, b))
                 b += 2
             seg["Tail_Reserved16_Block2"] = reserved_16_2
 
             # sband_eps_mode (uint8)
-            seg["SBand_EPS_Mode"] = _read_u8_at(inst_hex, b); b += 1
+            seg["SBand_EPS_Mode"] = _read_u8_at(inst, b); b += 1
 
             # uint16 Reserved
-            seg["Tail_Reserved4"] = _read_u16_at(inst_hex, b); b += 2
+            seg["Tail_Reserved4"] = _read_u16_at(inst, b); b += 2
 
             # uint32 Reserved
-            seg["Tail_Reserved5"] = _read_u32_at(inst_hex, b); b += 4
+            seg["Tail_Reserved5"] = _read_u32_at(inst, b); b += 4
 
             # 14 * uint8 Reserved
             reserved_8_block = []
             for _ in range(14):
-                reserved_8_block.append(_read_u8_at(inst_hex, b))
+                reserved_8_block.append(_read_u8_at(inst, b))
                 b += 1
             seg["Tail_Reserved8_Block"] = reserved_8_block
 
             # final 2 * uint16 Reserved
-            seg["Tail_Reserved6"] = _read_u16_at(inst_hex, b); b += 2
-            seg["Tail_Reserved7"] = _read_u16_at(inst_hex, b); b += 2
+            seg["Tail_Reserved6"] = _read_u16_at(inst, b); b += 2
+            seg["Tail_Reserved7"] = _read_u16_at(inst, b); b += 2
 
         segments.append(seg)
 
     return segments
+
+
+def HEALTH_COMMS_SBAND_TM_PROP_QUEUE0(hex_str):
+    # Legacy hex-string entry point
+    return decode_frame(memoryview(bytes.fromhex(hex_str)))
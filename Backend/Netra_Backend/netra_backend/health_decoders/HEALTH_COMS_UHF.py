@@ -1,5 +1,8 @@
 import struct
-from datetime import datetime
+
+from netra_backend.decoding.frame import EPOCH_S
+
+COLUMN_TYPES = {'Time_Stamp_Human': EPOCH_S}
 
 # ---------------------------------------------------------
 # Helpers to read from a hex string at *byte* offsets
@@ -132,11 +135,8 @@ def HEALTH_COMMS_UHF_TM_PROP_QUEUE0(hex_str):
         # 0–7: time_stamp (uint64)
         ts_raw = _read_u64_at(inst_hex, 0)
         seg["Time_Stamp_Raw"] = ts_raw
-        try:
-            seg["Time_Stamp_Human"] = datetime.utcfromtimestamp(ts_raw) \
-                                          .strftime("%Y-%m-%d %H:%M:%S")
-        except (OverflowError, OSError, ValueError):
-            seg["Time_Stamp_Human"] = None
+        # Converted to a timestamp downstream (see COLUMN_TYPES)
+        seg["Time_Stamp_Human"] = ts_raw
 
         # 8: on_count (uint8)
         seg["On_Count"] = _read_u8_at(inst_hex, 8)
@@ -1,13 +1,10 @@
 import re
 import struct
-from datetime import datetime
 from typing import Dict, List, Any, Tuple
 
-try:
-    from zoneinfo import ZoneInfo
-    IST = ZoneInfo("Asia/Kolkata")
-except Exception:
-    IST = None
+from netra_backend.decoding.frame import EPOCH_S
+
+COLUMN_TYPES = {'Epoch_Time_Human': EPOCH_S, 'Timestamp': EPOCH_S}
 
 
 DECODE_SOLAR_PANEL_COUNT = 9
@@ -221,45 +218,6 @@ def _u32raw(buf: bytes, pos: int, where="u32raw") -> Tuple[bytes, int]:
     _need(buf, pos, 4, where)
     return buf[pos:pos+4], pos + 4
 
-def _fmt_ist(ts: int) -> str:
-    """
-    Format timestamp to IST string. Handles timestamps in seconds, milliseconds, or microseconds.
-    Falls back to raw value string if conversion fails.
-    """
-    # Validate and convert timestamp
-    # Unix timestamps in seconds should be reasonable (e.g., between 2000-2100)
-    # 946684800 = Jan 1, 2000
-    # 4102444800 = Jan 1, 2100
-    
-    original_ts = ts
-    
-    # If timestamp is too large, it's likely in milliseconds or microseconds
-    if ts > 4102444800:
-        # Try milliseconds (divide by 1000)
-        if ts > 4102444800000:
-            # Likely microseconds (divide by 1000000)
-            ts = ts // 1000000
-        else:
-            # Likely milliseconds (divide by 1000)
-            ts = ts // 1000
-    
-    # If still unreasonable, return raw value
-    if ts < 0 or ts > 4102444800:
-        return f"INVALID_TS({original_ts})"
-    
-    try:
-        if IST is not None:
-            dt = datetime.fromtimestamp(ts, tz=IST)
-        else:
-            dt = datetime.fromtimestamp(ts)
-        s = dt.strftime("%B %d, %Y %I:%M:%S %p")
-        s = s.replace(" 0", " ")
-        return s
-    except (OSError, ValueError, OverflowError) as e:
-        # If conversion still fails, return raw value
-        return f"INVALID_TS({original_ts})"
-
-
 # ----------------------------
 # Main decoder (named columns)
 # ----------------------------
@@ -365,12 +323,9 @@ def HEALTH_EPS(hex_str: str) -> List[Dict[str, Any]]:
                 norm_ts //= 1000
 
         seg["Epoch_Time"] = int(norm_ts)
-        try:
-            seg["Epoch_Time_Human"] = datetime.utcfromtimestamp(norm_ts).strftime('%Y-%m-%d %H:%M:%S')
-        except Exception:
-            seg["Epoch_Time_Human"] = None
-
-        seg["Timestamp"] = _fmt_ist(ts)
+        # Converted to timestamps downstream (see COLUMN_TYPES)
+        seg["Epoch_Time_Human"] = int(norm_ts)
+        seg["Timestamp"] = int(norm_ts)
 
         pg_last, pos = _u32le(buf, pos, "Power Generated Last Orbit")
         seg["Power_Generated_Last_Orbit_Wh"] = pg_last / 100.0
@@ -1,5 +1,8 @@
 import struct
-from datetime import datetime
+
+from netra_backend.decoding.frame import EPOCH_S
+
+COLUMN_TYPES = {'Epoch_Time_Human': EPOCH_S}
 
 # ---------------------------------------------------------
 # Table 9 – EPS sub-system enum ID (subset, plus a few more for completeness)
@@ -113,12 +116,8 @@ def HEALTH_EPS_GET_SES_TEMP_HM(hex_str):
         # 4–11: Epoch Time (Uint64_t)
         epoch_raw, pos = _read_u64(hex_str, pos)
         seg["Epoch_Time_Raw"] = epoch_raw
-        try:
-            seg["Epoch_Time_Human"] = datetime.utcfromtimestamp(epoch_raw).strftime(
-                "%Y-%m-%d %H:%M:%S"
-            )
-        except (OverflowError, OSError, ValueError):
-            seg["Epoch_Time_Human"] = None
+        # Converted to a timestamp downstream (see COLUMN_TYPES)
+        seg["Epoch_Time_Human"] = epoch_raw
 
         # 12: SES-A Sub-system ID
         ses_a_id, pos = _read_u8(hex_str, pos)
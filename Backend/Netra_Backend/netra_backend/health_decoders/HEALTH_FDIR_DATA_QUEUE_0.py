@@ -1,5 +1,8 @@
 import struct
-from datetime import datetime
+
+from netra_backend.decoding.frame import EPOCH_MS
+
+COLUMN_TYPES = {'epoch_time_utc': EPOCH_MS}
 
 # ---------------- ENUM TABLES ---------------- #
 
@@ -179,11 +182,6 @@ def HEALTH_FDIR_DATA_QUEUE_0(hex_str: str):
         epoch_time_in_ms = struct.unpack_from('<Q', seg_bytes, offset)[0]
         offset += 8
 
-        # human-readable UTC time
-        epoch_time_utc = datetime.utcfromtimestamp(epoch_time_in_ms / 1000.0).strftime(
-            '%Y-%m-%d %H:%M:%S'
-        )
-
         segments.append({
             'Submodule_ID':        submodule_id,
             'Queue_ID':            queue_id,
@@ -192,7 +190,7 @@ def HEALTH_FDIR_DATA_QUEUE_0(hex_str: str):
 
             'write_index':         write_index,
             'epoch_time_in_ms':    epoch_time_in_ms,
-            'epoch_time_utc':      epoch_time_utc,
+            'epoch_time_utc':      epoch_time_in_ms,   # see COLUMN_TYPES
 
             # full log entries array
             'entries':             entries,
@@ -1,5 +1,12 @@
+import logging
 import struct
-from datetime import datetime
+
+from netra_backend.decoding.columnar import enum_column, instance_array, np
+from netra_backend.decoding.frame import EPOCH_MS
+
+logger = logging.getLogger(__name__)
+
+COLUMN_TYPES = {'epch_tm_human': EPOCH_MS}
 
 # ---------------- ENUM TABLES ---------------- #
 
@@ -158,8 +165,29 @@ RCVY_ACT_ENUM = {
 
 MAX_AHW_TYPE = 16  # from spec
 
+# tc_len (u16), Submodule ID (u8), Queue ID (u8), Number of instances (u16) from byte 23
+_QM_HEADER = struct.Struct('<HBBH')
+_DATA_START = 30
 
-def HEALTH_FDIR_DATA_QUEUE_1(hex_str: str):
+# s_fdir_sns_hm_info, 28 bytes
+_SEGMENT = struct.Struct(f'<BBHHBBI{MAX_AHW_TYPE}B')
+
+# Same record as a numpy structured dtype (columnar decode mode)
+_SEGMENT_DTYPE = None if np is None else np.dtype([
+    ('sns_err_id', 'u1'),
+    ('io_map_sns_err_id', 'u1'),
+    ('total_err_cnt', '<u2'),
+    ('total_rcvy_cnt', '<u2'),
+    ('sns_intf_id', 'u1'),
+    ('rcvy_act', 'u1'),
+    ('epch_tm_in_ms', '<u4'),
+    ('err_cnt_sns_tpe', 'u1', (MAX_AHW_TYPE,)),
+])
+
+_HW_TYPE_STRS = [AHW_TYPE_ENUM.get(hw_idx, "UNKNOWN") for hw_idx in range(MAX_AHW_TYPE)]
+
+
+def decode_frame(frame):
     """
     Parse TM Get Health – FDIR_DATA_QUEUE_ID (QUEUE_ID = 1).
 
@@ -173,80 +201,39 @@ def HEALTH_FDIR_DATA_QUEUE_1(hex_str: str):
         epch_tm_in_ms (4)
         err_cnt_sns_tpe[16] (16 x uint8)
 
-    Total = 28 bytes => 56 hex chars per instance.
+    Total = 28 bytes per instance.
     """
 
-    header_skip_len = 29  # metadata header in bytes, same as other health queues
-
-    # TC length (not really used except for sanity)
-    tc_len = struct.unpack('<H', bytes.fromhex(hex_str[46:50]))[0]
+    # TC length (not really used except for sanity), Submodule ID and Queue ID
+    # from standard positions, then the number of instances
+    tc_len, submodule_id, queue_id, count = _QM_HEADER.unpack_from(frame, 23)
     tm_len = tc_len * 2 - 8  # kept for consistency with your other functions
 
-    # Submodule ID and Queue ID from standard positions
-    submodule_id = int(hex_str[50:52], 16)
-    queue_id     = int(hex_str[52:54], 16)
-
-    # Number of instances (at (header_skip_len - 2) bytes)
-    count_offset = (header_skip_len - 2) * 2
-    count = struct.unpack('<H', bytes.fromhex(hex_str[count_offset:count_offset + 4]))[0]
-
     if count == 0:
-        print("[WARN] FDIR (Queue 1) instance count is zero. Skipping parsing.")
+        logger.debug("FDIR (Queue 1) instance count is zero. Skipping parsing.")
         return []
 
     segments = []
 
-    # Each instance of s_fdir_sns_hm_info is 28 bytes = 56 hex chars
-    segment_len = 56
-
-    # Payload starts at hex_str[60:], same pattern as your ADCS function
-    data_payload = hex_str[60:60 + count * segment_len]
-
-    for idx in range(count):
-        seg = data_payload[idx * segment_len:(idx + 1) * segment_len]
-        if len(seg) < segment_len:
-            continue
-
-        offset = 0
-
-        # uint8_t sns_err_id
-        sns_err_id = int(seg[offset:offset + 2], 16)
-        offset += 2
-
-        # uint8_t io_map_sns_err_id
-        io_map_sns_err_id = int(seg[offset:offset + 2], 16)
-        offset += 2
-
-        # uint16_t total_err_cnt
-        total_err_cnt = struct.unpack('<H', bytes.fromhex(seg[offset:offset + 4]))[0]
-        offset += 4
-
-        # uint16_t total_rcvy_cnt
-        total_rcvy_cnt = struct.unpack('<H', bytes.fromhex(seg[offset:offset + 4]))[0]
-        offset += 4
-
-        # uint8_t sns_intf_id
-        sns_intf_id = int(seg[offset:offset + 2], 16)
-        offset += 2
-
-        # uint8_t rcvy_act
-        rcvy_act = int(seg[offset:offset + 2], 16)
-        offset += 2
-
-        # uint32_t epch_tm_in_ms
-        epch_tm_in_ms = struct.unpack('<I', bytes.fromhex(seg[offset:offset + 8]))[0]
-        offset += 8
-
-        # human-readable timestamp
-        epch_tm_human = datetime.utcfromtimestamp(epch_tm_in_ms / 1000.0).strftime(
-            '%Y-%m-%d %H:%M:%S'
-        )
+    # Payload starts at byte 30, same pattern as your ADCS function;
+    # only complete 28-byte instances are decoded
+    available = max(0, len(frame) - _DATA_START) // _SEGMENT.size
+    end = _DATA_START + min(count, available) * _SEGMENT.size
+
+    for fields in _SEGMENT.iter_unpack(frame[_DATA_START:end]):
+        (
+            sns_err_id,          # uint8_t
+            io_map_sns_err_id,   # uint8_t
+            total_err_cnt,       # uint16_t
+            total_rcvy_cnt,      # uint16_t
+            sns_intf_id,         # uint8_t
+            rcvy_act,            # uint8_t
+            epch_tm_in_ms,       # uint32_t
+        ) = fields[:7]
 
         # uint8_t err_cnt_sns_tpe[MAX_AHW_TYPE]
         err_cnt_sns_tpe = []
-        for hw_idx in range(MAX_AHW_TYPE):
-            val = int(seg[offset:offset + 2], 16)
-            offset += 2
+        for hw_idx, val in enumerate(fields[7:]):
             err_cnt_sns_tpe.append({
                 "HW_Type_Index": hw_idx,
                 "HW_Type_Str": AHW_TYPE_ENUM.get(hw_idx, "UNKNOWN"),
@@ -274,10 +261,67 @@ def HEALTH_FDIR_DATA_QUEUE_1(hex_str: str):
             'rcvy_act_str':           RCVY_ACT_ENUM.get(rcvy_act, "Reserved"),
 
             'epch_tm_in_ms':          epch_tm_in_ms,
-            'epch_tm_human':          epch_tm_human,
+            'epch_tm_human':          epch_tm_in_ms,   # see COLUMN_TYPES
 
             # list of 16 per-HW-type error counts
             'err_cnt_sns_tpe':        err_cnt_sns_tpe,
         })
 
     return segments
+
+
+if np is not None:
+    def decode_columns(frame):
+        """
+        Columnar variant of decode_frame: same columns, one array per column.
+        """
+        tc_len, submodule_id, queue_id, count = _QM_HEADER.unpack_from(frame, 23)
+        if count == 0:
+            return {}
+
+        rec = instance_array(frame, _SEGMENT_DTYPE, _DATA_START, count)
+        n = len(rec)
+        if n == 0:
+            return {}
+
+        epch_tm_in_ms = rec['epch_tm_in_ms']
+
+        # Nested per-HW-type counts stay a list of dicts per instance
+        err_cnt_sns_tpe = [
+            [
+                {"HW_Type_Index": hw_idx, "HW_Type_Str": _HW_TYPE_STRS[hw_idx], "Error_Count": val}
+                for hw_idx, val in enumerate(counts)
+            ]
+            for counts in rec['err_cnt_sns_tpe'].tolist()
+        ]
+
+        return {
+            'Submodule_ID':           [submodule_id] * n,
+            'Queue_ID':               [queue_id] * n,
+            'Number of Instances':    [count] * n,
+
+            'sns_err_id':             rec['sns_err_id'],
+            'sns_err_id_str':         enum_column(rec['sns_err_id'], SNS_ERR_ID_ENUM),
+
+            'io_map_sns_err_id':      rec['io_map_sns_err_id'],
+            'io_map_sns_err_id_str':  enum_column(rec['io_map_sns_err_id'], SNS_ERR_ID_ENUM),
+
+            'total_err_cnt':          rec['total_err_cnt'],
+            'total_rcvy_cnt':         rec['total_rcvy_cnt'],
+
+            'sns_intf_id':            rec['sns_intf_id'],
+            'sns_intf_id_str':        enum_column(rec['sns_intf_id'], IO_INST_ENUM),
+
+            'rcvy_act':               rec['rcvy_act'],
+            'rcvy_act_str':           enum_column(rec['rcvy_act'], RCVY_ACT_ENUM, "Reserved"),
+
+            'epch_tm_in_ms':          epch_tm_in_ms,
+            'epch_tm_human':          epch_tm_in_ms,
+
+            'err_cnt_sns_tpe':        err_cnt_sns_tpe,
+        }
+
+
+def HEALTH_FDIR_DATA_QUEUE_1(hex_str: str):
+    # Legacy hex-string entry point
+    return decode_frame(memoryview(bytes.fromhex(hex_str)))
@@ -1,7 +1,36 @@
+import logging
 import struct
-from datetime import datetime
+from datetime import datetime, timezone
 
-def HEALTH_GNSS_DATA(hex_str: str):
+from netra_backend.decoding.columnar import instance_array, np
+from netra_backend.decoding.frame import TIMESTAMP
+
+logger = logging.getLogger(__name__)
+
+COLUMN_TYPES = {'GNSS_Time_UTC': TIMESTAMP}
+
+# tc_len (u16), Submodule ID (u8), Queue ID (u8), Number of instances (u16) from byte 23
+_QM_HEADER = struct.Struct('<HBBH')
+_DATA_START = 30
+
+# One ahal_gps_health_info is 32 bytes
+_SEGMENT = struct.Struct('<HBBBBH8B4f')
+
+_STATUS_FIELDS = (
+    'reserv', 'clk_model_recv_sts', 'utc_known_recv_sts', 'pos_sts',
+    'lna_fail_recv_sts', 'cpu_overload_recv_sts', 'antna_gain_state', 'compo_hw_fail_sts',
+)
+_FLOAT_FIELDS = ('antenna_curr', 'antenna_volt', 'receiver_volt', 'temperature')
+
+# Same record as a numpy structured dtype (columnar decode mode)
+_SEGMENT_DTYPE = None if np is None else np.dtype(
+    [('Year', '<u2'), ('Month', 'u1'), ('Day', 'u1'), ('Hour', 'u1'), ('Minute', 'u1'), ('Millisec', '<u2')]
+    + [(name, 'u1') for name in _STATUS_FIELDS]
+    + [(name, '<f4') for name in _FLOAT_FIELDS]
+)
+
+
+def decode_frame(frame):
     """
     Parse TM Get Health – GNSS_DATA_QUEUE_ID (QueueID = 0).
 
@@ -22,52 +51,34 @@ def HEALTH_GNSS_DATA(hex_str: str):
         float temperature;
     """
 
-    header_skip_len = 29  # metadata header in bytes (same convention as your other functions)
-
-    # TC length (for completeness)
-    tc_len = struct.unpack('<H', bytes.fromhex(hex_str[46:50]))[0]
+    # TC length (for completeness) at bytes 23-24, then Submodule ID & Queue ID
+    # (standard positions in your other parsers) and the UINT16 instance count
+    tc_len, submodule_id, queue_id, count = _QM_HEADER.unpack_from(frame, 23)
     tm_len = tc_len * 2 - 8  # not used further, but kept for consistency
 
-    # Submodule ID & Queue ID (standard positions in your other parsers)
-    submodule_id = int(hex_str[50:52], 16)
-    queue_id     = int(hex_str[52:54], 16)
-
-    # Number of instances: UINT16 at (header_skip_len - 2) bytes
-    count_offset = (header_skip_len - 2) * 2
-    count = struct.unpack('<H', bytes.fromhex(hex_str[count_offset:count_offset + 4]))[0]
-
     if count == 0:
-        print("[WARN] GNSS instance count is zero. Skipping parsing.")
+        logger.debug("GNSS instance count is zero. Skipping parsing.")
         return []
 
     segments = []
 
-    # One ahal_gps_health_info is 32 bytes => 64 hex chars
-    segment_len = 64  # in hex characters
-
-    # Payload starts at hex_str[60:], same pattern as your other queue functions
-    data_payload = hex_str[60:60 + count * segment_len]
-
-    for idx in range(count):
-        seg = data_payload[idx * segment_len:(idx + 1) * segment_len]
-        if len(seg) < segment_len:
-            continue
-
-        offset = 0
-
-        # -------- gps_time_stamp (8 bytes = 16 hex) --------
-        year      = struct.unpack('<H', bytes.fromhex(seg[offset:offset + 4]))[0]
-        offset   += 4
-
-        month     = int(seg[offset:offset + 2], 16); offset += 2
-        day       = int(seg[offset:offset + 2], 16); offset += 2
-        hour      = int(seg[offset:offset + 2], 16); offset += 2
-        minute    = int(seg[offset:offset + 2], 16); offset += 2
-
-        millisec  = struct.unpack('<H', bytes.fromhex(seg[offset:offset + 4]))[0]
-        offset   += 4
-
-        # Human-readable UTC time (assume seconds = 0, millisec -> microseconds)
+    # Payload starts at byte 30, same pattern as your other queue functions;
+    # only complete 32-byte records are decoded
+    available = max(0, len(frame) - _DATA_START) // _SEGMENT.size
+    end = _DATA_START + min(count, available) * _SEGMENT.size
+
+    for idx, fields in enumerate(_SEGMENT.iter_unpack(frame[_DATA_START:end])):
+        (
+            # -------- gps_time_stamp (8 bytes) --------
+            year, month, day, hour, minute, millisec,
+            # -------- ahal_gps_rx_sts_hm (8 x uint8) --------
+            reserv, clk_model_recv_sts, utc_known_recv_sts, pos_sts,
+            lna_fail_recv_sts, cpu_overload_recv_sts, antna_gain_state, compo_hw_fail_sts,
+            # -------- floats (4 x float = 16 bytes) --------
+            antenna_curr, antenna_volt, receiver_volt, temperature,
+        ) = fields
+
+        # UTC time (assume seconds = 0, millisec -> microseconds); None when invalid
         try:
             gnss_time = datetime(
                 year=year,
@@ -77,40 +88,16 @@ def HEALTH_GNSS_DATA(hex_str: str):
                 minute=minute,
                 second=0,
                 microsecond=millisec * 1000,
+                tzinfo=timezone.utc,
             )
-            gnss_time_str = gnss_time.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]  # keep millis
         except ValueError:
             gnss_time = None
-            gnss_time_str = "INVALID_DATETIME"
-
-        # -------- ahal_gps_rx_sts_hm (8 x uint8 = 16 hex) --------
-        reserv               = int(seg[offset:offset + 2], 16); offset += 2
-        clk_model_recv_sts   = int(seg[offset:offset + 2], 16); offset += 2
-        utc_known_recv_sts   = int(seg[offset:offset + 2], 16); offset += 2
-        pos_sts              = int(seg[offset:offset + 2], 16); offset += 2
-        lna_fail_recv_sts    = int(seg[offset:offset + 2], 16); offset += 2
-        cpu_overload_recv_sts = int(seg[offset:offset + 2], 16); offset += 2
-        antna_gain_state     = int(seg[offset:offset + 2], 16); offset += 2
-        compo_hw_fail_sts    = int(seg[offset:offset + 2], 16); offset += 2
 
         # Optional human-readable interpretations (0 = OK, 1 = problem, per your text)
         clk_model_recv_sts_str = "Clock model status VALID"   if clk_model_recv_sts == 0 else "Clock model status INVALID"
         utc_known_recv_sts_str = "UTC time VALID"             if utc_known_recv_sts == 0 else "UTC time INVALID"
         pos_sts_str            = "GNSS position VALID"        if pos_sts == 0 else "GNSS position INVALID"
 
-        # -------- floats (4 x float = 16 bytes = 32 hex) --------
-        antenna_curr   = struct.unpack('<f', bytes.fromhex(seg[offset:offset + 8]))[0]
-        offset        += 8
-
-        antenna_volt   = struct.unpack('<f', bytes.fromhex(seg[offset:offset + 8]))[0]
-        offset        += 8
-
-        receiver_volt  = struct.unpack('<f', bytes.fromhex(seg[offset:offset + 8]))[0]
-        offset        += 8
-
-        temperature    = struct.unpack('<f', bytes.fromhex(seg[offset:offset + 8]))[0]
-        offset        += 8
-
         segments.append({
             # TM framing
             'Submodule_ID':        submodule_id,
@@ -125,7 +112,7 @@ def HEALTH_GNSS_DATA(hex_str: str):
             'Hour':        hour,
             'Minute':      minute,
             'Millisec':    millisec,
-            'GNSS_Time_UTC': gnss_time_str,
+            'GNSS_Time_UTC': gnss_time,
 
             # Receiver status
             'reserv':                reserv,
@@ -148,3 +135,92 @@ def HEALTH_GNSS_DATA(hex_str: str):
         })
 
     return segments
+
+
+def _gnss_time_column(rec):
+    """
+    Vectorized version of the datetime(...) above: datetime64[ms] (UTC),
+    NaT for invalid timestamps.
+    """
+    year = rec['Year'].astype(np.int64)
+    month = rec['Month'].astype(np.int64)
+    day = rec['Day'].astype(np.int64)
+
+    valid = (
+        (year >= 1) & (year <= 9999)
+        & (month >= 1) & (month <= 12)
+        & (day >= 1)
+        & (rec['Hour'] < 24) & (rec['Minute'] < 60) & (rec['Millisec'] < 1000)
+    )
+    # Neutral values for invalid rows so the datetime64 arithmetic stays in range
+    year = np.where(valid, year, 1970)
+    month = np.where(valid, month, 1)
+
+    month_start = ((year - 1970) * 12 + (month - 1)).astype('datetime64[M]')
+    days_in_month = ((month_start + 1).astype('datetime64[D]') - month_start.astype('datetime64[D]')).astype(np.int64)
+    valid &= day <= days_in_month
+
+    stamp = (
+        month_start.astype('datetime64[ms]')
+        + (np.where(valid, day, 1) - 1).astype('timedelta64[D]')
+        + rec['Hour'].astype(np.int64).astype('timedelta64[h]')
+        + rec['Minute'].astype(np.int64).astype('timedelta64[m]')
+        + rec['Millisec'].astype(np.int64).astype('timedelta64[ms]')
+    )
+    stamp[~valid] = np.datetime64('NaT')
+    return stamp
+
+
+if np is not None:
+    def decode_columns(frame):
+        """
+        Columnar variant of decode_frame: same columns, one array per column.
+        """
+        tc_len, submodule_id, queue_id, count = _QM_HEADER.unpack_from(frame, 23)
+        if count == 0:
+            return {}
+
+        rec = instance_array(frame, _SEGMENT_DTYPE, _DATA_START, count)
+        n = len(rec)
+        if n == 0:
+            return {}
+
+        def status_str(name, ok, bad):
+            return np.where(rec[name] == 0, ok, bad)
+
+        return {
+            'Submodule_ID':        [submodule_id] * n,
+            'Queue_ID':            [queue_id] * n,
+            'Number_of_Instances': [count] * n,
+            'Instance_Index':      np.arange(n),
+
+            'Year':          rec['Year'],
+            'Month':         rec['Month'],
+            'Day':           rec['Day'],
+            'Hour':          rec['Hour'],
+            'Minute':        rec['Minute'],
+            'Millisec':      rec['Millisec'],
+            'GNSS_Time_UTC': _gnss_time_column(rec),
+
+            'reserv':                 rec['reserv'],
+            'clk_model_recv_sts':     rec['clk_model_recv_sts'],
+            'clk_model_recv_sts_str': status_str('clk_model_recv_sts', "Clock model status VALID", "Clock model status INVALID"),
+            'utc_known_recv_sts':     rec['utc_known_recv_sts'],
+            'utc_known_recv_sts_str': status_str('utc_known_recv_sts', "UTC time VALID", "UTC time INVALID"),
+            'pos_sts':                rec['pos_sts'],
+            'pos_sts_str':            status_str('pos_sts', "GNSS position VALID", "GNSS position INVALID"),
+            'lna_fail_recv_sts':      rec['lna_fail_recv_sts'],
+            'cpu_overload_recv_sts':  rec['cpu_overload_recv_sts'],
+            'antna_gain_state':       rec['antna_gain_state'],
+            'compo_hw_fail_sts':      rec['compo_hw_fail_sts'],
+
+            'antenna_curr':   rec['antenna_curr'],
+            'antenna_volt':   rec['antenna_volt'],
+            'receiver_volt':  rec['receiver_volt'],
+            'temperature':    rec['temperature'],
+        }
+
+
+def HEALTH_GNSS_DATA(hex_str: str):
+    # Legacy hex-string entry point
+    return decode_frame(memoryview(bytes.fromhex(hex_str)))
@@ -1,6 +1,10 @@
 import struct
 from datetime import datetime, timezone
 
+from netra_backend.decoding.frame import TIMESTAMP
+
+COLUMN_TYPES = {'Epoch_Time_Human': TIMESTAMP}
+
 # -----------------------------
 # MAPPINGS
 # -----------------------------
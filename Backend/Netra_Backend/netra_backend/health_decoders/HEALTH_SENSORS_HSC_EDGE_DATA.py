@@ -1,5 +1,9 @@
 import struct
-from datetime import datetime
+
+from netra_backend.decoding.frame import EPOCH_S
+
+COLUMN_TYPES = {'adm_epoch_time': EPOCH_S}
+
 def HEALTH_SENSORS_HSC_EDGE_DATA(hex_str):
     header_skip_len = 29  # metadata header in bytes
     tc_len=struct.unpack('<H', bytes.fromhex(hex_str[46:50]))[0]
@@ -27,7 +31,6 @@ def HEALTH_SENSORS_HSC_EDGE_DATA(hex_str):
 
         try:
             voltage, current, adm_epoch_time = struct.unpack('<ffI', bytes.fromhex(seg[0:24]))
-            timestamp = datetime.utcfromtimestamp(adm_epoch_time).strftime('%Y-%m-%d %H:%M:%S')
         except Exception as e:
             print(f"Error unpacking PSM data segment {idx}: {e}")
             continue
@@ -37,6 +40,6 @@ def HEALTH_SENSORS_HSC_EDGE_DATA(hex_str):
             'Number of Instances': count,
             'Voltage':voltage,
             'Current': current,
-            'adm_epoch_time': timestamp,
+            'adm_epoch_time': adm_epoch_time,
         })
     return segments
\ No newline at end of file
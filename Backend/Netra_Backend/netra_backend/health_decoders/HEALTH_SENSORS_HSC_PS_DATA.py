@@ -1,5 +1,9 @@
 import struct
-from datetime import datetime
+
+from netra_backend.decoding.frame import EPOCH_S
+
+COLUMN_TYPES = {'Timestamp': EPOCH_S}
+
 
 def HEALTH_SENSORS_HSC_PS_DATA(hex_str):
     header_skip_len = 29  # metadata header in bytes
@@ -30,9 +34,6 @@ def HEALTH_SENSORS_HSC_PS_DATA(hex_str):
             # vbus_voltage(f), vshunt_voltage(f), current(f), power(I), psm_epoch_time(I)
             vbus_v, vshunt_v, curr, pwr, epoch_ti = struct.unpack('<fffII', bytes.fromhex(seg))
             
-            # Convert epoch integer to human-readable format
-            timestamp = datetime.utcfromtimestamp(epoch_ti).strftime('%Y-%m-%d %H:%M:%S')
-            
         except Exception as e:
             print(f"Error unpacking HSC_PS data segment {idx}: {e}")
             continue
@@ -45,6 +46,6 @@ def HEALTH_SENSORS_HSC_PS_DATA(hex_str):
             'Vshunt_Voltage': vshunt_v,
             'Current': curr,
             'Power': pwr,
-            'Timestamp': timestamp,
+            'Timestamp': epoch_ti,
         })
     return segments
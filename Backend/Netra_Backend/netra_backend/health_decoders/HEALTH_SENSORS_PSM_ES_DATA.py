@@ -1,5 +1,9 @@
 import struct
-from datetime import datetime
+
+from netra_backend.decoding.frame import EPOCH_S
+
+COLUMN_TYPES = {'Timestamp': EPOCH_S}
+
 def HEALTH_SENSORS_PSM_ES_DATA(hex_str):
     header_skip_len = 29  # metadata header in bytes
     tc_len=struct.unpack('<H', bytes.fromhex(hex_str[46:50]))[0]
@@ -38,8 +42,6 @@ def HEALTH_SENSORS_PSM_ES_DATA(hex_str):
             offset += 8
             epoch_time_reversed = ''.join([epoch_tim1[i:i + 2] for i in range(0, 8, 2)][::-1])
             epoch_ti = int(epoch_time_reversed, 16)
-            # Convert epoch integer to human-readable format
-            epoch_time = datetime.utcfromtimestamp(epoch_ti).strftime('%Y-%m-%d %H:%M:%S')
             
         except Exception as e:
             print(f"Error unpacking PSM data segment {idx}: {e}")
@@ -54,7 +56,7 @@ def HEALTH_SENSORS_PSM_ES_DATA(hex_str):
             'Vshunt_Voltage': vshunt_voltage,
             'Current': current,
             'Power': power,
-            'Timestamp': epoch_time,
+            'Timestamp': epoch_ti,
         })
 
     return segments
\ No newline at end of file
@@ -1,5 +1,9 @@
 import struct
-from datetime import datetime
+
+from netra_backend.decoding.frame import EPOCH_S
+
+COLUMN_TYPES = {'temp_epoch_time': EPOCH_S}
+
 
 def HEALTH_SENSORS_TEMP_PS_DATA(hex_str):
     header_skip_len = 29  # metadata header in bytes
@@ -33,13 +37,12 @@ def HEALTH_SENSORS_TEMP_PS_DATA(hex_str):
         temp_reversed=''.join([temp_epoch_time[i:i + 2] for i in range(0, 8, 2)][::-1])
         
         temp_epoch_time=int(temp_reversed,16)
-        temp_epoch_readable= datetime.utcfromtimestamp(temp_epoch_time).strftime('%Y-%m-%d %H:%M:%S')
         
         segments.append({
             'Submodule_ID': submodule_id,
             'Queue_ID': queue_id,
             'Number of Instances': count,
             'temperature': temperature,
-            'temp_epoch_time':temp_epoch_readable})
+            'temp_epoch_time':temp_epoch_time})
 
     return segments
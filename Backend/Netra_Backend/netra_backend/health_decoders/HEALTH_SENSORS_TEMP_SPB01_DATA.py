@@ -1,5 +1,9 @@
 import struct
-from datetime import datetime
+
+from netra_backend.decoding.frame import EPOCH_S
+
+COLUMN_TYPES = {'temp_epoch_time': EPOCH_S}
+
 
 def HEALTH_SENSORS_TEMP_SPB01_DATA(hex_str):
     header_skip_len = 29  # metadata header in bytes
@@ -32,13 +36,11 @@ def HEALTH_SENSORS_TEMP_SPB01_DATA(hex_str):
         temp_epoch_time = struct.unpack('<I', bytes.fromhex(seg[offset:offset+8]))[0]
         offset += 8
 
-        # Convert epoch to human-readable time
-        temp_time_str = datetime.utcfromtimestamp(temp_epoch_time).strftime('%Y-%m-%d %H:%M:%S')
         
         segments.append({
             'Submodule_ID': submodule_id,
             'Queue_ID': queue_id,
             'Number of Instances': count,
             'temperature': temperature,
-            'temp_epoch_time':temp_time_str})
+            'temp_epoch_time':temp_epoch_time})
     return segments
\ No newline at end of file
@@ -3,6 +3,7 @@ import os
 import sys
 import time
 import logging
+import threading
 from typing import Callable, Dict, List, Optional
 
 from netra_backend.config import get_openc3_config
@@ -13,6 +14,7 @@ from openc3.script.web_socket_api import StreamingWebSocketApi
 logger = logging.getLogger(__name__)
 
 PacketCallback = Callable[[Dict], None]
+BatchCallback = Callable[[List[Dict]], None]
 
 
 class OpenC3Streamer:
@@ -24,8 +26,14 @@ class OpenC3Streamer:
     - Calls user callback for every packet
     """
 
-    def __init__(self, on_packet: PacketCallback):
+    def __init__(self, on_packet: Optional[PacketCallback] = None,
+                 on_batch: Optional[BatchCallback] = None):
+        # on_batch (if given) receives every read() batch as it is, straight
+        # after the read and without the idle sleep; otherwise on_packet is
+        # called for each packet
         self.on_packet = on_packet
+        self.on_batch = on_batch
+        self.stop_event = threading.Event()
         self.cfg = get_openc3_config()
         self._ensure_env()
 
@@ -47,7 +55,8 @@ class OpenC3Streamer:
 
     def run_forever(self, reconnect_delay: float = 5.0) -> None:
         """
-        Outer loop that *never dies* unless you Ctrl+C the process.
+        Outer loop that *never dies* unless you Ctrl+C the process
+        (or stop_event is set, in batch mode).
         """
         packets_to_stream: List[str] = self.cfg.packets_tlm + self.cfg.packets_cmd
         items_to_stream: List[str] = self.cfg.items_to_stream
@@ -56,7 +65,7 @@ class OpenC3Streamer:
             logger.error("No packets or items configured to stream. Exiting.")
             sys.exit(1)
 
-        while True:
+        while not self.stop_event.is_set():
             try:
                 self._stream_once(packets_to_stream, items_to_stream)
             except KeyboardInterrupt:
@@ -68,7 +77,7 @@ class OpenC3Streamer:
                     e,
                     reconnect_delay,
                 )
-                time.sleep(reconnect_delay)
+                self.stop_event.wait(reconnect_delay)
 
     def _stream_once(self, packets_to_stream: List[str], items_to_stream: List[str]) -> None:
         """
@@ -91,9 +100,23 @@ class OpenC3Streamer:
 
             logger.info("✅ Connected to OpenC3 – starting stream loop")
 
+            if self.on_batch is not None:
+                # read() blocks on the websocket, so no sleep is needed; the
+                # callback applies its own backpressure by blocking
+                while not self.stop_event.is_set():
+                    batch = api.read()
+                    if batch is None:
+                        raise ConnectionError("OpenC3 stream closed")
+                    if batch:
+                        self.on_batch(batch)
+                return
+
             while True:
                 batch = api.read()  # blocking read from OpenC3
 
+                if batch is None:
+                    # Websocket closed; run_forever() reconnects
+                    raise ConnectionError("OpenC3 stream closed")
                 if not batch:
                     # No data in this tick; avoid busy loop
                     time.sleep(0.05)
@@ -0,0 +1,327 @@
+# netra_backend/packet_catalog.py
+import hashlib
+import json
+import logging
+import os
+import shlex
+import tempfile
+import threading
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------------------------------------
+# Packet catalog from the COSMOS target definitions
+# ---------------------------------------------------------
+#
+# Every TELEMETRY / COMMAND packet in <COSMOS_TARGETS_DIR>/<TARGET>/cmd_tlm/*.txt,
+# parsed once into an index of:
+#
+#   target, name, kind (TLM / CMD), ID items and their values, item count,
+#   size in bits (fixed part; `variable` when an item has no fixed size),
+#   and whether a health decoder module exists (netra_backend/health_decoders)
+#
+# Services derive the OpenC3 stream names they subscribe to from it,
+# e.g. RAW__TLM__EMULATOR__HEALTH_EPS or DECOM__CMD__EMULATOR__OBC_581_TC_GET_CUR_TIME,
+# instead of keeping their own packet lists:
+#
+#     catalog = load_catalog()
+#     names = catalog.stream_names(catalog.select(kind="TLM", health=True, decodable=True), "RAW")
+#
+# decoded_health_streams() is what the health pipeline subscribes to: the
+# defined health packets that have a decoder, plus every decoder whose packet
+# is missing from the definitions (warned about, still subscribed - the
+# definitions on disk can lag the deployed COSMOS plugin).
+#
+# The index is cached per process and on disk as JSON (PACKET_CATALOG_CACHE),
+# keyed by a fingerprint of the definition files and decoder modules, so
+# worker processes and replicas do not parse the definitions again.
+#
+# Standard library only and no netra_backend imports:
+# Transmission_History_Backend copies this file into its image.
+
+# Bump when PacketDef or the parsing changes, so older caches are not reused
+CACHE_VERSION = 1
+
+TARGET_NAME_ERB = "<%= target_name %>"
+HEALTH_PREFIX = "HEALTH_"
+
+_PACKET_KEYWORDS = {"TELEMETRY": "TLM", "COMMAND": "CMD"}
+# keyword -> (index of the bit size, index of the ID value for BLOCK/STRING, for numeric types)
+_APPEND = {
+    "APPEND_ITEM": (2, None, None),
+    "APPEND_PARAMETER": (2, None, None),
+    "APPEND_ID_ITEM": (2, 4, 4),
+    "APPEND_ID_PARAMETER": (2, 4, 6),   # numeric parameters: MIN MAX DEFAULT
+    "APPEND_ARRAY_ITEM": (4, None, None),
+    "APPEND_ARRAY_PARAMETER": (4, None, None),
+}
+# Explicitly placed items: the bit offset comes first
+_PLACED = {
+    "ITEM": (3, None, None),
+    "PARAMETER": (3, None, None),
+    "ID_ITEM": (3, 5, 5),
+    "ID_PARAMETER": (3, 5, 7),
+    "ARRAY_ITEM": (5, None, None),
+    "ARRAY_PARAMETER": (5, None, None),
+}
+
+
+def _default_targets_dir() -> str:
+    # Backend/Netra_Backend/netra_backend -> Backend/cosmos-project/...
+    here = os.path.dirname(os.path.abspath(__file__))
+    return os.path.normpath(os.path.join(here, "..", "..", "cosmos-project", "openc3-cosmos-drishti", "targets"))
+
+
+def _default_decoder_dir() -> str:
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), "health_decoders")
+
+
+@dataclass
+class PacketDef:
+    target: str
+    name: str
+    kind: str                       # "TLM" or "CMD"
+    description: str = ""
+    # ID item -> ID value as written in the definition (e.g. "0x6d02")
+    id_items: Dict[str, str] = field(default_factory=dict)
+    items: int = 0
+    bit_size: int = 0
+    variable: bool = False
+    has_decoder: bool = False
+    source: str = ""
+
+    @property
+    def byte_size(self) -> int:
+        return (self.bit_size + 7) // 8
+
+    @property
+    def is_health(self) -> bool:
+        return self.kind == "TLM" and self.name.startswith(HEALTH_PREFIX)
+
+    def stream_name(self, mode: str = "RAW", value_type: Optional[str] = None) -> str:
+        """
+        OpenC3 streaming name: RAW__TLM__<target>__<name>, or
+        DECOM__<kind>__<target>__<name>[__<value_type>] (CONVERTED, FORMATTED, ...).
+        """
+        name = f"{mode}__{self.kind}__{self.target}__{self.name}"
+        return f"{name}__{value_type}" if value_type else name
+
+
+class PacketCatalog:
+    def __init__(self, packets: Iterable[PacketDef], fingerprint: str = ""):
+        self.packets: List[PacketDef] = list(packets)
+        self.fingerprint = fingerprint
+        self._by_key: Dict[Tuple[str, str, str], PacketDef] = {
+            (p.kind, p.target, p.name): p for p in self.packets
+        }
+
+    def __len__(self) -> int:
+        return len(self.packets)
+
+    def get(self, kind: str, target: str, name: str) -> Optional[PacketDef]:
+        return self._by_key.get((kind, target, name))
+
+    def lookup(self, stream_name: str) -> Optional[PacketDef]:
+        """'RAW__TLM__EMULATOR__HEALTH_EPS' (or a DECOM name) -> its packet."""
+        parts = stream_name.split("__")
+        if len(parts) < 4:
+            return None
+        return self.get(parts[1], parts[2], parts[3])
+
+    def select(self, kind: Optional[str] = None, health: Optional[bool] = None,
+               decodable: Optional[bool] = None) -> List[PacketDef]:
+        return [
+            p for p in self.packets
+            if (kind is None or p.kind == kind)
+            and (health is None or p.is_health == health)
+            and (decodable is None or p.has_decoder == decodable)
+        ]
+
+    @staticmethod
+    def stream_names(packets: Iterable[PacketDef], mode: str = "RAW",
+                     value_type: Optional[str] = None) -> List[str]:
+        return [p.stream_name(mode, value_type) for p in packets]
+
+    def to_json(self) -> Dict:
+        return {"fingerprint": self.fingerprint, "packets": [asdict(p) for p in self.packets]}
+
+    @classmethod
+    def from_json(cls, doc: Dict) -> "PacketCatalog":
+        return cls((PacketDef(**p) for p in doc["packets"]), doc.get("fingerprint", ""))
+
+
+# ----- parsing -----
+
+def _definition_files(targets_dir: str) -> List[Tuple[str, str]]:
+    """(target, path) of every cmd_tlm definition file, in a stable order."""
+    files = []
+    for target in sorted(os.listdir(targets_dir)):
+        cmd_tlm = os.path.join(targets_dir, target, "cmd_tlm")
+        if not os.path.isdir(cmd_tlm):
+            continue
+        for name in sorted(os.listdir(cmd_tlm)):
+            if name.endswith(".txt"):
+                files.append((target, os.path.join(cmd_tlm, name)))
+    return files
+
+
+def decoder_names(decoder_dir: Optional[str] = None) -> List[str]:
+    """Health decoder modules present on disk (not imported)."""
+    decoder_dir = decoder_dir or _default_decoder_dir()
+    if not os.path.isdir(decoder_dir):
+        return []
+    names = set()
+    for entry in os.listdir(decoder_dir):
+        base, ext = os.path.splitext(entry)
+        if base.startswith(HEALTH_PREFIX) and (ext == ".py" or os.path.isdir(os.path.join(decoder_dir, entry))):
+            names.add(base)
+    return sorted(names)
+
+
+def _add_item(packet: PacketDef, keyword: str, tokens: List[str]) -> None:
+    placed = keyword in _PLACED
+    size_index, id_block, id_numeric = (_PLACED if placed else _APPEND)[keyword]
+    bits = int(tokens[size_index], 0)
+    packet.items += 1
+    if placed:
+        offset = int(tokens[2], 0)
+        if offset < 0 or bits <= 0:
+            packet.variable = True
+        else:
+            packet.bit_size = max(packet.bit_size, offset + bits)
+    elif bits <= 0:
+        # 0 / negative sizes fill the rest of the packet
+        packet.variable = True
+    else:
+        packet.bit_size += bits
+
+    if id_block is not None:
+        data_type = tokens[size_index + 1].upper()
+        index = id_block if data_type in ("BLOCK", "STRING") else id_numeric
+        if index < len(tokens):
+            packet.id_items[tokens[1].upper()] = tokens[index]
+
+
+def parse_definitions(targets_dir: str, decoders: Iterable[str] = ()) -> List[PacketDef]:
+    """Every packet defined under `targets_dir`, in file order."""
+    decoders = {d.upper() for d in decoders}
+    packets: List[PacketDef] = []
+    for target, path in _definition_files(targets_dir):
+        packet: Optional[PacketDef] = None
+        with open(path, encoding="utf-8", errors="replace") as f:
+            for lineno, line in enumerate(f, 1):
+                line = line.strip().replace(TARGET_NAME_ERB, target)
+                if not line or line.startswith("#"):
+                    continue
+                try:
+                    tokens = shlex.split(line, comments=True)
+                    if not tokens:
+                        continue
+                    keyword = tokens[0].upper()
+                    if keyword in _PACKET_KEYWORDS:
+                        # OpenC3 upper-cases target and packet names
+                        packet = PacketDef(
+                            target=tokens[1].upper(),
+                            name=tokens[2].upper(),
+                            kind=_PACKET_KEYWORDS[keyword],
+                            description=tokens[4] if len(tokens) > 4 else "",
+                            source=os.path.relpath(path, targets_dir),
+                        )
+                        packet.has_decoder = packet.kind == "TLM" and packet.name in decoders
+                        packets.append(packet)
+                    elif packet is not None and (keyword in _APPEND or keyword in _PLACED):
+                        _add_item(packet, keyword, tokens)
+                except (ValueError, IndexError) as e:
+                    logger.warning("Skipping unparsable definition line %s:%d: %s", path, lineno, e)
+    return packets
+
+
+def _fingerprint(targets_dir: str, decoders: List[str]) -> str:
+    h = hashlib.sha1(f"v{CACHE_VERSION}\n".encode("utf-8"))
+    for _, path in _definition_files(targets_dir):
+        st = os.stat(path)
+        h.update(f"{os.path.relpath(path, targets_dir)}:{st.st_size}:{st.st_mtime_ns}\n".encode("utf-8"))
+    h.update(",".join(decoders).encode("utf-8"))
+    return h.hexdigest()
+
+
+# ----- cached loading -----
+
+_lock = threading.Lock()
+_catalog: Optional[PacketCatalog] = None
+
+
+def build_catalog(targets_dir: Optional[str] = None, decoder_dir: Optional[str] = None,
+                  cache_path: Optional[str] = None) -> PacketCatalog:
+    """Parse the definitions, or read them from the JSON cache when it is current."""
+    targets_dir = targets_dir or os.getenv("COSMOS_TARGETS_DIR") or _default_targets_dir()
+    if not os.path.isdir(targets_dir):
+        raise FileNotFoundError(f"COSMOS target definitions not found at {targets_dir} (set COSMOS_TARGETS_DIR)")
+    cache_path = cache_path or os.getenv("PACKET_CATALOG_CACHE") or os.path.join(
+        tempfile.gettempdir(), "netra-packet-catalog.json")
+
+    decoders = decoder_names(decoder_dir)
+    fingerprint = _fingerprint(targets_dir, decoders)
+    try:
+        with open(cache_path, encoding="utf-8") as f:
+            doc = json.load(f)
+        if doc.get("fingerprint") == fingerprint:
+            return PacketCatalog.from_json(doc)
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    catalog = PacketCatalog(parse_definitions(targets_dir, decoders), fingerprint)
+    logger.info("Packet catalog: %d packets from %s (%d with a decoder)",
+                len(catalog), targets_dir, sum(p.has_decoder for p in catalog.packets))
+    try:
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(cache_path)), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(catalog.to_json(), f)
+        os.replace(tmp, cache_path)
+    except OSError as e:
+        logger.warning("Cannot write packet catalog cache %s: %s", cache_path, e)
+    return catalog
+
+
+def load_catalog() -> PacketCatalog:
+    """The process-wide catalog (built on first use)."""
+    global _catalog
+    with _lock:
+        if _catalog is None:
+            _catalog = build_catalog()
+        return _catalog
+
+
+def try_load_catalog() -> Optional[PacketCatalog]:
+    """load_catalog(), or None (with a warning) when the definitions are not available."""
+    try:
+        return load_catalog()
+    except OSError as e:
+        logger.warning("No packet catalog: %s", e)
+        return None
+
+
+def decoded_health_streams(target: Optional[str] = None, decoder_dir: Optional[str] = None) -> List[str]:
+    """
+    RAW stream names of the health packets with a decoder: the ones defined
+    in the catalog, then decoders without a definition under `target`
+    (COSMOS_TARGET, default EMULATOR). Without a catalog, every decoder.
+    """
+    target = (target or os.getenv("COSMOS_TARGET", "EMULATOR")).upper()
+    decoders = [d.upper() for d in decoder_names(decoder_dir)]
+    catalog = try_load_catalog()
+    names: List[str] = []
+    if catalog is not None:
+        defined = [p for p in catalog.select(kind="TLM", health=True) if p.name in decoders]
+        names = catalog.stream_names(defined)
+        undefined = sorted(set(decoders) - {p.name for p in defined})
+        if undefined:
+            logger.warning("%d health decoders have no COSMOS definition; subscribing to them under %s anyway: %s",
+                           len(undefined), target, ", ".join(undefined))
+    else:
+        undefined = decoders
+        logger.warning("Subscribing to the %d health decoders under %s", len(undefined), target)
+    names += [f"RAW__TLM__{target}__{name}" for name in undefined]
+    return names
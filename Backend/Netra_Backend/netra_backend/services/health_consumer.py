@@ -1,27 +1,37 @@
 # netra_backend/services/health_consumer.py
-import base64
-import importlib
+import functools
 import json
 import logging
+import multiprocessing
 import time
-import datetime
-from typing import Any, Dict, List
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
 import pika
 import os
 
 from netra_backend.logging_config import setup_logging
 from netra_backend.config import get_openc3_config
-from netra_backend.config import get_openc3_config
+from netra_backend.common.messaging.confirm_publisher import BatchingConfirmPublisher
+from netra_backend.common.messaging.error_events import (
+    KIND_DECODE_FAILED,
+    KIND_NOT_FOUND,
+    ErrorRates,
+    ErrorReporter,
+)
+from netra_backend.common.messaging.raw_frames import decode_buffer, frame_from_message
+from netra_backend.common.messaging.raw_topology import RawTopology, is_health_packet
+from netra_backend.common.messaging.wire_format import get_wire_format
+from netra_backend.decoding.columnar import HAVE_NUMPY, num_rows, to_pylists
+from netra_backend.decoding.dedup import DedupCache, frame_fingerprint
+from netra_backend.decoding.registry import DecoderNotFound, DecoderRegistry
+from netra_backend.services.shard_claims import ShardClaims
 # DB Client removed to decouple service
 # from netra_backend.db_client import PostgresClient
 
 logger = logging.getLogger("health_consumer")
 
 
-class DecoderNotFound(Exception):
-    pass
-
-
 def _get_health_packet_names() -> List[str]:
     """
     From OpenC3 config, pick only packets whose names contain '__HEALTH_'.
@@ -29,58 +39,85 @@ def _get_health_packet_names() -> List[str]:
     """
     cfg = get_openc3_config()
     all_packets = cfg.packets_tlm + cfg.packets_cmd
-    health_packets = [p for p in all_packets if "__HEALTH_" in p]
+    health_packets = [p for p in all_packets if is_health_packet(p)]
     logger.info("Identified %d health packet types", len(health_packets))
     return health_packets
 
 
-def _decode_buffer_to_hex(buffer_b64: str) -> str:
-    """
-    Convert OpenC3 'buffer' field (base64 with possible newlines) to a hex string.
-    """
-    clean_b64 = buffer_b64.replace("\n", "")
-    raw_bytes = base64.b64decode(clean_b64)
-    return raw_bytes.hex()
-
-
-def _get_decoder_for_packet(packet_name: str):
-    parts = packet_name.split("__")
-    if len(parts) < 4:
-        raise DecoderNotFound(f"Unexpected packet name format: {packet_name}")
-
-    # everything after 'EMULATOR__' is our 'core' name
-    core_name = "__".join(parts[3:])  # HEALTH_ADCS_EST_ATTITUDE_ANGLE etc.
-
-    module_name = f"netra_backend.health_decoders.{core_name}"
-    try:
-        module = importlib.import_module(module_name)
-    except ModuleNotFoundError as e:
-        raise DecoderNotFound(f"Decoder module not found: {module_name}") from e
-
-    # Logic: try exact function name match first, then search for ANY function starting with HEALTH_
-    func = getattr(module, core_name, None)
-    
-    if func is None:
-        # Fallback: search the module for the first function starting with HEALTH_
-        # (This handles cases like HEALTH_COMMS_S -> HEALTH_COMMS_SBAND_TM_PROP_QUEUE0)
-        for attr_name in dir(module):
-            if attr_name.startswith("HEALTH_"):
-                candidate = getattr(module, attr_name)
-                if callable(candidate):
-                    logger.debug("Found alternative decoder function: %s in %s", attr_name, module_name)
-                    func = candidate
-                    break
-    
-    if func is None:
-        raise DecoderNotFound(f"No valid decoder function found in {module_name}")
-
-    return core_name, func
+@dataclass
+class DecodeResult:
+    # Decoded packet encoded in the wire format; data=None means "nothing to publish, just ack"
+    routing_key: Optional[str] = None
+    data: Optional[bytes] = None
+    rows: int = 0
+    # Decoder's declared column types (e.g. raw epoch timestamps)
+    column_types: Optional[Dict[str, str]] = None
+    # Frame fingerprint claimed in the dedup cache (committed once published and acked)
+    dedup_key: Optional[bytes] = None
 
 
 class HealthConsumerService:
     def __init__(self):
         self.health_packets = _get_health_packet_names()
 
+        # Resolve every decoder once at startup; per-message lookup is a dict hit
+        self.decoders = DecoderRegistry(self.health_packets).load()
+
+        # "rows" (default) or "columnar": vectorized numpy decode where a decoder supports it
+        self.decode_mode = os.getenv("HEALTH_DECODE_MODE", "rows").lower()
+        if self.decode_mode == "columnar" and not HAVE_NUMPY:
+            logger.warning("HEALTH_DECODE_MODE=columnar but numpy is not installed; using row decoders")
+        self.columnar = self.decode_mode == "columnar" and HAVE_NUMPY
+
+        # Max unacked raw messages this process holds at once (whole channel,
+        # not per queue), so several worker processes share the backlog fairly
+        self.prefetch = int(os.getenv("HEALTH_PREFETCH", "32"))
+
+        # Decoding runs off the pika I/O thread so heartbeats and acks keep
+        # flowing during big dumps; one thread per process (the GIL makes more
+        # pointless - use HEALTH_DECODE_WORKERS processes to scale out)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="health-decode")
+        self._connection = None
+
+        # Decoded packets per routing key are batched into one confirmed
+        # message; HEALTH_PUBLISH_BATCH_PACKETS=1 publishes each on its own
+        self.batch_packets = int(os.getenv("HEALTH_PUBLISH_BATCH_PACKETS", "20"))
+        self.batch_bytes = int(os.getenv("HEALTH_PUBLISH_BATCH_BYTES", str(1 << 20)))
+        self.batch_delay = float(os.getenv("HEALTH_PUBLISH_BATCH_MS", "20")) / 1000.0
+        # Decoded messages published and not confirmed yet (asynchronous confirms)
+        self.confirm_window = int(os.getenv("HEALTH_CONFIRM_WINDOW", "64"))
+
+        # Encoding of telemetry.decoded messages: "columnar" (compact, default)
+        # or "json" (one dict per row, handy when debugging consumers)
+        self.wire_format = get_wire_format(os.getenv("HEALTH_WIRE_FORMAT", "columnar"))
+        logger.info("Publishing decoded telemetry as %s", self.wire_format.content_type)
+        self._publisher = None
+
+        # Exact repeats of a raw frame (OpenC3 re-subscribe replays, on-board
+        # queue re-dumps) are acked without decoding. HEALTH_DEDUP_DB (an
+        # SQLite file) shares the seen-set between worker processes and keeps
+        # it across restarts; HEALTH_DEDUP_MAX_ENTRIES=0 turns dedup off.
+        dedup_entries = int(os.getenv("HEALTH_DEDUP_MAX_ENTRIES", "100000"))
+        self.dedup = None
+        if dedup_entries > 0:
+            self.dedup = DedupCache(
+                max_entries=dedup_entries,
+                ttl=float(os.getenv("HEALTH_DEDUP_TTL_S", "86400")),
+                path=os.getenv("HEALTH_DEDUP_DB") or None,
+            )
+        self.dedup_log_interval = float(os.getenv("HEALTH_DEDUP_LOG_S", "60"))
+        # delivery tag -> claimed fingerprint, for published messages awaiting their confirm (I/O thread)
+        self._dedup_pending: Dict[int, bytes] = {}
+
+        # Failed frames go to telemetry.errors (stored by workers.errorsink)
+        # from a background thread. A packet whose frames keep failing is
+        # throttled: only 1 in ERROR_THROTTLE_PROBE_EVERY frames is still
+        # decoded until its error rate drops (the rest are acked unread;
+        # the raw frame archive still has them)
+        self.errors = ErrorReporter.from_env("health_consumer")
+        self.error_rates = ErrorRates.from_env()
+        self.error_log_interval = float(os.getenv("HEALTH_ERROR_LOG_S", "60"))
+
         # RabbitMQ config
         self.rabbitmq_url = os.getenv(
             "RABBITMQ_URL",
@@ -88,15 +125,20 @@ class HealthConsumerService:
         )
         # Input exchange (raw telemetry)
         self.input_exchange = os.getenv("RABBITMQ_EXCHANGE", "telemetry.raw")
+
+        # pkt.<name> queues, or shard queues divided between replicas
+        # (RAW_TOPOLOGY=sharded; see raw_topology.py and shard_claims.py)
+        self.topology = RawTopology.from_env()
+        self._shards: Optional[ShardClaims] = None
         
         # Output exchange (decoded telemetry)
         self.output_exchange = os.getenv("RABBITMQ_OUTPUT_EXCHANGE", "telemetry.decoded")
 
-        # We need a separate publisher channel (or reuse the consumer's connection carefully)
-        # Ideally, we open one connection and share it, or open two. 
-        # For simplicity in this structure, we'll establish a publisher connection/channel
-        # inside _consume_once or keep a persistent one. Let's keep a dedicated publisher helper.
-        self._publisher_channel = None
+        # Control exchange (fanout) for operator commands such as decoder hot-reload
+        self.control_exchange = os.getenv("RABBITMQ_CONTROL_EXCHANGE", "netra.control")
+
+        # Decoded output is published on a connection of its own with asynchronous
+        # confirms; inputs are acked on the consumer's channel (see BatchingConfirmPublisher)
 
 
     def run_forever(self) -> None:
@@ -122,10 +164,9 @@ class HealthConsumerService:
         logger.info("Connecting to RabbitMQ for health consumer: %s", self.rabbitmq_url)
         params = pika.URLParameters(self.rabbitmq_url)
         connection = pika.BlockingConnection(params)
-        logger.info("Connecting to RabbitMQ for health consumer: %s", self.rabbitmq_url)
-        params = pika.URLParameters(self.rabbitmq_url)
-        connection = pika.BlockingConnection(params)
         channel = connection.channel()
+        channel.basic_qos(prefetch_count=self.prefetch, global_qos=True)
+        self._connection = connection
         
         # Setup publisher resources
         # Declare the output exchange (durable topic)
@@ -134,7 +175,22 @@ class HealthConsumerService:
             exchange_type='topic', 
             durable=True
         )
-        self._publisher_channel = channel
+        self._publisher = BatchingConfirmPublisher(
+            connection,
+            channel,
+            self.output_exchange,
+            self.rabbitmq_url,
+            max_packets=self.batch_packets,
+            max_bytes=self.batch_bytes,
+            max_delay=self.batch_delay,
+            window=self.confirm_window,
+            wire_format=self.wire_format,
+            on_settled=self._on_settled,
+        )
+        if self.dedup is not None and self.dedup_log_interval > 0:
+            connection.call_later(self.dedup_log_interval, self._log_dedup_stats)
+        if self.error_log_interval > 0:
+            connection.call_later(self.error_log_interval, self._log_error_stats)
 
         # Ensure input exchange exists (idempotent)
         channel.exchange_declare(
@@ -145,136 +201,368 @@ class HealthConsumerService:
 
         # We declare and bind queues to ensure they exist (idempotent)
         # This prevents 404 errors if health_consumer starts before ws_ingestor
-        for pkt_name in self.health_packets:
-            queue_name = f"pkt.{pkt_name}"
+        if self.topology.sharded:
+            self._shards = ShardClaims.from_env(connection, channel, self.topology,
+                                                self.input_exchange, self._on_message)
+            self._shards.start(self.health_packets)
+        else:
+            for pkt_name in self.health_packets:
+                queue_name = self.topology.packet_queue(pkt_name)
             
-            channel.queue_declare(queue=queue_name, durable=True)
-            channel.queue_bind(
-                exchange=self.input_exchange,
-                queue=queue_name,
-                routing_key=pkt_name
-            )
+                channel.queue_declare(queue=queue_name, durable=True)
+                channel.queue_bind(
+                    exchange=self.input_exchange,
+                    queue=queue_name,
+                    routing_key=pkt_name
+                )
 
-            logger.info("Subscribing to queue %s for packet %s", queue_name, pkt_name)
-            channel.basic_consume(
-                queue=queue_name,
-                on_message_callback=self._on_message,
-                auto_ack=False,
-            )
+                logger.info("Subscribing to queue %s for packet %s", queue_name, pkt_name)
+                channel.basic_consume(
+                    queue=queue_name,
+                    on_message_callback=self._on_message,
+                    auto_ack=False,
+                )
+
+        # Private control queue so operators can hot-reload a decoder:
+        #   publish {"action": "reload_decoder", "decoder": "HEALTH_EPS"} to the control exchange
+        channel.exchange_declare(
+            exchange=self.control_exchange,
+            exchange_type='fanout',
+            durable=True
+        )
+        control_queue = channel.queue_declare(queue="", exclusive=True).method.queue
+        channel.queue_bind(exchange=self.control_exchange, queue=control_queue)
+        channel.basic_consume(
+            queue=control_queue,
+            on_message_callback=self._on_control_message,
+            auto_ack=True,
+        )
 
         logger.info("Starting RabbitMQ consuming loop for health packets")
         try:
             channel.start_consuming()
         finally:
             logger.warning("RabbitMQ consuming loop ended; closing connection")
+            try:
+                # Waits briefly for outstanding confirms so their inputs get acked
+                self._publisher.close()
+            except Exception:
+                logger.exception("Error flushing decoded batches")
             try:
                 if connection and connection.is_open:
                     connection.close()
             except Exception:
                 logger.exception("Error closing RabbitMQ connection")
+            # Whatever was not acked will be redelivered; let it through the dedup cache
+            pending, self._dedup_pending = self._dedup_pending, {}
+            for key in pending.values():
+                self.dedup.release(key)
+
+    def _on_control_message(self, ch, method, properties, body: bytes) -> None:
+        """
+        Handle operator commands from the control exchange.
+        """
+        try:
+            cmd = json.loads(body.decode("utf-8"))
+        except Exception:
+            logger.warning("Ignoring malformed control message: %r", body)
+            return
+
+        if cmd.get("action") != "reload_decoder" or not cmd.get("decoder"):
+            logger.warning("Ignoring unknown control message: %s", cmd)
+            return
+
+        try:
+            self.decoders.reload(cmd["decoder"])
+        except DecoderNotFound as e:
+            logger.error("Decoder hot-reload failed: %s", e)
 
     def _on_message(self, ch: pika.adapters.blocking_connection.BlockingChannel,
                     method: pika.spec.Basic.Deliver,
                     properties: pika.BasicProperties,
                     body: bytes) -> None:
         """
-        Callback for each message from any health queue.
+        Callback for each message from any health queue (pika I/O thread).
+        Hands the message to the decode thread; publish + ack happen back
+        on this thread once the decode is done.
+        """
+        future = self._executor.submit(self._decode_message, body, properties)
+        future.add_done_callback(
+            functools.partial(self._on_decoded, self._connection, self._publisher, method.delivery_tag)
+        )
+
+    def _on_decoded(self, connection: pika.BlockingConnection,
+                    publisher: BatchingConfirmPublisher,
+                    delivery_tag: int,
+                    future: Future) -> None:
+        """
+        Runs on the decode thread. pika channels are not thread-safe, so the
+        publish/ack is scheduled onto the connection's I/O thread.
+        """
+        try:
+            connection.add_callback_threadsafe(
+                functools.partial(self._publish_and_ack, publisher, delivery_tag, future)
+            )
+        except Exception:
+            # Connection went away; the broker redelivers the unacked message
+            logger.warning("Connection closed before delivery %s could be acked", delivery_tag)
+            self._release_claim(future)
+
+    def _publish_and_ack(self, publisher: BatchingConfirmPublisher,
+                         delivery_tag: int,
+                         future: Future) -> None:
+        """
+        Runs on the I/O thread. Hand the decoded rows to the publisher, which
+        acks the raw message once the broker confirms the published batch (or
+        requeues it if the publish fails). Messages with nothing to publish
+        are acked straight away.
+        """
+        if not publisher.is_open:
+            logger.warning("Channel closed before delivery %s could be acked", delivery_tag)
+            self._release_claim(future)
+            return
+
+        try:
+            result = future.result()
+        except Exception:
+            logger.exception("Unexpected error decoding delivery %s", delivery_tag)
+            # Ack to avoid a poison loop, same as decoder errors
+            self._ack(publisher, delivery_tag)
+            return
+
+        if result.data is None:
+            self._ack(publisher, delivery_tag)
+            if result.dedup_key is not None:
+                # Decoder failed, missing or gave no rows: not seen, so the
+                # same frame is decoded again when re-dumped (e.g. after a
+                # decoder fix is hot-reloaded)
+                self.dedup.release(result.dedup_key)
+            return
+
+        if result.dedup_key is not None:
+            self._dedup_pending[delivery_tag] = result.dedup_key
+        publisher.publish(result.routing_key, result.data, result.rows, delivery_tag,
+                          column_types=result.column_types)
+
+    def _ack(self, publisher: BatchingConfirmPublisher, delivery_tag: int) -> None:
+        """Ack an input that produced nothing to publish."""
+        publisher.ack(delivery_tag)
+        if self._shards is not None:
+            self._shards.settled([delivery_tag])
+
+    def _on_settled(self, delivery_tags: List[int], published: bool) -> None:
+        """
+        Publisher callback (I/O thread): the inputs of a decoded batch were
+        acked, or requeued. Only acked frames count as seen.
+        """
+        for tag in delivery_tags:
+            key = self._dedup_pending.pop(tag, None)
+            if key is None:
+                continue
+            if published:
+                self.dedup.commit(key)
+            else:
+                self.dedup.release(key)
+        if self._shards is not None:
+            # A shard being handed over waits for its deliveries to settle
+            self._shards.settled(delivery_tags)
+
+    def _release_claim(self, future: Future) -> None:
+        """The raw message will be redelivered; drop its dedup claim."""
+        if future.exception() is None and future.result().dedup_key is not None:
+            self.dedup.release(future.result().dedup_key)
+
+    def _log_dedup_stats(self) -> None:
+        stats = self.dedup.stats()
+        logger.info(
+            "Frame dedup: %d lookups, %d duplicates dropped (hit rate %.1f%%; %d in flight, %d from store), "
+            "%d entries, %d evicted",
+            stats["lookups"], stats["hits"], 100.0 * stats["hit_rate"],
+            stats["in_flight_hits"], stats["store_hits"], stats["entries"], stats["evictions"],
+        )
+        if self._connection is not None and self._connection.is_open:
+            self._connection.call_later(self.dedup_log_interval, self._log_dedup_stats)
+
+    def _log_error_stats(self) -> None:
+        for packet_name, rate in sorted(self.error_rates.snapshot().items()):
+            logger.info(
+                "Errors for %s: %d of %d frames in the last %.0fs%s",
+                packet_name, rate["errors"], rate["frames"], 2 * self.error_rates.window,
+                f"; throttled, {rate['skipped']} frames skipped" if rate["throttled"] else "",
+            )
+        stats = self.errors.stats()
+        if stats["reported"]:
+            logger.info("Error events: %d reported, %d published, %d dropped, %d queued",
+                        stats["reported"], stats["published"], stats["dropped"], stats["queued"])
+        if self._connection is not None and self._connection.is_open:
+            self._connection.call_later(self.error_log_interval, self._log_error_stats)
+
+    def _decode_message(self, body: bytes, properties: Optional[pika.BasicProperties] = None) -> DecodeResult:
         """
+        Decode one raw health message (decode thread), a raw frame or
+        legacy OpenC3 JSON (see raw_frames.py). Returns the body to publish,
+        or an empty result when the message should just be acked.
+        """
+        frame = None
+        if properties is not None:
+            frame = frame_from_message(properties.content_type, properties.headers, body)
+        if frame is not None:
+            packet_name, raw_frame = frame
+            return self._decode_frame(packet_name, raw_frame)
+
         try:
             msg = json.loads(body.decode("utf-8"))
         except Exception as e:
-            logger.exception("Failed to parse JSON from message: %s", e)
+            logger.error("Failed to parse JSON from message: %s", e)
+            self.errors.report(KIND_DECODE_FAILED, "<unparsed>", f"bad JSON: {e}", body)
             # Nothing else we can do; ack to avoid poison loop
-            ch.basic_ack(delivery_tag=method.delivery_tag)
-            return
+            return DecodeResult()
 
         packet_name = msg.get("__packet", "<no __packet>")
         buffer_b64 = msg.get("buffer")
 
         if not buffer_b64:
             logger.warning("Message missing 'buffer' field for packet %s", packet_name)
-            ch.basic_ack(delivery_tag=method.delivery_tag)
-            return
+            self.errors.report(KIND_DECODE_FAILED, packet_name, "missing buffer field", body)
+            return DecodeResult()
 
-        # Convert base64 buffer to hex string
+        # Convert base64 buffer to raw frame bytes
         try:
-            hex_str = _decode_buffer_to_hex(buffer_b64)
+            raw_frame = decode_buffer(buffer_b64)
         except Exception as e:
-            logger.exception("Error converting buffer to hex for packet %s", packet_name)
-            # Log error via logging, or publish to an error topic if desired.
-            # For now, just ack and move on to prevent poison pill.
-            ch.basic_ack(delivery_tag=method.delivery_tag)
-            return
+            logger.warning("Error decoding buffer for packet %s: %s", packet_name, e)
+            self.errors.report(KIND_DECODE_FAILED, packet_name, f"bad base64 buffer: {e}", buffer_b64)
+            # Ack and move on to prevent poison pill
+            return DecodeResult()
+        return self._decode_frame(packet_name, raw_frame)
 
-        # Find decoder
+    def _decode_frame(self, packet_name: str, raw_frame: bytes) -> DecodeResult:
+        """
+        Throttle and dedup checks, then decode (decode thread).
+        """
+        if not self.error_rates.admit(packet_name):
+            return DecodeResult()
+
+        if self.dedup is None:
+            return self._decode_packet(packet_name, raw_frame)
+
+        # Drop exact repeats before spending any time decoding them
+        key = frame_fingerprint(packet_name, raw_frame)
+        if not self.dedup.claim(key):
+            logger.debug("Dropping duplicate frame for packet %s", packet_name)
+            return DecodeResult()
+        try:
+            result = self._decode_packet(packet_name, raw_frame)
+        except Exception:
+            self.dedup.release(key)
+            raise
+        result.dedup_key = key
+        return result
+
+    def _decode_packet(self, packet_name: str, raw_frame: bytes) -> DecodeResult:
+        """
+        Decode one raw frame and encode it for telemetry.decoded.
+        """
         # Find decoder
         try:
-            core_name, decoder_fn = _get_decoder_for_packet(packet_name)
+            decoder = self.decoders.get(packet_name)
         except DecoderNotFound as e:
-            logger.warning("Decoder not found for packet %s: %s", packet_name, e)
-            # You could publish a "decoder.error" event here
-            ch.basic_ack(delivery_tag=method.delivery_tag)
-            return
+            logger.debug("Decoder not found for packet %s: %s", packet_name, e)
+            self.error_rates.record(packet_name, ok=False)
+            self.errors.report(KIND_NOT_FOUND, packet_name, str(e), raw_frame)
+            return DecodeResult()
 
-        # Run decoder
-        # Run decoder
+        # Run decoder (frame ABI; legacy hex decoders go through the registry's shim)
         try:
-            segments = decoder_fn(hex_str)
+            if self.columnar and decoder.decode_columns is not None:
+                columns = to_pylists(decoder.decode_columns(memoryview(raw_frame)))
+                segments = None
+                n_rows = num_rows(columns)
+            else:
+                columns = None
+                segments = decoder.decode_frame(memoryview(raw_frame))
+                n_rows = len(segments)
         except Exception as e:
-            logger.exception("Decoder error for packet %s", packet_name)
-            # Log error via logging, or publish to an error topic if desired.
-            # For now, just ack and move on to prevent poison pill.
-            ch.basic_ack(delivery_tag=method.delivery_tag)
-            return
+            logger.debug("Decoder error for packet %s", packet_name, exc_info=True)
+            self.error_rates.record(packet_name, ok=False)
+            self.errors.report(KIND_DECODE_FAILED, packet_name, f"decoder error: {e!r}", raw_frame)
+            # Ack and move on to prevent poison pill
+            return DecodeResult()
+
+        if not n_rows:
+            logger.debug("Decoder returned no segments for packet %s", packet_name)
+            self.error_rates.record(packet_name, ok=False)
+            self.errors.report(KIND_DECODE_FAILED, packet_name, "decoder returned no segments", raw_frame)
+            return DecodeResult()
+        self.error_rates.record(packet_name, ok=True)
+
+        # Encode here, off the I/O thread; the publisher only joins encoded packets.
+        # Routing key could be the packet name or "decoded.<packet_name>"
+        return DecodeResult(
+            routing_key=packet_name,
+            data=self.wire_format.encode_packet(rows=segments, columns=columns,
+                                                column_types=decoder.column_types),
+            rows=n_rows,
+            column_types=decoder.column_types,
+        )
 
-        if not segments:
-            logger.info("Decoder returned no segments for packet %s. Hex payload: %s", packet_name, hex_str)
-            ch.basic_ack(delivery_tag=method.delivery_tag)
-            return
 
-        # Publish decoded data to next exchange
-        try:
-            # Construct payload
-            # "segments" is a List[Dict]. We wrap it.
-            payload = {
-                "meta": {
-                    "packet_name": packet_name,
-                    "timestamp": datetime.datetime.utcnow().isoformat() + "Z"
-                },
-                "data": segments
-            }
-            
-            # Routing key could be the packet name or "decoded.<packet_name>"
-            routing_key = packet_name
-            
-            self._publisher_channel.basic_publish(
-                exchange=self.output_exchange,
-                routing_key=routing_key,
-                body=json.dumps(payload, default=str),
-                properties=pika.BasicProperties(
-                    delivery_mode=2,  # make message persistent
-                    content_type='application/json'
-                )
-            )
+def _run_worker(index: int) -> None:
+    """
+    Entry point of one decode worker process.
+    """
+    setup_logging()
+    logger.info("Decode worker %d starting (pid %d)", index, os.getpid())
+    try:
+        HealthConsumerService().run_forever()
+    except KeyboardInterrupt:
+        pass
 
-            logger.info(
-                "Published %d decoded rows to exchange '%s' key '%s'",
-                len(segments),
-                self.output_exchange,
-                routing_key,
-            )
-        except Exception as e:
-            logger.exception("Error publishing decoded message for packet %s", packet_name)
-            # If we fail to publish, we should probably NACK so we retry
-            # But for simplicity here, just logging. 
 
-        # Finally, ack the message so it is removed from the queue
-        ch.basic_ack(delivery_tag=method.delivery_tag)
+def run_worker_pool(num_workers: int) -> None:
+    """
+    Run `num_workers` decode processes. Each one opens its own connection
+    and consumes every health queue; RabbitMQ spreads deliveries across
+    them (bounded by HEALTH_PREFETCH), so decoding scales across cores.
+    Workers that exit are restarted.
+    """
+    workers: Dict[int, multiprocessing.Process] = {}
+
+    def start(index: int) -> None:
+        proc = multiprocessing.Process(
+            target=_run_worker, args=(index,), name=f"health-decode-{index}", daemon=True
+        )
+        proc.start()
+        workers[index] = proc
+
+    for i in range(num_workers):
+        start(i)
+    logger.info("Started %d decode worker processes", num_workers)
+
+    try:
+        while True:
+            time.sleep(5.0)
+            for i, proc in list(workers.items()):
+                if not proc.is_alive():
+                    logger.error("Decode worker %d exited with code %s; restarting", i, proc.exitcode)
+                    start(i)
+    except KeyboardInterrupt:
+        logger.info("KeyboardInterrupt: stopping decode workers")
+    finally:
+        for proc in workers.values():
+            if proc.is_alive():
+                proc.terminate()
+        for proc in workers.values():
+            proc.join(timeout=5.0)
 
 
 def main() -> None:
     setup_logging()
     logger.info("Starting health_consumer service (RabbitMQ -> decoders -> Postgres)...")
+    num_workers = int(os.getenv("HEALTH_DECODE_WORKERS", "1"))
+    if num_workers > 1:
+        run_worker_pool(num_workers)
+        return
     svc = HealthConsumerService()
     svc.run_forever()
 
@@ -0,0 +1,253 @@
+# netra_backend/services/ingest_pipeline.py
+import asyncio
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from netra_backend.common.messaging.rabbitmq import RabbitMQPublisher
+from netra_backend.common.messaging.raw_frames import Message, json_message
+
+logger = logging.getLogger("ws_ingestor")
+
+# ---------------------------------------------------------
+# Asyncio ingest pipeline (WS_INGEST_MODE=async)
+# ---------------------------------------------------------
+#
+#   reader thread            queue (bounded)              publisher task
+#   OpenC3 api.read() ──> [ pkt, pkt, ... ] ──> drain up to WS_PUBLISH_BATCH ──> AMQP thread
+#   (no sleep between        WS_QUEUE_MAX packets         packets, publish them back
+#    reads)                  WS_OVERFLOW policy           to back on one connection
+#
+# The OpenC3 client and pika are blocking, so the websocket read and the
+# AMQP publishes each run on one dedicated thread; the event loop owns the
+# queue and joins the stages. The reader never waits for the broker: a slow
+# broker only fills the queue, and then WS_OVERFLOW decides:
+#
+#   block        the reader waits for room (backpressure: OpenC3 buffers,
+#                nothing is lost) - default
+#   drop_oldest  the oldest queued packet makes room (freshest data wins)
+#   drop_newest  the incoming packet is dropped
+#
+# Batches are whatever is queued when the publisher is free (no timer), so
+# an idle stream publishes each packet at once and a backlog goes out
+# WS_PUBLISH_BATCH at a time.
+#
+# Every WS_METRICS_LOG_S the queue depth (current / peak / capacity),
+# drops and per-stage latency are logged: enqueue wait (reader blocked by
+# backpressure), queue wait, publish (per batch) and end-to-end (read ->
+# published), plus the lag behind the OpenC3 packet time (__time).
+
+OVERFLOW_POLICIES = ("block", "drop_oldest", "drop_newest")
+
+
+class _Latency:
+    """Count, mean and max of one stage over a metrics interval."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def take(self) -> str:
+        text = (f"avg {self.total / self.count * 1000.0:.1f} ms max {self.max * 1000.0:.1f} ms"
+                if self.count else "-")
+        self.count, self.total, self.max = 0, 0.0, 0.0
+        return text
+
+
+@dataclass
+class _Item:
+    pkt: Dict
+    read_at: float      # monotonic, when the reader got it
+    queued_at: float = 0.0
+
+
+class AsyncIngestPipeline:
+    def __init__(self, publisher_factory: Callable[[], RabbitMQPublisher],
+                 encode: Callable[[Dict], Message] = json_message,
+                 queue_max: int = 10000, overflow: str = "block",
+                 batch_size: int = 200, metrics_interval: float = 60.0):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"WS_OVERFLOW must be one of {OVERFLOW_POLICIES}, not {overflow!r}")
+        self.publisher_factory = publisher_factory
+        # Runs on the AMQP thread for each packet: packet -> telemetry.raw
+        # message (raw_frames.py; ws_ingestor also archives the frame here)
+        self.encode = encode
+        self.queue_max = max(1, queue_max)
+        self.overflow = overflow
+        self.batch_size = max(1, batch_size)
+        self.metrics_interval = metrics_interval
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        # One thread owns the pika connection
+        self._amqp = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ws-amqp")
+        self._publisher: Optional[RabbitMQPublisher] = None
+
+        self.received = 0
+        self.published = 0
+        self.dropped = 0
+        self.peak_depth = 0
+        self._enqueue_wait = _Latency()
+        self._queue_wait = _Latency()
+        self._publish = _Latency()
+        self._end_to_end = _Latency()
+        self._source_lag = _Latency()
+
+    @classmethod
+    def from_env(cls, publisher_factory: Callable[[], RabbitMQPublisher],
+                 encode: Callable[[Dict], Message] = json_message) -> "AsyncIngestPipeline":
+        return cls(
+            publisher_factory,
+            encode,
+            queue_max=int(os.getenv("WS_QUEUE_MAX", "10000")),
+            overflow=os.getenv("WS_OVERFLOW", "block").lower(),
+            batch_size=int(os.getenv("WS_PUBLISH_BATCH", "200")),
+            metrics_interval=float(os.getenv("WS_METRICS_LOG_S", "60")),
+        )
+
+    # ----- reader side (reader thread) -----
+
+    def on_batch(self, batch: List[Dict]) -> None:
+        """OpenC3Streamer batch callback; blocks only under the 'block' policy."""
+        read_at = time.monotonic()
+        future = asyncio.run_coroutine_threadsafe(self._enqueue(batch, read_at), self._loop)
+        future.result()
+
+    async def _enqueue(self, batch: List[Dict], read_at: float) -> None:
+        queue = self._queue
+        for pkt in batch:
+            item = _Item(pkt, read_at)
+            self.received += 1
+            if queue.full():
+                if self.overflow == "drop_newest":
+                    self.dropped += 1
+                    continue
+                if self.overflow == "drop_oldest":
+                    queue.get_nowait()
+                    self.dropped += 1
+                else:
+                    await queue.put(item)
+                    item.queued_at = time.monotonic()
+                    self._enqueue_wait.observe(item.queued_at - read_at)
+                    continue
+            item.queued_at = time.monotonic()
+            queue.put_nowait(item)
+        depth = queue.qsize()
+        if depth > self.peak_depth:
+            self.peak_depth = depth
+
+    # ----- publisher side -----
+
+    async def _publish_loop(self) -> None:
+        queue = self._queue
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < self.batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+            now = time.monotonic()
+            for item in batch:
+                self._queue_wait.observe(now - item.queued_at)
+
+            try:
+                sent = await self._loop.run_in_executor(self._amqp, self._publish_batch, batch)
+            except Exception:
+                logger.exception("Error publishing %d packets; dropping them", len(batch))
+                sent = 0
+            self.dropped += len(batch) - sent
+            done = time.monotonic()
+            self._publish.observe(done - now)
+            self.published += sent
+            wall_ns = time.time_ns()
+            for item in batch[:sent]:
+                self._end_to_end.observe(done - item.read_at)
+                packet_time = item.pkt.get("__time")
+                if isinstance(packet_time, int):
+                    self._source_lag.observe(max(0, wall_ns - packet_time) / 1e9)
+
+    def _ensure_publisher(self) -> RabbitMQPublisher:
+        """AMQP thread."""
+        if self._publisher is None:
+            self._publisher = self.publisher_factory()
+        return self._publisher
+
+    def _publish_batch(self, batch: List[_Item]) -> int:
+        """AMQP thread."""
+        publisher = self._ensure_publisher()
+        messages: List[Message] = []
+        for item in batch:
+            try:
+                messages.append(self.encode(item.pkt))
+            except Exception:
+                logger.exception("Cannot encode %s; publishing it as JSON",
+                                 item.pkt.get("__packet", "<no __packet field>"))
+                messages.append(json_message(item.pkt))
+        logger.debug("Publishing %d packets to RabbitMQ", len(messages))
+        return publisher.publish_batch(messages)
+
+    # ----- metrics -----
+
+    async def _metrics_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.metrics_interval)
+            logger.info(
+                "Ingest: %d received, %d published, %d dropped (%s); queue %d / peak %d / max %d",
+                self.received, self.published, self.dropped, self.overflow,
+                self._queue.qsize(), self.peak_depth, self.queue_max,
+            )
+            logger.info(
+                "Ingest latency: enqueue wait %s; queue wait %s; publish/batch %s; end-to-end %s; "
+                "behind OpenC3 %s",
+                self._enqueue_wait.take(), self._queue_wait.take(), self._publish.take(),
+                self._end_to_end.take(), self._source_lag.take(),
+            )
+            self.peak_depth = self._queue.qsize()
+
+    # ----- lifecycle -----
+
+    async def run(self, streamer) -> None:
+        """
+        Run until the reader stops. `streamer` is an OpenC3Streamer built
+        with on_batch=pipeline.on_batch.
+        """
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=self.queue_max)
+        logger.info("Async ingest: queue %d packets (%s on overflow), batches of up to %d",
+                    self.queue_max, self.overflow, self.batch_size)
+
+        # Connect and declare the packet queues before the first packet arrives
+        await self._loop.run_in_executor(self._amqp, self._ensure_publisher)
+
+        tasks = [asyncio.create_task(self._publish_loop(), name="ws-publish")]
+        if self.metrics_interval > 0:
+            tasks.append(asyncio.create_task(self._metrics_loop(), name="ws-metrics"))
+        reader = threading.Thread(target=streamer.run_forever, kwargs={"reconnect_delay": 5.0},
+                                  name="ws-reader", daemon=True)
+        reader.start()
+        try:
+            # The reader only returns on stop / KeyboardInterrupt
+            while reader.is_alive():
+                await asyncio.sleep(0.5)
+        finally:
+            streamer.stop_event.set()
+            # Publish what was read before stopping (bounded, the broker may be gone)
+            deadline = time.monotonic() + 10.0
+            while not self._queue.empty() and time.monotonic() < deadline and not tasks[0].done():
+                await asyncio.sleep(0.05)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self._amqp.shutdown(wait=True)
+            if self._publisher is not None:
+                # Unconfirmed messages stay in the spool for the next run
+                self._publisher.close()
@@ -0,0 +1,325 @@
+# netra_backend/services/shard_claims.py
+import functools
+import json
+import logging
+import os
+import socket
+import time
+import uuid
+from typing import Callable, Dict, List, Optional, Set
+
+import pika
+import pika.exceptions
+
+from netra_backend.common.messaging.raw_topology import SHARD_WEIGHT, RawTopology
+
+logger = logging.getLogger("health_consumer")
+
+# ---------------------------------------------------------
+# Shard claims of a health consumer replica (RAW_TOPOLOGY=sharded)
+# ---------------------------------------------------------
+#
+# Replicas find each other through heartbeats on a fanout exchange
+# (RABBITMQ_MEMBERS_EXCHANGE): each one publishes {"member", "shards",
+# "claimed"} every HEALTH_SHARD_HEARTBEAT_S into an exclusive queue per
+# replica, and forgets members not heard from for 3 heartbeats. On every
+# heartbeat each replica orders the live members by id and should consume
+# shard i when i % members == its own position - so replicas joining,
+# leaving or dying rebalance the shards within a few heartbeats.
+#
+# Handovers keep per-packet order:
+#
+#   release   The old owner stops dispatching the shard's deliveries (new
+#             ones are held, not decoded) and waits until every delivery
+#             already dispatched is acked or requeued (settled()). Only
+#             then does it cancel its consumer and requeue the held
+#             deliveries, which go back to the head of the queue. It lists
+#             the shard in its heartbeats ("claimed") until then.
+#   claim     A replica subscribes to a shard only once no other live
+#             member's heartbeat lists it, i.e. after the old owner has
+#             finished (or died and been forgotten).
+#
+# Shard queues are also single-active-consumer, so even when replicas
+# disagree for a moment the broker lets one consumer at a time take a
+# shard.
+#
+# Shard count changes: shard queues are declared and bound for 0 ..
+# RAW_SHARDS-1. Shard queues found beyond that are unbound from the hash
+# exchange, drained by whoever claims them, and deleted once empty. The
+# consistent-hash exchange moves only about 1/RAW_SHARDS of the packets;
+# their frames already queued on the old shard can interleave once with
+# the first ones on the new shard.
+
+# Shard queues beyond RAW_SHARDS looked for at startup (left by a larger RAW_SHARDS)
+_RETIRED_PROBE = 64
+
+
+class ShardClaims:
+    """Claims of one replica; I/O thread only (BlockingConnection timers)."""
+
+    def __init__(self, connection: pika.BlockingConnection,
+                 channel: pika.adapters.blocking_connection.BlockingChannel,
+                 topology: RawTopology,
+                 input_exchange: str,
+                 on_message: Callable,
+                 heartbeat: float = 5.0,
+                 members_exchange: str = "netra.health.members"):
+        self.connection = connection
+        self.channel = channel
+        self.topology = topology
+        self.input_exchange = input_exchange
+        self.on_message = on_message
+        self.heartbeat = heartbeat
+        self.members_exchange = members_exchange
+        self.member_id = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+
+        self._member_channel = None
+        # member id -> last heartbeat (monotonic)
+        self._members: Dict[str, float] = {}
+        # member id -> shards its last heartbeat listed as claimed
+        self._member_claims: Dict[str, Set[int]] = {}
+        # shard index -> consumer tag
+        self._claimed: Dict[int, str] = {}
+        # Shards being released: index -> deliveries held back (not dispatched) meanwhile
+        self._releasing: Dict[int, List[int]] = {}
+        # Dispatched deliveries not settled yet: shard index -> delivery tags, and back
+        self._outstanding: Dict[int, Set[int]] = {}
+        self._tag_shard: Dict[int, int] = {}
+        # Shard queues beyond RAW_SHARDS still being drained; index -> cancelled when empty
+        self._retired: Dict[int, bool] = {}
+        self._mismatch_logged = False
+
+    @classmethod
+    def from_env(cls, connection, channel, topology: RawTopology, input_exchange: str,
+                 on_message: Callable) -> "ShardClaims":
+        return cls(
+            connection, channel, topology, input_exchange, on_message,
+            heartbeat=float(os.getenv("HEALTH_SHARD_HEARTBEAT_S", "5")),
+            members_exchange=os.getenv("RABBITMQ_MEMBERS_EXCHANGE", "netra.health.members"),
+        )
+
+    # ----- setup -----
+
+    def start(self, packet_names: List[str]) -> None:
+        """Declare the topology, join the members and claim a first share."""
+        ch = self.channel
+        ch.exchange_declare(exchange=self.topology.shard_exchange, exchange_type="x-consistent-hash",
+                            durable=True)
+        for pkt_name in packet_names:
+            ch.exchange_bind(destination=self.topology.shard_exchange, source=self.input_exchange,
+                             routing_key=pkt_name)
+        for index in range(self.topology.shards):
+            queue_name = self.topology.shard_queue(index)
+            ch.queue_declare(queue=queue_name, durable=True,
+                             arguments={"x-single-active-consumer": True})
+            ch.queue_bind(queue=queue_name, exchange=self.topology.shard_exchange, routing_key=SHARD_WEIGHT)
+        logger.info("Routed %d health packets to %d shard queues on %s",
+                    len(packet_names), self.topology.shards, self.topology.shard_exchange)
+
+        for index in range(self.topology.shards, self.topology.shards + _RETIRED_PROBE):
+            if self._message_count(self.topology.shard_queue(index)) is not None:
+                # No new frames; claimed and drained like the others
+                ch.queue_unbind(queue=self.topology.shard_queue(index),
+                                exchange=self.topology.shard_exchange, routing_key=SHARD_WEIGHT)
+                self._retired[index] = False
+        if self._retired:
+            logger.warning("Shard queues %s are beyond RAW_SHARDS=%d; draining and removing them",
+                           sorted(self._retired), self.topology.shards)
+
+        mc = self.connection.channel()
+        mc.exchange_declare(exchange=self.members_exchange, exchange_type="fanout", durable=True)
+        member_queue = mc.queue_declare(queue="", exclusive=True).method.queue
+        mc.queue_bind(exchange=self.members_exchange, queue=member_queue)
+        mc.basic_consume(queue=member_queue, on_message_callback=self._on_member, auto_ack=True)
+        self._member_channel = mc
+
+        # Claim nothing before the other members' heartbeats (and claims) are known
+        logger.info("Joined health consumer members as %s; claiming shards in %.0fs",
+                    self.member_id, self.heartbeat)
+        self._beat()
+        self.connection.call_later(self.heartbeat, self._tick)
+
+    def _message_count(self, queue_name: str) -> Optional[int]:
+        """Ready messages in a queue; None when it does not exist."""
+        # A passive declare of a missing queue closes the channel, so probe on a spare one
+        probe = self.connection.channel()
+        try:
+            return probe.queue_declare(queue=queue_name, passive=True).method.message_count
+        except pika.exceptions.ChannelClosedByBroker:
+            return None
+        finally:
+            if probe.is_open:
+                probe.close()
+
+    # ----- membership -----
+
+    def _on_member(self, ch, method, properties, body: bytes) -> None:
+        try:
+            beat = json.loads(body.decode("utf-8"))
+            member = beat["member"]
+        except Exception:
+            logger.warning("Ignoring malformed member heartbeat: %r", body)
+            return
+        self._members[member] = time.monotonic()
+        if member != self.member_id:
+            self._member_claims[member] = set(beat.get("claimed") or ())
+        if beat.get("shards") != self.topology.shards and not self._mismatch_logged:
+            self._mismatch_logged = True
+            logger.warning("Member %s runs with RAW_SHARDS=%s, this one with %d",
+                           member, beat.get("shards"), self.topology.shards)
+
+    def _beat(self) -> None:
+        self._members[self.member_id] = time.monotonic()
+        self._member_channel.basic_publish(
+            exchange=self.members_exchange,
+            routing_key="",
+            body=json.dumps({"member": self.member_id, "shards": self.topology.shards,
+                             "claimed": sorted(set(self._claimed) | set(self._releasing))}).encode("utf-8"),
+        )
+
+    def members(self) -> List[str]:
+        deadline = time.monotonic() - 3 * self.heartbeat
+        for member, seen in list(self._members.items()):
+            if seen < deadline and member != self.member_id:
+                logger.info("Member %s left", member)
+                del self._members[member]
+                self._member_claims.pop(member, None)
+        return sorted(self._members)
+
+    def _held_elsewhere(self, index: int) -> bool:
+        """Another live member's last heartbeat lists the shard as claimed."""
+        return any(index in shards for member, shards in self._member_claims.items()
+                   if member in self._members)
+
+    # ----- claims -----
+
+    def _tick(self) -> None:
+        try:
+            self._beat()
+            self._rebalance()
+            self._drain_retired()
+        except Exception:
+            logger.exception("Error updating shard claims")
+        if self.connection.is_open:
+            self.connection.call_later(self.heartbeat, self._tick)
+
+    def assignment(self) -> List[int]:
+        """Shard indexes this replica should consume now."""
+        members = self.members()
+        position = members.index(self.member_id)
+        shards = list(range(self.topology.shards)) + sorted(self._retired)
+        return [s for i, s in enumerate(shards) if i % len(members) == position]
+
+    def _rebalance(self) -> None:
+        wanted = set(self.assignment())
+        claimed = set(self._claimed)
+        changed = False
+        for index in sorted(claimed - wanted):
+            if index not in self._releasing:
+                self._release(index)
+                changed = True
+        waiting = []
+        for index in sorted(wanted - claimed):
+            if index in self._releasing:
+                continue
+            if self._held_elsewhere(index):
+                # The old owner is still finishing its deliveries
+                waiting.append(index)
+                continue
+            if index in self._retired:
+                if self._retired[index]:
+                    continue
+                if self._message_count(self.topology.shard_queue(index)) is None:
+                    # Drained and removed by another replica
+                    del self._retired[index]
+                    continue
+            self._claimed[index] = self.channel.basic_consume(
+                queue=self.topology.shard_queue(index),
+                on_message_callback=functools.partial(self._dispatch, index),
+                auto_ack=False,
+            )
+            changed = True
+        if changed:
+            logger.info("Consuming shards %s (%d members)",
+                        sorted(set(self._claimed) - set(self._releasing)), len(self._members))
+        if waiting:
+            logger.info("Waiting for shards %s to be released by their previous owner", waiting)
+
+    # ----- deliveries -----
+
+    def _dispatch(self, index: int, ch, method, properties, body: bytes) -> None:
+        if index in self._releasing:
+            # Released: hold it back, requeued once the earlier deliveries are settled
+            self._releasing[index].append(method.delivery_tag)
+            return
+        self._outstanding.setdefault(index, set()).add(method.delivery_tag)
+        self._tag_shard[method.delivery_tag] = index
+        self.on_message(ch, method, properties, body)
+
+    def settled(self, delivery_tags: List[int]) -> None:
+        """Dispatched deliveries were acked or requeued (I/O thread)."""
+        for tag in delivery_tags:
+            index = self._tag_shard.pop(tag, None)
+            if index is None:
+                continue
+            outstanding = self._outstanding.get(index)
+            if outstanding is not None:
+                outstanding.discard(tag)
+            if index in self._releasing and not outstanding:
+                self._finish_release(index)
+
+    def _release(self, index: int) -> None:
+        """Stop dispatching a shard; it is handed over once its deliveries are settled."""
+        self._releasing[index] = []
+        if not self._outstanding.get(index):
+            self._finish_release(index)
+        else:
+            logger.info("Releasing shard %d after %d outstanding deliveries",
+                        index, len(self._outstanding[index]))
+
+    def _finish_release(self, index: int) -> None:
+        held = self._releasing.pop(index)
+        self._outstanding.pop(index, None)
+        consumer_tag = self._claimed.pop(index)
+        if self.channel.is_open:
+            # Deliveries pika buffered but did not dispatch are requeued by the cancel
+            self.channel.basic_cancel(consumer_tag)
+            for tag in held:
+                self.channel.basic_nack(delivery_tag=tag, requeue=True)
+        logger.info("Released shard %d (%d held deliveries requeued)", index, len(held))
+        if self._member_channel is not None and self._member_channel.is_open:
+            # Tell the new owner right away instead of at the next heartbeat
+            self._beat()
+
+    def _drain_retired(self) -> None:
+        """
+        Retired shards this replica holds: release them once empty, and
+        delete them once released (the last deliveries are settled).
+        """
+        for index, cancelled in list(self._retired.items()):
+            queue_name = self.topology.shard_queue(index)
+            if cancelled:
+                if index in self._releasing:
+                    continue
+                probe = self.connection.channel()
+                try:
+                    probe.queue_delete(queue=queue_name, if_empty=True)
+                    logger.info("Removed drained shard queue %s", queue_name)
+                    del self._retired[index]
+                except pika.exceptions.ChannelClosedByBroker:
+                    # Frames arrived after all (an older replica re-bound it); drain again
+                    self._retired[index] = False
+                finally:
+                    if probe.is_open:
+                        probe.close()
+                continue
+            if index not in self._claimed or index in self._releasing:
+                continue
+            if self._message_count(queue_name) == 0:
+                self._release(index)
+                self._retired[index] = True
+
+    def stats(self) -> Dict[str, object]:
+        return {"member": self.member_id, "members": len(self._members),
+                "shards": sorted(set(self._claimed) - set(self._releasing)),
+                "releasing": sorted(self._releasing), "retired": sorted(self._retired)}
@@ -1,51 +1,110 @@
 # netra_backend/services/ws_ingestor.py
+import asyncio
 import logging
-from typing import Dict, List
+import os
+import time
+from typing import Dict, List, Optional
 
 from netra_backend.logging_config import setup_logging
 from netra_backend.openc3.streamer import OpenC3Streamer
 from netra_backend.config import get_openc3_config
 from netra_backend.common.messaging.rabbitmq import RabbitMQPublisher
+from netra_backend.common.messaging.raw_frames import Message, RawFrameEncoder
+from netra_backend.archive.frame_archive import FrameArchive
+from netra_backend.services.ingest_pipeline import AsyncIngestPipeline
 
 logger = logging.getLogger("ws_ingestor")
 
 
-def handle_packet_factory(publisher: RabbitMQPublisher):
+def encoder_factory(archive: Optional[FrameArchive] = None):
     """
-    Returns a handle_packet function that publishes each packet to RabbitMQ.
+    Returns an encode function: OpenC3 packet -> telemetry.raw message in
+    the WS_RAW_FORMAT format (see raw_frames.py). The raw frame is
+    archived first, at its OpenC3 packet time (__time, ns) when present,
+    when an archive is configured.
     """
+    encoder = RawFrameEncoder(os.getenv("WS_RAW_FORMAT", "json").lower())
 
-    def handle_packet(pkt: Dict) -> None:
-        # Packet name from OpenC3
-        pkt_name = pkt.get("__packet", "<no __packet field>")
-        routing_key = pkt_name
+    def encode(pkt: Dict) -> Message:
+        message, frame = encoder.encode(pkt)
+        if archive is not None and frame is not None:
+            pkt_name = pkt.get("__packet", "<no __packet field>")
+            ts_ns = pkt.get("__time")
+            try:
+                archive.append(pkt_name, frame, ts_ns if isinstance(ts_ns, int) else time.time_ns())
+            except Exception:
+                # A full disk must not stop the live stream
+                logger.exception("Failed to archive frame for %s", pkt_name)
+        return message
 
-        logger.info("Publishing packet to RabbitMQ: %s (RK=%s)", pkt_name, routing_key)
+    return encode
 
-        # We send the packet as-is (no modification)
-        publisher.publish_json(routing_key, pkt)
 
-    return handle_packet
+def handle_packet_factory(publisher: RabbitMQPublisher, archive: Optional[FrameArchive] = None):
+    """
+    Returns a handle_packet function that publishes each packet to RabbitMQ
+    (and archives its raw frame first, when an archive is configured).
+    """
+    encode = encoder_factory(archive)
 
+    def handle_packet(pkt: Dict) -> None:
+        routing_key, body, content_type, headers = encode(pkt)
+        logger.info("Publishing packet to RabbitMQ: %s (%s)", routing_key, content_type or "json")
+        publisher.publish(routing_key, body, content_type, headers)
 
-def main() -> None:
-    setup_logging()
-    logger.info("Starting ws_ingestor service (OpenC3 WebSocket -> RabbitMQ)...")
+    return handle_packet
 
-    # Create RabbitMQ publisher
+
+def _make_publisher() -> RabbitMQPublisher:
     publisher = RabbitMQPublisher(exchange="telemetry.raw")
 
     # Use the same packet list that OpenC3Streamer uses, to create queues
     cfg = get_openc3_config()
     all_packets: List[str] = cfg.packets_tlm + cfg.packets_cmd
     publisher.setup_queues_for_packets(all_packets)
+    return publisher
+
+
+def _run_async(archive: Optional[FrameArchive]) -> None:
+    """
+    WS_INGEST_MODE=async: websocket reader, bounded queue and batching
+    publisher as separate stages (see ingest_pipeline.py).
+    """
+    pipeline = AsyncIngestPipeline.from_env(_make_publisher, encoder_factory(archive))
+    streamer = OpenC3Streamer(on_batch=pipeline.on_batch)
+    asyncio.run(pipeline.run(streamer))
 
-    # Build a callback that uses this publisher
-    handle_packet = handle_packet_factory(publisher)
 
-    # Start streaming from OpenC3
-    streamer = OpenC3Streamer(on_packet=handle_packet)
-    streamer.run_forever(reconnect_delay=5.0)
+def main() -> None:
+    setup_logging()
+    logger.info("Starting ws_ingestor service (OpenC3 WebSocket -> RabbitMQ)...")
+
+    # Raw frame archive for re-decoding (ARCHIVE_DIR; off when unset)
+    archive = FrameArchive.from_env()
+    publisher: Optional[RabbitMQPublisher] = None
+
+    try:
+        if os.getenv("WS_INGEST_MODE", "sync").lower() == "async":
+            _run_async(archive)
+            return
+
+        # Create RabbitMQ publisher
+        publisher = _make_publisher()
+
+        # Build a callback that uses this publisher
+        handle_packet = handle_packet_factory(publisher, archive)
+
+        # Start streaming from OpenC3
+        streamer = OpenC3Streamer(on_packet=handle_packet)
+        streamer.run_forever(reconnect_delay=5.0)
+    except KeyboardInterrupt:
+        logger.info("KeyboardInterrupt: stopping ws_ingestor")
+    finally:
+        if publisher is not None:
+            # Unconfirmed messages stay in the spool for the next run
+            publisher.close()
+        if archive is not None:
+            archive.close()
 
 
 if __name__ == "__main__":
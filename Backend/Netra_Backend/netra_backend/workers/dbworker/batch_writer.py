@@ -0,0 +1,176 @@
+# netra_backend/workers/dbworker/batch_writer.py
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+import psycopg2
+
+from netra_backend.common.messaging.error_events import KIND_DB_FAILED, ErrorReporter
+from netra_backend.db_client import PostgresClient
+
+logger = logging.getLogger("db_worker")
+
+# ---------------------------------------------------------
+# Cross-message batching for the DB worker
+# ---------------------------------------------------------
+#
+# Decoded rows from many AMQP messages are buffered per (table, columns)
+# and written together:
+#
+#     writer.add(packet_name, table, keys, values)   # per decoded packet
+#     writer.done(tag, len(body))                    # every message, rows or not
+#     if writer.should_flush():
+#         tags = writer.flush()        # one transaction, COPY per table
+#         ... ack tags ...
+#
+# flush() commits before it returns the delivery tags it covered, so
+# acking them never acks rows that are not in Postgres. Each table group
+# runs in its own savepoint: a group that Postgres rejects (type mismatch,
+# constraint) is reported to telemetry.errors (DECODER_FAILED, with a few
+# of its rows as the payload) and the rest of the flush still commits;
+# without an ErrorReporter it is inserted into DECODER_FAILED directly.
+# Connection errors abort the whole flush and propagate; the caller
+# requeues the messages.
+
+_RowKey = Tuple[str, Tuple[str, ...]]
+
+# Errors that mean the connection (not the data) is the problem
+_CONNECTION_ERRORS = (psycopg2.OperationalError, psycopg2.InterfaceError)
+
+# Rows of a rejected group sent along with its error event
+_SAMPLE_ROWS = 10
+
+
+@dataclass
+class _TableBatch:
+    table: str
+    keys: List[str]
+    values: List[Sequence[Any]] = field(default_factory=list)
+    # (packet_name, payload label) for DECODER_FAILED
+    sources: Set[Tuple[str, str]] = field(default_factory=set)
+
+
+class BatchWriter:
+    """
+    Buffers rows until `max_rows` rows or `max_bytes` message bytes are
+    pending, or `max_delay` seconds have passed since the first one
+    (the caller checks due() / should_flush()).
+    """
+
+    def __init__(self, db: PostgresClient, max_rows: int = 5000,
+                 max_bytes: int = 4 * 1024 * 1024, max_delay: float = 0.5,
+                 errors: Optional[ErrorReporter] = None):
+        self.db = db
+        self.errors = errors
+        self.max_rows = max(1, max_rows)
+        self.max_bytes = max(1, max_bytes)
+        self.max_delay = max_delay
+        self._reset()
+
+    def _reset(self) -> None:
+        self._batches: Dict[_RowKey, _TableBatch] = {}
+        self._rows = 0
+        self._bytes = 0
+        self._tags: List[int] = []
+        self._first_at: Optional[float] = None
+
+    @property
+    def pending_messages(self) -> int:
+        return len(self._tags)
+
+    @property
+    def pending_rows(self) -> int:
+        return self._rows
+
+    def add(self, packet_name: str, table: str, keys: List[str], values: List[Sequence[Any]],
+            label: str = "JSON_PAYLOAD") -> None:
+        """Buffer `values` (one sequence per row, in `keys` order) for `table`."""
+        key = (table, tuple(keys))
+        batch = self._batches.get(key)
+        if batch is None:
+            batch = self._batches[key] = _TableBatch(table, list(keys))
+        batch.values.extend(values)
+        batch.sources.add((packet_name, label))
+        self._rows += len(values)
+
+    def done(self, delivery_tag: int, nbytes: int = 0) -> None:
+        """
+        A message has been handled (its rows, if any, are buffered); it is
+        acked with the next flush.
+        """
+        if self._first_at is None:
+            self._first_at = time.monotonic()
+        self._bytes += nbytes
+        self._tags.append(delivery_tag)
+
+    def discard(self) -> int:
+        """Drop the buffer (its messages were never acked); returns the rows dropped."""
+        rows = self._rows
+        self._reset()
+        return rows
+
+    def due(self) -> bool:
+        return self._first_at is not None and time.monotonic() - self._first_at >= self.max_delay
+
+    def time_until_due(self) -> Optional[float]:
+        """Seconds until the time budget runs out; None when nothing is buffered."""
+        if self._first_at is None:
+            return None
+        return max(0.0, self._first_at + self.max_delay - time.monotonic())
+
+    def should_flush(self) -> bool:
+        return self._rows >= self.max_rows or self._bytes >= self.max_bytes or self.due()
+
+    def flush(self) -> List[int]:
+        """
+        Write everything buffered in one transaction. Returns the delivery
+        tags covered (safe to ack), empty if nothing was pending. On a
+        connection error the buffer is dropped and the error re-raised;
+        nothing was committed.
+        """
+        if not self._tags:
+            return []
+        batches = list(self._batches.values())
+        tags, rows = self._tags, self._rows
+        self._reset()
+
+        start = time.perf_counter()
+        failed = 0
+        with self.db.transaction():
+            for i, batch in enumerate(batches):
+                try:
+                    try:
+                        with self.db.savepoint(f"batch_{i}"):
+                            self.db.copy_values(batch.table, batch.keys, batch.values)
+                    except psycopg2.errors.UndefinedTable:
+                        # Dropped since it was cached; copy_values recreates it
+                        with self.db.savepoint(f"batch_{i}"):
+                            self.db.copy_values(batch.table, batch.keys, batch.values)
+                except _CONNECTION_ERRORS:
+                    raise
+                except Exception as e:
+                    failed += len(batch.values)
+                    logger.exception("DB Error inserting %d rows into %s", len(batch.values), batch.table)
+                    self._report_failed(batch, e)
+
+        logger.debug(
+            "Flushed %d rows (%d messages, %d tables) in %.1f ms%s",
+            rows - failed, len(tags), len(batches), (time.perf_counter() - start) * 1000.0,
+            f"; {failed} rows failed" if failed else "",
+        )
+        return tags
+
+    def _report_failed(self, batch: _TableBatch, error: Exception) -> None:
+        if self.errors is None:
+            for packet_name, label in sorted(batch.sources):
+                self.db.insert_decoder_failed(packet_name, label, f"db_worker_error: {error}")
+            return
+        sample = json.dumps({
+            "table": batch.table,
+            "rows": len(batch.values),
+            "sample": [dict(zip(batch.keys, row)) for row in batch.values[:_SAMPLE_ROWS]],
+        }, default=str)
+        for packet_name, label in sorted(batch.sources):
+            self.errors.report(KIND_DB_FAILED, packet_name, f"db_worker_error ({label}): {error}", sample)
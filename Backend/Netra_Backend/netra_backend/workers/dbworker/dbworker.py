@@ -1,3 +1,4 @@
+import functools
 import json
 import logging
 import os
@@ -9,6 +10,10 @@ from typing import Dict, Any, List
 
 from netra_backend.logging_config import setup_logging
 from netra_backend.db_client import PostgresClient
+from netra_backend.common.messaging.error_events import KIND_DB_FAILED, ErrorReporter
+from netra_backend.common.messaging.wire_format import decode_columnar, is_columnar, typed_values
+from netra_backend.workers.dbworker.flow_control import PrefetchWindow
+from netra_backend.workers.dbworker.writer_lanes import AckTracker, Part, WriterLane, lane_for
 
 logger = logging.getLogger("db_worker")
 
@@ -18,35 +23,62 @@ ISO_DATETIME_PATTERN = re.compile(
 )
 
 
+def _convert_datetime_value(key: str, value: Any) -> Any:
+    """
+    Convert one ISO datetime string back to a datetime object; any other
+    value is returned unchanged.
+    """
+    if isinstance(value, str) and ISO_DATETIME_PATTERN.match(value):
+        try:
+            # Handle various ISO formats
+            if value.endswith('Z'):
+                # UTC format: 2026-01-09T08:57:03Z
+                dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+            elif 'T' in value or ' ' in value:
+                dt = datetime.fromisoformat(value)
+            else:
+                dt = value  # Not a datetime, keep as string
+            logger.debug("Converted datetime field %s: %s -> %s (type: %s)", 
+                         key, value, dt, type(dt).__name__)
+            return dt
+        except ValueError as e:
+            logger.warning("Failed to parse datetime field %s=%s: %s", key, value, e)
+            return value  # Keep as string if parsing fails
+    return value
+
+
 def _convert_datetime_fields(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
     Convert ISO datetime string fields back to datetime objects.
     This is needed because JSON serialization converts datetime to strings.
     """
-    converted_rows = []
-    for row in rows:
-        converted_row = {}
-        for key, value in row.items():
-            if isinstance(value, str) and ISO_DATETIME_PATTERN.match(value):
-                try:
-                    # Handle various ISO formats
-                    if value.endswith('Z'):
-                        # UTC format: 2026-01-09T08:57:03Z
-                        dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
-                    elif 'T' in value or ' ' in value:
-                        dt = datetime.fromisoformat(value)
-                    else:
-                        dt = value  # Not a datetime, keep as string
-                    logger.debug("Converted datetime field %s: %s -> %s (type: %s)", 
-                                 key, value, dt, type(dt).__name__)
-                    converted_row[key] = dt
-                except ValueError as e:
-                    logger.warning("Failed to parse datetime field %s=%s: %s", key, value, e)
-                    converted_row[key] = value  # Keep as string if parsing fails
-            else:
-                converted_row[key] = value
-        converted_rows.append(converted_row)
-    return converted_rows
+    return [
+        {key: _convert_datetime_value(key, value) for key, value in row.items()}
+        for row in rows
+    ]
+
+
+def _convert_typed_fields(rows: List[Dict[str, Any]], column_types: Dict[str, str]) -> List[Dict[str, Any]]:
+    """
+    Convert the columns the decoder declared (meta["column_types"]), e.g.
+    raw epoch seconds -> datetime. No pattern guessing on the other columns.
+    """
+    for key, tag in column_types.items():
+        values = typed_values([row.get(key) for row in rows], tag)
+        for row, value in zip(rows, values):
+            if key in row:
+                row[key] = value
+    return rows
+
+
+def _target_table(packet_name: str) -> str:
+    target_table = packet_name
+    if "__" in target_table:
+        parts = target_table.split("__")
+        if len(parts) >= 4 and parts[2] == "EMULATOR":
+             target_table = "__".join(parts[3:])
+    return target_table
+
 
 class DBWorkerService:
     def __init__(self):
@@ -61,6 +93,44 @@ class DBWorkerService:
         self.exchange = os.getenv("RABBITMQ_OUTPUT_EXCHANGE", "telemetry.decoded")
         self.queue_name = "q.decoded.db_persistence"
 
+        # Rejected rows go to telemetry.errors (stored by workers.errorsink),
+        # off the writer connections
+        self.errors = ErrorReporter.from_env("db_worker")
+
+        # 3. Batching: rows from many messages go to Postgres in one
+        # transaction (COPY per table); messages are acked after the commit
+        self.writer_kwargs = dict(
+            max_rows=int(os.getenv("DB_BATCH_ROWS", "5000")),
+            max_bytes=int(os.getenv("DB_BATCH_BYTES", str(4 * 1024 * 1024))),
+            max_delay=float(os.getenv("DB_BATCH_MS", "500")) / 1000.0,
+            errors=self.errors,
+        )
+        # Writer lanes: tables are hashed onto lanes, each with its own
+        # connection from this pool (see writer_lanes.py); self.db stays on
+        # the consumer thread for partition maintenance
+        lanes = max(1, int(os.getenv("DB_WRITER_LANES", "4")))
+        self.pool = [PostgresClient() for _ in range(lanes)]
+        self.metrics_interval = float(os.getenv("DB_METRICS_LOG_S", "60"))
+        self._lanes: List[WriterLane] = []
+        self._acks = AckTracker()
+
+        # 4. Flow control: prefetch sized to the batches, bounded in-flight bytes
+        self.window = PrefetchWindow(
+            lanes,
+            batch_rows=self.writer_kwargs["max_rows"],
+            batch_bytes=self.writer_kwargs["max_bytes"],
+            min_prefetch=int(os.getenv("DB_PREFETCH_MIN", "100")),
+            max_prefetch=int(os.getenv("DB_PREFETCH", "2000")),
+            max_inflight_bytes=int(os.getenv("DB_INFLIGHT_BYTES", str(64 * 1024 * 1024))),
+        )
+        self.window_interval = float(os.getenv("DB_PREFETCH_ADJUST_S", "10"))
+        self._consumer_tag = None
+        # 5. Partition upkeep (future partitions, indexes, retention)
+        self.partition_interval = float(os.getenv("DB_PARTITION_MAINTENANCE_S", "3600"))
+
+        self._connection = None
+        self._channel = None
+
     def run_forever(self) -> None:
         while True:
             try:
@@ -74,9 +144,29 @@ class DBWorkerService:
 
     def _consume_once(self) -> None:
         logger.info("Connecting to RabbitMQ for DB worker: %s", self.rabbitmq_url)
+        self.db.ensure_connection()
+        self.db.maintain_partitions()
+        # Once per table: rows stored before its rollups were enabled
+        self.db.backfill_rollups()
         params = pika.URLParameters(self.rabbitmq_url)
         connection = pika.BlockingConnection(params)
         channel = connection.channel()
+        # Unacked messages are held until their batch commits; channel-wide,
+        # so a resize applies to the running consumer
+        channel.basic_qos(prefetch_count=self.window.prefetch, global_qos=True)
+        self._connection = connection
+        self._channel = channel
+        self._acks.clear()
+        self._lanes = [
+            WriterLane(
+                i, db, self.writer_kwargs,
+                on_flushed=functools.partial(self._lane_flushed, connection),
+                on_failed=functools.partial(self._lane_failed, connection),
+            )
+            for i, db in enumerate(self.pool)
+        ]
+        for lane in self._lanes:
+            lane.start()
 
         # 1. Declare the exchange (idempotent, ensures it exists)
         channel.exchange_declare(
@@ -97,24 +187,179 @@ class DBWorkerService:
         logger.info("Bound queue %s to exchange %s with key '#'", self.queue_name, self.exchange)
 
         # 4. Start consuming
-        channel.basic_consume(
-            queue=self.queue_name,
-            on_message_callback=self._on_message,
-        )
+        self._resume()
+
+        if self.partition_interval > 0:
+            connection.call_later(self.partition_interval, self._on_partition_timer)
+        if self.metrics_interval > 0:
+            connection.call_later(self.metrics_interval, self._log_lane_metrics)
+        if self.window_interval > 0:
+            connection.call_later(self.window_interval, self._on_window_timer)
 
         logger.info("Starting DB Worker consuming loop...")
         try:
-            channel.start_consuming()
+            self._consume(connection, channel)
         finally:
+            # Rows still buffered were never acked; the broker redelivers them
+            self._stop_lanes_and_ack()
+            self._channel = None
+            self._connection = None
+            self._consumer_tag = None
             if connection and connection.is_open:
                 connection.close()
 
+    @staticmethod
+    def _consume(connection, channel) -> None:
+        """
+        Dispatch deliveries and callbacks until the channel closes. Not
+        channel.start_consuming(): it returns once the channel has no
+        consumer, which is the case while paused (see _pause).
+        """
+        while channel.is_open:
+            connection.process_data_events(time_limit=1.0)
+
+    def _stop_lanes_and_ack(self) -> None:
+        """
+        Stop the lanes, then ack what they committed meanwhile, so that
+        committed messages are not redelivered and written twice.
+        """
+        channel, connection = self._channel, self._connection
+        try:
+            if self._consumer_tag is not None and channel.is_open:
+                channel.basic_cancel(self._consumer_tag)
+                self._consumer_tag = None
+        except Exception:
+            logger.warning("Could not cancel the consumer before stopping the lanes")
+        self._stop_lanes()
+        try:
+            if connection.is_open and channel.is_open:
+                # Runs the _on_flushed callbacks the lanes queued while stopping
+                connection.process_data_events(time_limit=0)
+        except Exception:
+            logger.warning("Could not ack the deliveries committed while stopping the lanes")
+
+    def _stop_lanes(self) -> None:
+        for lane in self._lanes:
+            lane.stop()
+        for lane in self._lanes:
+            # A lane in the middle of a commit must finish before its
+            # connection is handed to the next lane
+            lane.join(10.0)
+            if lane.is_alive():
+                logger.warning("Waiting for writer lane %d to finish its flush", lane.index)
+                lane.join()
+        self._lanes = []
+
+    # ----- flow control -----
+
+    def _pause(self) -> None:
+        if self._consumer_tag is None:
+            return
+        logger.warning("In-flight budget exceeded (%d bytes unwritten); pausing consumption",
+                       self._acks.inflight_bytes)
+        # Deliveries pika already buffered are requeued; _consume keeps the
+        # loop running so lane acks and _resume still get dispatched
+        self._channel.basic_cancel(self._consumer_tag)
+        self._consumer_tag = None
+
+    def _resume(self) -> None:
+        if self._consumer_tag is not None:
+            return
+        self._consumer_tag = self._channel.basic_consume(
+            queue=self.queue_name,
+            on_message_callback=self._on_message,
+        )
+
+    def _on_window_timer(self) -> None:
+        prefetch = self.window.resize()
+        if prefetch is not None:
+            self._channel.basic_qos(prefetch_count=prefetch, global_qos=True)
+        self._connection.call_later(self.window_interval, self._on_window_timer)
+
+    # ----- lanes -----
+
+    def _lane_flushed(self, connection, tags: List[int]) -> None:
+        """Lane thread: a batch committed; ack on the consumer thread."""
+        try:
+            connection.add_callback_threadsafe(functools.partial(self._on_flushed, connection, tags))
+        except Exception:
+            # Connection went away; the broker redelivers the unacked messages
+            logger.warning("Connection closed before %d committed deliveries could be acked", len(tags))
+
+    def _lane_failed(self, connection, exc: BaseException) -> None:
+        try:
+            connection.add_callback_threadsafe(functools.partial(self._on_lane_failed, connection, exc))
+        except Exception:
+            pass
+
+    def _on_flushed(self, connection, tags: List[int]) -> None:
+        if connection is not self._connection or not self._channel.is_open:
+            return
+        for ack_tag, multiple in self._acks.complete(tags):
+            self._channel.basic_ack(delivery_tag=ack_tag, multiple=multiple)
+        if self._consumer_tag is None and self._lanes and self.window.drained(self._acks.inflight_bytes):
+            logger.info("In-flight bytes back to %d; resuming consumption", self._acks.inflight_bytes)
+            self._resume()
+
+    def _on_lane_failed(self, connection, exc: BaseException) -> None:
+        if connection is not self._connection:
+            return
+        # Leave the consuming loop: the unacked messages (this lane's and
+        # the other lanes' still buffered) are redelivered after the reconnect
+        raise RuntimeError(f"writer lane failed: {exc}")
+
+    def _on_partition_timer(self) -> None:
+        self.db.maintain_partitions()
+        self._connection.call_later(self.partition_interval, self._on_partition_timer)
+
+    def _log_lane_metrics(self) -> None:
+        for lane in self._lanes:
+            m = lane.stats()
+            logger.info(
+                "Writer lane %d: depth %d (+%d buffered), %d messages, %d rows, %d flushes, "
+                "flush latency avg %.1f ms max %.1f ms",
+                lane.index, m["depth"], m["buffered"], m["messages"], m["rows"], m["flushes"],
+                m["flush_ms_avg"], m["flush_ms_max"],
+            )
+        logger.info("Unacked deliveries: %d (%d bytes unwritten), prefetch %d%s",
+                    len(self._acks), self._acks.inflight_bytes, self.window.prefetch,
+                    "" if self._consumer_tag is not None else ", paused")
+        errors = self.errors.stats()
+        if errors["reported"]:
+            logger.info("Error events: %d reported, %d published, %d dropped, %d queued",
+                        errors["reported"], errors["published"], errors["dropped"], errors["queued"])
+        self._connection.call_later(self.metrics_interval, self._log_lane_metrics)
+
+    # ----- messages -----
+
     def _on_message(self, ch, method, properties, body):
-        # Log the raw message to see exactly what is in the queue
+        self._acks.add(method.delivery_tag, len(body))
+        parts: List[Part] = []
         try:
-            logger.info("Raw message from decoded q: %s", body.decode("utf-8"))
-        except:
-            logger.info("Raw message from decoded q (bytes): %s", body)
+            # Columnar messages (see wire_format) are read natively, without building row dicts
+            if is_columnar(getattr(properties, "content_type", None)):
+                parts = self._columnar_parts(properties.content_type, body)
+            else:
+                parts = self._json_parts(body)
+        finally:
+            if parts:
+                # A message is one packet, so one table and one lane
+                lane = self._lanes[lane_for(parts[0][1], len(self._lanes))]
+                lane.submit(method.delivery_tag, len(body), parts)
+                self.window.observe(sum(len(part[3]) for part in parts), len(body))
+                if self.window.over_budget(self._acks.inflight_bytes):
+                    self._pause()
+            else:
+                # Nothing to write; acked right away
+                self._on_flushed(self._connection, [method.delivery_tag])
+
+    def _json_parts(self, body: bytes) -> List[Part]:
+        # Log the raw message to see exactly what is in the queue
+        if logger.isEnabledFor(logging.DEBUG):
+            try:
+                logger.debug("Raw message from decoded q: %s", body.decode("utf-8"))
+            except UnicodeDecodeError:
+                logger.debug("Raw message from decoded q (bytes): %s", body)
 
         """
         Payload structure from health_consumer:
@@ -127,8 +372,7 @@ class DBWorkerService:
             msg = json.loads(body.decode("utf-8"))
         except Exception as e:
             logger.error("Failed to parse JSON: %s", e)
-            ch.basic_ack(delivery_tag=method.delivery_tag)
-            return
+            return []
 
         meta = msg.get("meta", {})
         rows = msg.get("data", [])
@@ -137,34 +381,60 @@ class DBWorkerService:
 
         if not rows:
             logger.warning("Received message for %s with no data rows", packet_name)
-            ch.basic_ack(delivery_tag=method.delivery_tag)
-            return
+            return []
 
         try:
-            target_table = packet_name
-            if "__" in target_table:
-                parts = target_table.split("__")
-                if len(parts) >= 4 and parts[2] == "EMULATOR":
-                     target_table = "__".join(parts[3:])
+            target_table = _target_table(packet_name)
             
-            # Convert ISO datetime strings back to datetime objects
-            # (JSON serialization converts datetime to strings)
-            rows = _convert_datetime_fields(rows)
+            if "column_types" in meta:
+                # Typed message: timestamps are declared, convert just those
+                rows = _convert_typed_fields(rows, meta["column_types"])
+            else:
+                # Untyped (older) message: convert ISO datetime strings back
+                # to datetime objects (JSON serialization converts datetime to strings)
+                rows = _convert_datetime_fields(rows)
             
             # Log sample row to verify conversion happened
-            sample_row = rows[0]
-            logger.info("Sample row after conversion: %s", 
-                       {k: f"{v} (type: {type(v).__name__})" for k, v in sample_row.items()})
-            
-            self.db.ensure_table_for_packet(target_table, rows[0])
-            self.db.insert_rows(target_table, rows)
-            
-            logger.info("Inserted %d rows into %s", len(rows), target_table)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Sample row after conversion: %s",
+                             {k: f"{v} (type: {type(v).__name__})" for k, v in rows[0].items()})
+
+            # All rows of a message have the same keys
+            keys = list(rows[0].keys())
+            values = [[row.get(k) for k in keys] for row in rows]
+            return [(packet_name, target_table, keys, values, "JSON_PAYLOAD")]
 
         except Exception as e:
-            logger.exception("DB Error inserting for %s", packet_name)
-            self.db.insert_decoder_failed(packet_name, "JSON_PAYLOAD", f"db_worker_error: {e}")
-        ch.basic_ack(delivery_tag=method.delivery_tag)
+            logger.exception("Error preparing rows for %s", packet_name)
+            self.errors.report(KIND_DB_FAILED, packet_name, f"db_worker_error (JSON_PAYLOAD): {e}",
+                               body.decode("utf-8", "replace"))
+            return []
+
+    def _columnar_parts(self, content_type: str, body: bytes) -> List[Part]:
+        """
+        Payload: a header {"v": 1, "meta": {...}} followed by one column
+        batch per decoded packet (see common/messaging/wire_format.py).
+        """
+        try:
+            meta, batches = decode_columnar(body, content_type)
+        except Exception as e:
+            logger.error("Failed to decode %s message: %s", content_type, e)
+            return []
+
+        packet_name = meta.get("packet_name", "UNKNOWN_PACKET")
+
+        if not batches:
+            logger.warning("Received message for %s with no data rows", packet_name)
+            return []
+
+        target_table = _target_table(packet_name)
+        parts = []
+        for batch in batches:
+            # Timestamp columns are typed, decode_columnar already made them datetimes
+            values = list(zip(*batch.columns.values()))
+            if values:
+                parts.append((packet_name, target_table, list(batch.columns), values, "COLUMNAR_PAYLOAD"))
+        return parts
 
 def main():
     setup_logging()
@@ -0,0 +1,84 @@
+# netra_backend/workers/dbworker/flow_control.py
+import logging
+from typing import Optional
+
+logger = logging.getLogger("db_worker")
+
+# ---------------------------------------------------------
+# Consumer flow control for the DB worker
+# ---------------------------------------------------------
+#
+# Two limits keep a backlog (e.g. catching up after a DB outage) from
+# flooding the worker:
+#
+#   - Prefetch window (basic_qos): enough unacked messages for every lane
+#     to fill one batch while its previous batch commits, i.e.
+#         2 * lanes * messages per batch
+#     where messages per batch follows from DB_BATCH_ROWS / DB_BATCH_BYTES
+#     and the observed rows and bytes per message (a moving average).
+#     Clamped to [DB_PREFETCH_MIN, DB_PREFETCH] and to the byte budget.
+#
+#   - In-flight byte budget (DB_INFLIGHT_BYTES): message bytes handed to
+#     the lanes and not yet committed. Above the budget the consumer is
+#     cancelled (messages pika already holds are requeued); it resumes
+#     once the lanes drain below half of it.
+
+# Weight of the newest message in the moving averages
+_ALPHA = 0.05
+# Re-issue basic_qos only for changes larger than this
+_RESIZE_THRESHOLD = 0.25
+
+
+class PrefetchWindow:
+    def __init__(self, lanes: int, batch_rows: int, batch_bytes: int,
+                 min_prefetch: int = 100, max_prefetch: int = 2000,
+                 max_inflight_bytes: int = 64 * 1024 * 1024):
+        self.lanes = lanes
+        self.batch_rows = batch_rows
+        self.batch_bytes = batch_bytes
+        self.min_prefetch = max(1, min(min_prefetch, max_prefetch))
+        self.max_prefetch = max(self.min_prefetch, max_prefetch)
+        self.max_inflight_bytes = max_inflight_bytes
+
+        self.rows_per_message: Optional[float] = None
+        self.bytes_per_message: Optional[float] = None
+        # Current basic_qos setting; start wide and size down once messages are seen
+        self.prefetch = self.max_prefetch
+
+    def observe(self, rows: int, nbytes: int) -> None:
+        """One consumed message (pika thread)."""
+        if self.rows_per_message is None:
+            self.rows_per_message, self.bytes_per_message = float(rows), float(nbytes)
+        else:
+            self.rows_per_message += _ALPHA * (rows - self.rows_per_message)
+            self.bytes_per_message += _ALPHA * (nbytes - self.bytes_per_message)
+
+    def target(self) -> int:
+        if self.rows_per_message is None:
+            return self.prefetch
+        per_batch = min(
+            self.batch_rows / max(self.rows_per_message, 1.0),
+            self.batch_bytes / max(self.bytes_per_message, 1.0),
+        )
+        target = 2 * self.lanes * per_batch
+        # Never allow more messages than the byte budget holds
+        target = min(target, self.max_inflight_bytes / max(self.bytes_per_message, 1.0))
+        return int(max(self.min_prefetch, min(self.max_prefetch, target)))
+
+    def resize(self) -> Optional[int]:
+        """New prefetch to apply with basic_qos, or None to keep the current one."""
+        target = self.target()
+        if abs(target - self.prefetch) <= _RESIZE_THRESHOLD * self.prefetch:
+            return None
+        logger.info(
+            "Prefetch %d -> %d (%.1f rows, %.0f bytes per message)",
+            self.prefetch, target, self.rows_per_message, self.bytes_per_message,
+        )
+        self.prefetch = target
+        return target
+
+    def over_budget(self, inflight_bytes: int) -> bool:
+        return inflight_bytes > self.max_inflight_bytes
+
+    def drained(self, inflight_bytes: int) -> bool:
+        return inflight_bytes <= self.max_inflight_bytes // 2
@@ -0,0 +1,194 @@
+# netra_backend/workers/dbworker/writer_lanes.py
+import logging
+import queue
+import threading
+import time
+import zlib
+from collections import deque
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+from netra_backend.db_client import PostgresClient
+from netra_backend.workers.dbworker.batch_writer import BatchWriter
+
+logger = logging.getLogger("db_worker")
+
+# ---------------------------------------------------------
+# Parallel writer lanes
+# ---------------------------------------------------------
+#
+#   pika thread ── route(table) ──> lane 0: queue -> BatchWriter -> PostgresClient
+#                                   lane 1: ...
+#        ^                                 |
+#        └── on_flushed(tags) / on_failed ─┘   (via add_callback_threadsafe)
+#
+# Every table hashes to one lane, so a table's rows are written in the
+# order they were consumed, while a slow table (the wide HEALTH_EPS) only
+# holds up the tables that share its lane. Each lane owns one connection
+# from the client pool and batches, writes and commits on its own thread.
+#
+# Lanes finish out of order. A delivery is acked as soon as its lane
+# commits, so a slow lane never holds the other lanes' messages in the
+# prefetch window (or gets them redelivered when it fails): AckTracker
+# (pika thread) acks the committed prefix of deliveries with one
+# multiple=True ack and anything committed past it one tag at a time.
+
+# Packet for a lane: (packet_name, table, keys, values, label)
+Part = Tuple[str, str, List[str], List[Sequence[Any]], str]
+
+_STOP = object()
+
+
+def lane_for(table: str, lanes: int) -> int:
+    """Stable table -> lane index (same across restarts and processes)."""
+    return zlib.crc32(table.encode("utf-8")) % lanes
+
+
+class AckTracker:
+    """
+    Delivery tags in the order they arrived; complete() returns the acks
+    for committed tags: (tag, multiple=True) for the prefix of deliveries
+    that are all committed, (tag, False) for each one committed after a
+    gap. Also counts the message bytes not yet written (inflight_bytes).
+    Pika thread only.
+    """
+
+    def __init__(self):
+        self._outstanding: "deque[int]" = deque()
+        # Acked on their own, still behind an unacked tag in _outstanding
+        self._acked = set()
+        self._sizes: Dict[int, int] = {}
+        self.inflight_bytes = 0
+
+    def __len__(self) -> int:
+        """Deliveries not acked yet."""
+        return len(self._outstanding) - len(self._acked)
+
+    def add(self, delivery_tag: int, nbytes: int = 0) -> None:
+        self._outstanding.append(delivery_tag)
+        self._sizes[delivery_tag] = nbytes
+        self.inflight_bytes += nbytes
+
+    def complete(self, tags: Sequence[int]) -> List[Tuple[int, bool]]:
+        done = set()
+        for tag in tags:
+            if tag in self._sizes:
+                self.inflight_bytes -= self._sizes.pop(tag)
+                done.add(tag)
+        acks: List[Tuple[int, bool]] = []
+        prefix_tag = None
+        while self._outstanding and (self._outstanding[0] in done or self._outstanding[0] in self._acked):
+            tag = self._outstanding.popleft()
+            if tag in done:
+                done.discard(tag)
+                prefix_tag = tag
+            else:
+                self._acked.discard(tag)
+        if prefix_tag is not None:
+            # Covers every earlier tag not acked on its own yet
+            acks.append((prefix_tag, True))
+        for tag in sorted(done):
+            acks.append((tag, False))
+            self._acked.add(tag)
+        return acks
+
+    def clear(self) -> None:
+        self._outstanding.clear()
+        self._acked.clear()
+        self._sizes.clear()
+        self.inflight_bytes = 0
+
+
+class WriterLane(threading.Thread):
+    """
+    One writer thread: takes (delivery tag, nbytes, parts) from its queue,
+    buffers them in a BatchWriter and flushes when the batch is full or its
+    time budget runs out. Reports committed tags with on_flushed(tags); on
+    a database error reports on_failed(exc) and stops.
+    """
+
+    def __init__(self, index: int, db: PostgresClient, writer_kwargs: Dict[str, Any],
+                 on_flushed: Callable[[List[int]], None],
+                 on_failed: Callable[[BaseException], None]):
+        super().__init__(name=f"db-lane-{index}", daemon=True)
+        self.index = index
+        self.db = db
+        self.writer = BatchWriter(db, **writer_kwargs)
+        self.on_flushed = on_flushed
+        self.on_failed = on_failed
+        self._queue: "queue.Queue" = queue.Queue()
+
+        self._stats_lock = threading.Lock()
+        self._reset_stats()
+
+    def _reset_stats(self) -> None:
+        self.messages = 0
+        self.rows = 0
+        self.flushes = 0
+        self.flush_s_total = 0.0
+        self.flush_s_max = 0.0
+
+    # ----- pika thread -----
+
+    def submit(self, delivery_tag: int, nbytes: int, parts: List[Part]) -> None:
+        self._queue.put((delivery_tag, nbytes, parts))
+
+    def stop(self) -> None:
+        self._queue.put(_STOP)
+
+    def stats(self, reset: bool = True) -> Dict[str, float]:
+        """Metrics since the last reset: queue depth, throughput, flush latency."""
+        with self._stats_lock:
+            stats = {
+                "depth": self._queue.qsize(),
+                "buffered": self.writer.pending_messages,
+                "messages": self.messages,
+                "rows": self.rows,
+                "flushes": self.flushes,
+                "flush_ms_avg": 1000.0 * self.flush_s_total / self.flushes if self.flushes else 0.0,
+                "flush_ms_max": 1000.0 * self.flush_s_max,
+            }
+            if reset:
+                self._reset_stats()
+        return stats
+
+    # ----- lane thread -----
+
+    def run(self) -> None:
+        try:
+            self.db.ensure_connection()
+            while True:
+                try:
+                    item = self._queue.get(timeout=self.writer.time_until_due())
+                except queue.Empty:
+                    item = None  # time budget ran out
+                if item is _STOP:
+                    # Not acked; the broker redelivers these after the reconnect
+                    self.writer.discard()
+                    return
+                if item is not None:
+                    delivery_tag, nbytes, parts = item
+                    for packet_name, table, keys, values, label in parts:
+                        self.writer.add(packet_name, table, keys, values, label=label)
+                    self.writer.done(delivery_tag, nbytes)
+                    # Batch up whatever is already queued before paying for a commit
+                    if not self.writer.should_flush() and not self._queue.empty():
+                        continue
+                if self.writer.should_flush():
+                    self._flush()
+        except Exception as e:
+            logger.exception("Writer lane %d failed", self.index)
+            self.writer.discard()
+            self.on_failed(e)
+
+    def _flush(self) -> None:
+        rows = self.writer.pending_rows
+        start = time.perf_counter()
+        tags = self.writer.flush()
+        elapsed = time.perf_counter() - start
+        with self._stats_lock:
+            self.messages += len(tags)
+            self.rows += rows
+            self.flushes += 1
+            self.flush_s_total += elapsed
+            self.flush_s_max = max(self.flush_s_max, elapsed)
+        self.on_flushed(tags)
@@ -0,0 +1,83 @@
+# tests/test_dbworker_flow.py
+from netra_backend.workers.dbworker.dbworker import DBWorkerService
+from netra_backend.workers.dbworker.flow_control import PrefetchWindow
+from netra_backend.workers.dbworker.writer_lanes import AckTracker
+
+
+class _Channel:
+    def __init__(self):
+        self.is_open = True
+        self.consumers = set()
+        self.acks = []
+        self._next = 0
+
+    def basic_consume(self, queue, on_message_callback):
+        self._next += 1
+        tag = f"ctag{self._next}"
+        self.consumers.add(tag)
+        return tag
+
+    def basic_cancel(self, consumer_tag):
+        self.consumers.discard(consumer_tag)
+
+    def basic_ack(self, delivery_tag, multiple=False):
+        self.acks.append((delivery_tag, multiple))
+
+
+class _Connection:
+    """Runs one scripted step per process_data_events call, then closes the channel."""
+
+    def __init__(self, channel, steps):
+        self.channel = channel
+        self.steps = list(steps)
+        self.closed = False
+
+    def process_data_events(self, time_limit=None):
+        if self.steps:
+            self.steps.pop(0)()
+        else:
+            self.channel.is_open = False
+
+    def close(self):
+        self.closed = True
+
+
+def _worker(channel, connection):
+    worker = DBWorkerService.__new__(DBWorkerService)
+    worker.queue_name = "q.test"
+    worker._channel = channel
+    worker._connection = connection
+    worker._consumer_tag = None
+    worker._acks = AckTracker()
+    worker._lanes = [object()]
+    worker.window = PrefetchWindow(1, batch_rows=10, batch_bytes=100, max_inflight_bytes=100)
+    return worker
+
+
+def test_pause_and_resume_keep_the_loop_running():
+    channel = _Channel()
+    connection = _Connection(channel, [])
+    worker = _worker(channel, connection)
+    worker._resume()
+    seen = []
+
+    def over_budget():
+        worker._acks.add(1, 150)
+        worker._pause()
+        seen.append(set(channel.consumers))
+
+    def still_paused():
+        seen.append(set(channel.consumers))
+
+    def committed():
+        worker._on_flushed(connection, [1])
+        seen.append(set(channel.consumers))
+
+    connection.steps = [over_budget, still_paused, committed]
+    worker._consume(connection, channel)
+
+    # The loop outlived the pause: every step ran, without a reconnect
+    assert seen[0] == set() and seen[1] == set()
+    assert len(seen[2]) == 1 and worker._consumer_tag in seen[2]
+    assert channel.acks == [(1, True)]
+    assert not connection.closed
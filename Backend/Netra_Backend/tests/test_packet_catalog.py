@@ -0,0 +1,56 @@
+# tests/test_packet_catalog.py
+from netra_backend import packet_catalog
+
+DEFINITIONS = """\
+TELEMETRY <%= target_name %> HEALTH_Eps BIG_ENDIAN "EPS health"
+  APPEND_ID_ITEM APID 16 UINT 0x6d02 "APID"
+  APPEND_ITEM VOLTAGE 32 FLOAT "Bus voltage"
+TELEMETRY <%= target_name %> TM_STATUS BIG_ENDIAN
+  APPEND_ITEM DATA 0 BLOCK
+COMMAND <%= target_name %> TC_PING BIG_ENDIAN
+  APPEND_ID_PARAMETER OPCODE 8 UINT 0 255 7 "Opcode"
+"""
+
+
+def _setup(tmp_path, monkeypatch):
+    cmd_tlm = tmp_path / "targets" / "EMULATOR" / "cmd_tlm"
+    cmd_tlm.mkdir(parents=True)
+    (cmd_tlm / "packets.txt").write_text(DEFINITIONS)
+    decoders = tmp_path / "health_decoders"
+    decoders.mkdir()
+    for name in ("HEALTH_EPS", "HEALTH_GNSS_DATA"):
+        (decoders / f"{name}.py").write_text("")
+    monkeypatch.setenv("COSMOS_TARGETS_DIR", str(tmp_path / "targets"))
+    monkeypatch.setenv("PACKET_CATALOG_CACHE", str(tmp_path / "catalog.json"))
+    monkeypatch.setattr(packet_catalog, "_catalog", None)
+    return str(decoders)
+
+
+def test_parse_definitions(tmp_path, monkeypatch):
+    decoder_dir = _setup(tmp_path, monkeypatch)
+    catalog = packet_catalog.build_catalog(decoder_dir=decoder_dir)
+    eps = catalog.lookup("RAW__TLM__EMULATOR__HEALTH_EPS")
+    assert eps.has_decoder and eps.is_health
+    assert eps.id_items == {"APID": "0x6d02"}
+    assert eps.bit_size == 48 and not eps.variable
+    assert catalog.get("TLM", "EMULATOR", "TM_STATUS").variable
+    assert catalog.get("CMD", "EMULATOR", "TC_PING").id_items == {"OPCODE": "7"}
+    # Read back from the cache
+    assert len(packet_catalog.build_catalog(decoder_dir=decoder_dir)) == 3
+
+
+def test_decoded_health_streams_keeps_undefined_decoders(tmp_path, monkeypatch):
+    decoder_dir = _setup(tmp_path, monkeypatch)
+    assert packet_catalog.decoded_health_streams(decoder_dir=decoder_dir) == [
+        "RAW__TLM__EMULATOR__HEALTH_EPS",
+        "RAW__TLM__EMULATOR__HEALTH_GNSS_DATA",
+    ]
+
+
+def test_decoded_health_streams_without_definitions(tmp_path, monkeypatch):
+    decoder_dir = _setup(tmp_path, monkeypatch)
+    monkeypatch.setenv("COSMOS_TARGETS_DIR", str(tmp_path / "missing"))
+    assert packet_catalog.decoded_health_streams(decoder_dir=decoder_dir) == [
+        "RAW__TLM__EMULATOR__HEALTH_EPS",
+        "RAW__TLM__EMULATOR__HEALTH_GNSS_DATA",
+    ]
@@ -0,0 +1,84 @@
+# tests/test_rollups.py
+import math
+from datetime import datetime, timedelta, timezone
+
+from netra_backend.db_rollups import aggregate, backfill_plan, resolution_for
+
+T0 = datetime(2026, 1, 16, 10, 0, 0, tzinfo=timezone.utc)
+
+
+def _by_key(rows):
+    """{(resolution, column, bucket): (n, min, max, sum, last, last_at)}"""
+    return {(r[0], r[1], r[2]): r[3:] for r in rows}
+
+
+def test_rows_are_bucketed_per_resolution():
+    keys = ["time", "v"]
+    values = [
+        (T0 + timedelta(seconds=5), 1),
+        (T0 + timedelta(seconds=50), 3),
+        (T0 + timedelta(minutes=1, seconds=10), 5),
+    ]
+    aggs = _by_key(aggregate(keys, values, 0))
+
+    assert aggs[("1m", "v", T0)] == (2, 1, 3, 4.0, 3, T0 + timedelta(seconds=50))
+    assert aggs[("1m", "v", T0 + timedelta(minutes=1))] == (1, 5, 5, 5.0, 5, T0 + timedelta(minutes=1, seconds=10))
+    # Both minutes merge into the hour and the day
+    hour = aggs[("1h", "v", T0)]
+    assert hour == (3, 1, 5, 9.0, 5, T0 + timedelta(minutes=1, seconds=10))
+    assert aggs[("1d", "v", T0.replace(hour=0))] == hour
+    assert len(aggs) == 4
+
+
+def test_last_is_the_latest_by_time_not_by_arrival():
+    keys = ["v", "time"]
+    values = [
+        (7, T0 + timedelta(seconds=30)),
+        (2, T0 + timedelta(minutes=2)),
+        (9, T0 + timedelta(seconds=10)),
+    ]
+    aggs = _by_key(aggregate(keys, values, 1))
+    assert aggs[("1m", "v", T0)][4:] == (7, T0 + timedelta(seconds=30))
+    assert aggs[("1h", "v", T0)][4:] == (2, T0 + timedelta(minutes=2))
+
+
+def test_nan_bool_text_and_null_values_are_left_out():
+    keys = ["time", "v", "flag", "label"]
+    values = [
+        (T0, 1.5, True, "a"),
+        (T0 + timedelta(seconds=1), math.nan, False, "b"),
+        (T0 + timedelta(seconds=2), None, True, "c"),
+        (T0 + timedelta(seconds=3), 2.5, False, "d"),
+    ]
+    aggs = _by_key(aggregate(keys, values, 0))
+    assert {column for _, column, _ in aggs} == {"v"}
+    assert aggs[("1m", "v", T0)] == (2, 1.5, 2.5, 4.0, 2.5, T0 + timedelta(seconds=3))
+
+
+def test_rows_without_a_time_are_not_rolled_up():
+    keys = ["time", "v"]
+    values = [(None, 1), ("2026-01-16 10:00:00", 2), (T0, 3)]
+    aggs = _by_key(aggregate(keys, values, 0))
+    assert aggs[("1m", "v", T0)][:4] == (1, 3, 3, 3.0)
+
+
+def test_naive_times_are_utc():
+    naive = T0.replace(tzinfo=None) + timedelta(seconds=20)
+    aggs = _by_key(aggregate(["time", "v"], [(naive, 4)], 0))
+    assert aggs[("1m", "v", T0)][5] == T0 + timedelta(seconds=20)
+
+
+def test_resolution_is_the_coarsest_that_fits_the_interval():
+    assert resolution_for(1_000) == ("1m", 60)
+    assert resolution_for(60_000) == ("1m", 60)
+    assert resolution_for(3_599_999) == ("1m", 60)
+    assert resolution_for(3_600_000) == ("1h", 3600)
+    assert resolution_for(86_399_999) == ("1h", 3600)
+    assert resolution_for(7 * 86_400_000) == ("1d", 86400)
+
+
+def test_backfill_plan_needs_a_typed_time_column():
+    columns = {"id": "int8", "created_at": "timestamptz", "Timestamp": "text",
+               "Epoch_Time_Human": "timestamptz", "V": "float8", "N": "int4", "ok": "bool"}
+    assert backfill_plan(columns, ["Timestamp", "Epoch_Time_Human"]) == ("Epoch_Time_Human", ["V", "N"])
+    assert backfill_plan(columns, ["Timestamp"]) is None
@@ -0,0 +1,91 @@
+# tests/test_spool.py
+import os
+
+from netra_backend.common.messaging.spool import Spool
+
+
+def _drain(spool):
+    out = []
+    while True:
+        record = spool.read()
+        if record is None:
+            return out
+        out.append(record)
+
+
+def _files(directory):
+    return sorted(name for name in os.listdir(directory) if name.endswith(".wal"))
+
+
+def test_records_are_read_in_append_order(tmp_path):
+    spool = Spool(str(tmp_path), segment_bytes=20)
+    spool.append([b"one", b"two"])
+    spool.append([b"three"])
+    assert [payload for payload, _ in _drain(spool)] == [b"one", b"two", b"three"]
+    assert not spool.has_unread()
+    # Records appended after the reader caught up are read next
+    spool.append([b"four"])
+    assert spool.has_unread()
+    assert [payload for payload, _ in _drain(spool)] == [b"four"]
+
+
+def test_rewind_reads_unconfirmed_records_again(tmp_path):
+    spool = Spool(str(tmp_path), segment_bytes=20)
+    spool.append([b"a", b"b", b"c", b"d"])
+    records = _drain(spool)
+    # Disconnect: "b" onwards were published but never confirmed
+    spool.rewind(records[1][1])
+    assert [payload for payload, _ in _drain(spool)] == [b"b", b"c", b"d"]
+
+
+def test_release_deletes_segments_before_the_position(tmp_path):
+    # Every record fills a segment of its own
+    spool = Spool(str(tmp_path), segment_bytes=4)
+    spool.append([b"a", b"b", b"c"])
+    records = _drain(spool)
+    assert len(_files(tmp_path)) == 3
+
+    spool.release(records[2][1])
+    assert len(_files(tmp_path)) == 1
+    assert len(spool) == 5
+    # Everything read and confirmed: the spool leaves the disk
+    spool.release(None)
+    assert _files(tmp_path) == []
+    assert len(spool) == 0
+    assert spool.read() is None
+
+
+def test_release_keeps_segments_with_unread_records(tmp_path):
+    spool = Spool(str(tmp_path), segment_bytes=4)
+    spool.append([b"a", b"b"])
+    spool.read()
+    spool.release(None)
+    assert "spool-000000000002.wal" in _files(tmp_path)
+    assert [payload for payload, _ in _drain(spool)] == [b"b"]
+    spool.release(None)
+    assert _files(tmp_path) == []
+
+
+def test_restart_skips_a_torn_last_record(tmp_path):
+    spool = Spool(str(tmp_path))
+    spool.append([b"first", b"second", b"third"])
+    spool.close()
+    (name,) = _files(tmp_path)
+    path = os.path.join(str(tmp_path), name)
+    with open(path, "r+b") as f:
+        f.truncate(os.path.getsize(path) - 2)
+
+    restarted = Spool(str(tmp_path))
+    assert len(restarted) > 0
+    assert [payload for payload, _ in _drain(restarted)] == [b"first", b"second"]
+    # New records go to a fresh segment, never after the torn one
+    restarted.append([b"fourth"])
+    assert len(_files(tmp_path)) == 2
+    assert [payload for payload, _ in _drain(restarted)] == [b"fourth"]
+
+
+def test_appends_beyond_max_bytes_are_dropped(tmp_path):
+    spool = Spool(str(tmp_path), max_bytes=12)
+    spool.append([b"1234", b"5678"])
+    assert spool.dropped == 1
+    assert [payload for payload, _ in _drain(spool)] == [b"1234"]
@@ -0,0 +1,61 @@
+# tests/test_writer_lanes.py
+from netra_backend.workers.dbworker.writer_lanes import AckTracker, lane_for
+
+
+def _tracker(*tags, nbytes=10):
+    acks = AckTracker()
+    for tag in tags:
+        acks.add(tag, nbytes)
+    return acks
+
+
+def test_prefix_is_acked_with_multiple():
+    acks = _tracker(1, 2, 3)
+    assert acks.complete([1, 2]) == [(2, True)]
+    assert len(acks) == 1
+    assert acks.inflight_bytes == 10
+
+
+def test_tags_past_a_gap_are_acked_on_their_own():
+    # Lane A holds tag 1 (slow table); lane B commits 2 and 4
+    acks = _tracker(1, 2, 3, 4)
+    assert acks.complete([2, 4]) == [(2, False), (4, False)]
+    assert len(acks) == 2
+    # Tag 1 commits: the multiple ack stops at 1, 2 is acked already
+    assert acks.complete([1]) == [(1, True)]
+    assert len(acks) == 1
+    assert acks.complete([3]) == [(3, True)]
+    assert len(acks) == 0
+    assert acks.inflight_bytes == 0
+
+
+def test_multiple_ack_never_names_an_acked_tag():
+    acks = _tracker(1, 2, 3, 4, 5)
+    assert acks.complete([3]) == [(3, False)]
+    assert acks.complete([1, 2]) == [(2, True)]
+    assert acks.complete([4, 5]) == [(5, True)]
+    assert len(acks) == 0
+
+
+def test_unknown_and_repeated_tags_are_ignored():
+    acks = _tracker(1, 2)
+    assert acks.complete([7]) == []
+    assert acks.complete([2]) == [(2, False)]
+    assert acks.complete([2]) == []
+    assert acks.complete([1]) == [(1, True)]
+
+
+def test_clear_forgets_everything():
+    acks = _tracker(1, 2)
+    acks.complete([2])
+    acks.clear()
+    assert len(acks) == 0
+    assert acks.inflight_bytes == 0
+    assert acks.complete([1]) == []
+
+
+def test_lane_for_is_stable_and_in_range():
+    for table in ("HEALTH_EPS", "HEALTH_ADCS_POS_LLH", "HEALTH_GNSS_DATA"):
+        lane = lane_for(table, 4)
+        assert 0 <= lane < 4
+        assert lane == lane_for(table, 4)
@@ -1,4 +1,3 @@
-import importlib
 import sys
 import os
 
@@ -6,6 +5,7 @@ import os
 sys.path.append(os.getcwd())
 
 from netra_backend.config import get_openc3_config
+from netra_backend.decoding.registry import DecoderRegistry
 
 def main():
     print("Verifying decoders...")
@@ -19,28 +19,14 @@ def main():
     health_packets = [p for p in packets if "__HEALTH_" in p]
     print(f"Found {len(health_packets)} health packets.")
 
-    failed = []
-    
-    for pkt_full in health_packets:
-        parts = pkt_full.split("__")
-        if len(parts) < 4:
-            print(f"Skipping weird packet: {pkt_full}")
-            continue
-            
-        core_name = "__".join(parts[3:])
-        module_name = f"netra_backend.health_decoders.{core_name}"
-        
-        try:
-            importlib.import_module(module_name)
-            # print(f"OK: {core_name}")
-        except Exception as e:
-            print(f"FAIL (EXCEPTION): {core_name} -> {e}")
-            failed.append(core_name)
-        except BaseException as e: # Catch SyntaxError, etc.
-            print(f"FAIL (BASE EXCEPTION): {core_name} -> {type(e).__name__}: {e}")
-            failed.append(core_name)
-
-    print(f"\nVerification Complete. {len(failed)} failures.")
+    # Same startup resolution the health consumer does
+    registry = DecoderRegistry(health_packets).load()
+
+    for core_name, reason in sorted(registry.failures.items()):
+        print(f"FAIL: {core_name} -> {reason}")
+
+    failed = sorted(registry.missing)
+    print(f"\nVerification Complete. {len(registry)} decodable, {len(failed)} failures.")
     if failed:
         print("Failed decoders:", failed)
 
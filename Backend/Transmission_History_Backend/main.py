@@ -312,6 +312,44 @@ PACKETS_CMD = [
     "DECOM__CMD__EMULATOR__OBC_926_TC_GET_ON_BRD_PWR_INFO"
 ]
 
+# ---------------------------------------------------------
+# Packets defined in the COSMOS target definitions but missing above
+# ---------------------------------------------------------
+# packet_catalog.py is shared with Netra_Backend (copied into the image by the
+# Dockerfile; taken from ../Netra_Backend when run from a checkout). Set
+# COSMOS_TARGETS_DIR to the targets directory of the deployed COSMOS plugin.
+try:
+    import packet_catalog
+except ImportError:
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                    "..", "Netra_Backend", "netra_backend"))
+    import packet_catalog
+
+
+def _add_catalog_packets() -> None:
+    catalog = packet_catalog.try_load_catalog()
+    if catalog is None:
+        print("⚠️  No COSMOS packet catalog; streaming the packet lists above only", file=sys.stderr)
+        return
+    listed = set(PACKETS_TLM + PACKETS_CMD)
+    undefined = [name for name in PACKETS_TLM + PACKETS_CMD if catalog.lookup(name) is None]
+    if undefined:
+        print(f"⚠️  {len(undefined)} listed packets have no COSMOS definition (still streamed)",
+              file=sys.stderr)
+    # Health telemetry raw; other telemetry and commands decommutated
+    for name in (
+        catalog.stream_names(catalog.select(kind="TLM", health=True), "RAW")
+        + catalog.stream_names(catalog.select(kind="TLM", health=False), "DECOM")
+    ):
+        if name not in listed:
+            PACKETS_TLM.append(name)
+    for name in catalog.stream_names(catalog.select(kind="CMD"), "DECOM"):
+        if name not in listed:
+            PACKETS_CMD.append(name)
+
+
+_add_catalog_packets()
+
 # 3️⃣  OPTIONAL ITEM STREAMING (leave empty)
 # ---------------------------------------------------------
 ITEMS_TO_STREAM: List[str] = []